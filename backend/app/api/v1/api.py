@@ -1,6 +1,17 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, events, articles, volunteers, sponsors
+from app.api.v1.endpoints import (
+    auth,
+    users,
+    events,
+    articles,
+    volunteers,
+    sponsors,
+    search,
+    facets,
+    admin,
+    imports,
+)
 
 api_router = APIRouter()
 
@@ -9,4 +20,8 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(events.router, prefix="/events", tags=["events"])
 api_router.include_router(articles.router, prefix="/articles", tags=["articles"])
 api_router.include_router(volunteers.router, prefix="/volunteers", tags=["volunteers"])
-api_router.include_router(sponsors.router, prefix="/sponsors", tags=["sponsors"]) 
\ No newline at end of file
+api_router.include_router(sponsors.router, prefix="/sponsors", tags=["sponsors"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(facets.router, prefix="/facets", tags=["facets"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"]) 
+api_router.include_router(imports.router, prefix="/admin", tags=["admin"])
\ No newline at end of file
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Security, status
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+
+from app.api.v1.endpoints.auth import get_current_active_user, oauth2_scheme
+from app.core.database import get_db
+from app.core.exports import EXPORTS, FORMATS, export_chunks
+from app.core.responses import model_response
+from app.core.stats import dashboard_stats
+
+router = APIRouter(tags=["admin"])
+
+class RecentMember(BaseModel):
+    id: str
+    name: Optional[str] = None
+    joined_at: Optional[datetime] = None
+
+class UpcomingEvent(BaseModel):
+    id: str
+    title: Optional[str] = None
+    date: Optional[str] = None
+
+class DashboardStatsResponse(BaseModel):
+    total_members: int
+    active_events: int
+    published_articles: int
+    sponsors: int
+    recent_members: List[RecentMember]
+    upcoming_events: List[UpcomingEvent]
+    reconciled_at: Optional[datetime] = None
+
+@router.get("/stats", response_model=DashboardStatsResponse)
+async def get_dashboard_stats(
+    token: str = Security(oauth2_scheme),
+    current_user: dict = Depends(get_current_active_user),
+):
+    """
+    Counts and recent items for the admin dashboard.
+    Only admin can access this endpoint.
+    Served from a single materialized document kept current by the write handlers.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    stats = DashboardStatsResponse.model_validate(await dashboard_stats.read())
+    return model_response(stats)
+
+@router.get("/exports/{dataset}")
+async def export_dataset(
+    request: Request,
+    dataset: Literal[
+        "users",
+        "event_registrations",
+        "volunteer_applications",
+        "sponsorship_inquiries",
+    ],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    token: str = Security(oauth2_scheme),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Stream a full export of a dataset as NDJSON or CSV.
+    Only admin can access this endpoint.
+    Filter with the dataset's fields as query parameters, e.g.
+    ``/admin/exports/event_registrations?event_id=...``.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    export = EXPORTS[dataset]
+    query = {
+        name: request.query_params[name]
+        for name in export.filters
+        if name in request.query_params
+    }
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        export_chunks(db, export, query, format),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
\ No newline at end of file
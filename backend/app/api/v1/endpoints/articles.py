@@ -1,24 +1,53 @@
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Union
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+    Security,
+)
+from pydantic import BaseModel, ConfigDict, Field
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi.security import OAuth2PasswordBearer
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from app.core.database import (
+    build_projection,
     get_collection_items,
+    get_collection_page,
     get_collection_item,
     create_collection_item,
     update_collection_item,
     delete_collection_item,
+    object_id,
+    owned_by,
     PyObjectId,
     get_db,
 )
-from app.api.v1.endpoints.auth import get_current_active_user, oauth2_scheme
+from app.core.conditional import conditional_item, conditional_page
+from app.core.responses import list_response, model_response
+from app.core.counters import article_views
+from app.core.facets import facet_counts
+from app.core.search import search_service
+from app.core.stats import dashboard_stats, tracked_fields
+from app.core.typeahead import typeahead_service
+from app.api.v1.endpoints.auth import (
+    get_current_active_user,
+    get_optional_user_id,
+    oauth2_scheme,
+)
+from app.schemas.base import CursorPage, partial_model
 
 # Create router without global dependencies
 router = APIRouter(tags=["articles"])
 
+ARTICLE_SORT = [("published_at", -1), ("_id", -1)]
+
 class ArticleBase(BaseModel):
     title: str
     excerpt: str
@@ -37,32 +66,85 @@ class ArticleAuthor(BaseModel):
     name: str
     avatar: str = ""
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PyObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
 class Article(ArticleBase):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(alias="_id")
     author: ArticleAuthor
     published_at: datetime = Field(default_factory=datetime.utcnow)
     likes_count: int = 0
     views_count: int = 0
     comments_count: int = 0
-    liked_by: List[PyObjectId] = []
+    liked_by_me: bool = False
     status: str = "published"
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PyObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
+
+# Fields rendered by list views; content is only sent on request
+ARTICLE_CARD_FIELDS = [
+    "title", "excerpt", "image_url", "tags", "author", "published_at",
+    "likes_count", "views_count", "comments_count", "status",
+    "created_at", "updated_at",
+]
+ARTICLE_FIELDS = [
+    field for field in Article.model_fields if field not in ("id", "liked_by_me")
+]
+ArticleCard = partial_model(Article, "ArticleCard")
+
+def _article_access_filter(current_user: dict) -> Optional[Dict[str, Any]]:
+    """Admins and editors may modify any article, other users only their own."""
+    if current_user["role"] in ["admin", "editor"]:
+        return None
+    return owned_by("author.id", current_user["_id"])
+
+async def _mark_liked_by_me(
+    db: AsyncIOMotorDatabase,
+    articles: List[Dict[str, Any]],
+    user_id: Optional[str],
+) -> List[Dict[str, Any]]:
+    """
+    Set ``liked_by_me`` on each article with a single indexed lookup
+    in ``article_likes``.
+    """
+    liked = set()
+    if user_id and articles:
+        article_ids = [str(article["_id"]) for article in articles]
+        likes = await db.article_likes.find(
+            {"article_id": {"$in": article_ids}, "user_id": str(user_id)},
+            {"article_id": 1},
+        ).to_list(length=len(article_ids))
+        liked = {like["article_id"] for like in likes}
+    for article in articles:
+        article["liked_by_me"] = str(article["_id"]) in liked
+    return articles
 
-@router.get("/", response_model=List[Article])
+@router.get(
+    "/",
+    response_model=Union[List[ArticleCard], CursorPage[ArticleCard]],
+    response_model_exclude_unset=True,
+)
 async def list_articles(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's next_cursor. "
+        "Pass an empty value to start cursor pagination.",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Comma-separated fields to return, or 'all'. "
+            "Defaults to the card fields."
+        ),
+    ),
     tag: Optional[str] = None,
     status: Optional[str] = None,
+    user_id: Optional[str] = Depends(get_optional_user_id),
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     """
@@ -74,34 +156,78 @@ async def list_articles(
     if status:
         query["status"] = status
 
-    articles = await get_collection_items(
-        collection=db.articles,
-        query=query,
-        skip=skip,
-        limit=limit,
-        sort_by=[("published_at", -1)]
+    projection = build_projection(fields, ARTICLE_FIELDS, ARTICLE_CARD_FIELDS)
+
+    async def fetch(projection):
+        if cursor is not None:
+            return await get_collection_page(
+                collection=db.articles,
+                query=query,
+                sort_by=ARTICLE_SORT,
+                cursor=cursor,
+                limit=limit,
+                projection=projection,
+            )
+        articles = await get_collection_items(
+            collection=db.articles,
+            query=query,
+            skip=skip,
+            limit=limit,
+            sort_by=ARTICLE_SORT,
+            projection=projection,
+        )
+        return articles, None
+
+    # liked_by_me differs per user; liking an article bumps its updated_at.
+    page = await conditional_page(
+        request, response, fetch, projection, user_id, vary="Authorization"
     )
-    return [Article.parse_obj(doc) for doc in articles]
+    if isinstance(page, Response):
+        return page
+    articles, next_cursor = page
+    await _mark_liked_by_me(db, articles, user_id)
+
+    if cursor is not None:
+        page = CursorPage[ArticleCard].model_validate(
+            {"items": articles, "next_cursor": next_cursor}
+        )
+        return model_response(page, response, exclude_unset=True)
+    return list_response(ArticleCard, articles, response, exclude_unset=True)
 
 @router.get("/{article_id}", response_model=Article)
 async def get_article(
     article_id: str,
+    request: Request,
+    response: Response,
+    user_id: Optional[str] = Depends(get_optional_user_id),
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    article = await get_collection_item(
-        collection=db.articles,
-        query={"_id": PyObjectId(article_id)}
+    """
+    Get an article. Revalidations answered with 304 Not Modified do not
+    count as views.
+    """
+    async def fetch(projection):
+        return await get_collection_item(
+            collection=db.articles,
+            query={"_id": object_id(article_id)},
+            projection=projection,
+        )
+
+    article = await conditional_item(
+        request, response, fetch, user_id, vary="Authorization"
     )
+    if isinstance(article, Response):
+        return article
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    # Increment view count
-    updated_article = await update_collection_item(
-        collection=db.articles,
-        query={"_id": PyObjectId(article_id)},
-        update_data={"views_count": article["views_count"] + 1}
+    # Views are buffered and flushed in batches; report them as if written.
+    article_views.increment(article["_id"])
+    article["views_count"] = article.get("views_count", 0) + article_views.pending(
+        article["_id"]
     )
-    return Article.parse_obj(updated_article)
+    await _mark_liked_by_me(db, [article], user_id)
+    return model_response(Article.model_validate(article), response)
 
 @router.post("/", response_model=Article)
 async def create_article(
@@ -120,17 +246,16 @@ async def create_article(
             detail="Not enough permissions. Only admin and editor roles can create articles."
         )
 
-    article_data = article.dict()
+    article_data = article.model_dump()
     article_data.update({
         "author": {
-            "id": PyObjectId(current_user["_id"]),
+            "id": str(current_user["_id"]),
             "name": current_user["full_name"],
             "avatar": current_user.get("avatar", ""),
         },
         "likes_count": 0,
         "views_count": 0,
         "comments_count": 0,
-        "liked_by": [],
         "status": "published",
         "created_at": datetime.utcnow(),
         "published_at": datetime.utcnow(),
@@ -140,7 +265,11 @@ async def create_article(
         collection=db.articles,
         item=article_data
     )
-    return Article.parse_obj(created_article)
+    search_service.index_article(created_article)
+    typeahead_service.index_article(created_article)
+    await facet_counts.record("articles", None, created_article)
+    await dashboard_stats.record("articles", None, created_article)
+    return model_response(Article.model_validate(created_article))
 
 @router.put("/{article_id}", response_model=Article)
 async def update_article(
@@ -150,26 +279,26 @@ async def update_article(
     current_user: dict = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    existing_article = await get_collection_item(
-        collection=db.articles,
-        query={"_id": PyObjectId(article_id)}
-    )
-    if not existing_article:
-        raise HTTPException(status_code=404, detail="Article not found")
-
-    if (current_user["role"] not in ["admin", "editor"] and
-        existing_article["author"]["id"] != current_user["_id"]):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    article_data = article.dict()
+    article_data = article.model_dump()
     article_data["updated_at"] = datetime.utcnow()
 
-    updated_article = await update_collection_item(
+    previous_article = await update_collection_item(
         collection=db.articles,
-        query={"_id": PyObjectId(article_id)},
-        update_data=article_data
+        query={"_id": object_id(article_id)},
+        update_data=article_data,
+        access_filter=_article_access_filter(current_user),
+        return_document=ReturnDocument.BEFORE,
     )
-    return Article.parse_obj(updated_article)
+    if not previous_article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    # Every field is $set, so the updated article is the old one plus the update.
+    updated_article = {**previous_article, **article_data}
+    search_service.index_article(updated_article)
+    typeahead_service.index_article(updated_article)
+    await facet_counts.record("articles", previous_article, updated_article)
+    await dashboard_stats.record("articles", previous_article, updated_article)
+    await _mark_liked_by_me(db, [updated_article], current_user["_id"])
+    return model_response(Article.model_validate(updated_article))
 
 @router.delete("/{article_id}")
 async def delete_article(
@@ -177,21 +306,19 @@ async def delete_article(
     current_user: dict = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    existing_article = await get_collection_item(
-        collection=db.articles,
-        query={"_id": PyObjectId(article_id)}
-    )
-    if not existing_article:
-        raise HTTPException(status_code=404, detail="Article not found")
-
-    if (current_user["role"] not in ["admin", "editor"] and
-        existing_article["author"]["id"] != current_user["_id"]):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
     deleted = await delete_collection_item(
         collection=db.articles,
-        query={"_id": PyObjectId(article_id)}
+        query={"_id": object_id(article_id)},
+        access_filter=_article_access_filter(current_user),
+        projection={"tags": 1, **tracked_fields("articles")},
     )
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Article not found")
+    search_service.remove("article", article_id)
+    typeahead_service.remove("articles", article_id)
+    await facet_counts.record("articles", deleted, None)
+    await dashboard_stats.record("articles", deleted, None)
+    await db.article_likes.delete_many({"article_id": article_id})
     return {"message": "Article deleted successfully"}
 
 @router.post("/{article_id}/like")
@@ -200,37 +327,40 @@ async def like_article(
     current_user: dict = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    article = await get_collection_item(
-        collection=db.articles,
-        query={"_id": PyObjectId(article_id)}
-    )
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
+    """
+    Toggle the current user's like on an article.
 
-    if PyObjectId(current_user["_id"]) in article["liked_by"]:
-        # Unlike
-        updated_article = await update_collection_item(
-            collection=db.articles,
-            query={"_id": PyObjectId(article_id)},
-            update_data={
-                "liked_by": [
-                    user for user in article["liked_by"]
-                    if user != PyObjectId(current_user["_id"])
-                ],
-                "likes_count": article["likes_count"] - 1,
-                "updated_at": datetime.utcnow(),
-            }
-        )
-        return {"message": "Article unliked successfully"}
+    Likes are edges in ``article_likes`` with a unique (article_id, user_id)
+    index, so concurrent clicks cannot double count, and ``likes_count`` is
+    only ever moved with ``$inc`` alongside an edge insert or delete.
+    """
+    article_oid = object_id(article_id)
+    like = {
+        "article_id": str(article_oid),
+        "user_id": str(current_user["_id"]),
+    }
+    try:
+        await db.article_likes.insert_one({**like, "created_at": datetime.utcnow()})
+        liked, delta = True, 1
+    except DuplicateKeyError:
+        # Already liked: unlike. Only the request that removes the edge
+        # decrements the counter.
+        result = await db.article_likes.delete_one(like)
+        liked, delta = False, -result.deleted_count
 
-    # Like
-    updated_article = await update_collection_item(
-        collection=db.articles,
-        query={"_id": PyObjectId(article_id)},
-        update_data={
-            "liked_by": [*article["liked_by"], PyObjectId(current_user["_id"])],
-            "likes_count": article["likes_count"] + 1,
-            "updated_at": datetime.utcnow(),
-        }
+    updated_article = await db.articles.find_one_and_update(
+        {"_id": article_oid},
+        {"$inc": {"likes_count": delta}, "$set": {"updated_at": datetime.utcnow()}},
+        projection={"likes_count": 1},
+        return_document=ReturnDocument.AFTER,
     )
-    return {"message": "Article liked successfully"} 
\ No newline at end of file
+    if not updated_article:
+        if liked:
+            await db.article_likes.delete_one(like)
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    return {
+        "message": f"Article {'liked' if liked else 'unliked'} successfully",
+        "liked_by_me": liked,
+        "likes_count": updated_article["likes_count"],
+    }
@@ -3,20 +3,45 @@ from typing import Optional, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.database import get_collection_item, create_collection_item, get_database, get_collection
-from app.core.security import security
+from app.core.indexes import CASE_INSENSITIVE
+from app.core.metrics import register_collector
+from app.core.rate_limit import enforce_auth_admission
+from app.core.responses import model_response
+from app.core.security import password_hasher, security
+from app.core.stats import dashboard_stats
+from app.core.timing import phase
+from app.core.typeahead import typeahead_service
 from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
 from bson import ObjectId
+from bson.errors import InvalidId
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Fields of the authenticated user that handlers rely on; never the password hash.
+USER_PRINCIPAL_FIELDS = [
+    "email", "full_name", "avatar", "role", "is_active", "is_superuser",
+    "disabled", "created_at", "updated_at",
+]
+
+# Principals of recently seen users keyed by user id. Handlers that change a
+# user must call user_cache.invalidate(user_id).
+user_cache: TTLCache[dict] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+register_collector("user_cache", user_cache.snapshot)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="api/v1/auth/login", auto_error=False
+)
+
 
 class Token(BaseModel):
     access_token: str
@@ -43,16 +68,18 @@ class LoginData(BaseModel):
     email: EmailStr
     password: str
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    with phase("password"):
+        return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    with phase("password"):
+        return await password_hasher.hash(password)
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.JWT_SECRET,
@@ -65,31 +92,56 @@ async def get_current_user(
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> UserResponse:
     """
-    Get the current authenticated user.
+    Get the current authenticated user. Users are served from user_cache for
+    up to USER_CACHE_TTL_SECONDS instead of being read on every request.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = security.decode_token(token)
-        if payload is None:
-            raise credentials_exception
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except Exception:
-        raise credentials_exception
+    with phase("auth"):
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-    users_collection = await get_collection("users")
-    user = await users_collection.find_one({"_id": ObjectId(user_id)})
-    
-    if user is None:
-        raise credentials_exception
-        
-    return user
+        try:
+            payload = security.decode_token(token)
+            if payload is None:
+                raise credentials_exception
+            user_id = payload.get("sub")
+            if user_id is None:
+                raise credentials_exception
+        except Exception:
+            raise credentials_exception from None
+
+        user = user_cache.get(user_id)
+        if user is None:
+            users_collection = await get_collection("users")
+            try:
+                user = await users_collection.find_one(
+                    {"_id": ObjectId(user_id)}, USER_PRINCIPAL_FIELDS
+                )
+            except InvalidId:
+                raise credentials_exception from None
+            if user is None:
+                raise credentials_exception
+            user_cache.set(user_id, user)
+
+        # Handlers may modify the user they get; keep the cached entry intact.
+        return dict(user)
+
+async def get_optional_user_id(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+) -> Optional[str]:
+    """
+    Id of the caller on public endpoints, or None for anonymous requests.
+    Only the token is checked, the user is not loaded from the database.
+    """
+    if not token:
+        return None
+    with phase("auth"):
+        payload = security.decode_token(token)
+    if payload is None:
+        return None
+    return payload.get("sub")
 
 async def get_current_active_user(
     current_user: UserResponse = Depends(get_current_user),
@@ -107,20 +159,22 @@ async def authenticate_user(db: AsyncIOMotorDatabase, email: str, password: str)
     Returns the user if authentication is successful, None otherwise.
     """
     users_collection = await get_collection("users")
-    user = await users_collection.find_one({"email": email})
+    user = await users_collection.find_one({"email": email}, collation=CASE_INSENSITIVE)
     
     if not user:
         return None
-    if not verify_password(password, user["hashed_password"]):
+    if not await verify_password(password, user["hashed_password"]):
         return None
     return user
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    user = await authenticate_user(db, form_data.username, form_data.password)
+    with enforce_auth_admission(request, form_data.username):
+        user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=401,
@@ -142,25 +196,36 @@ async def login(
         "user": user_data
     }
 
+@router.post("/logout")
+async def logout(token: str = Depends(oauth2_scheme)):
+    """
+    Revoke the presented token.
+    """
+    security.revoke_token(token)
+    return {"message": "Logged out successfully"}
+
 @router.post("/register", response_model=User)
 async def register(
+    request: Request,
     user: UserCreate,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    # Check if user with email already exists
-    existing_user = await get_collection_item(
-        collection=db.users,
-        query={"email": user.email}
-    )
-    if existing_user:
-        raise HTTPException(
-            status_code=400,
-            detail="Email already registered"
+    with enforce_auth_admission(request, user.email):
+        # Check if user with email already exists
+        existing_user = await get_collection_item(
+            collection=db.users,
+            query={"email": user.email},
+            collation=CASE_INSENSITIVE,
         )
-
-    # Hash password
-    hashed_password = get_password_hash(user.password)
-    user_data = user.dict()
+        if existing_user:
+            raise HTTPException(
+                status_code=400,
+                detail="Email already registered"
+            )
+
+        # Hash password
+        hashed_password = await get_password_hash(user.password)
+    user_data = user.model_dump()
     user_data.update({
         "hashed_password": hashed_password,
         "role": "user",  # Default role
@@ -174,10 +239,12 @@ async def register(
         collection=db.users,
         item=user_data
     )
-    return User.parse_obj(created_user)
+    typeahead_service.index_user(created_user)
+    await dashboard_stats.record("users", None, created_user)
+    return model_response(User.model_validate(created_user))
 
 @router.get("/me", response_model=User)
 async def read_users_me(
     current_user: dict = Depends(get_current_active_user)
 ):
-    return User.parse_obj(current_user) 
\ No newline at end of file
+    return model_response(User.model_validate(current_user))
\ No newline at end of file
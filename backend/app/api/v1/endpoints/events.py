@@ -1,23 +1,48 @@
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Union
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+    Security,
+)
+from pydantic import BaseModel, ConfigDict, Field
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi.security import OAuth2PasswordBearer
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from app.core.database import (
+    build_projection,
     get_collection_items,
+    get_collection_page,
     get_collection_item,
     create_collection_item,
     update_collection_item,
     delete_collection_item,
+    object_id,
+    owned_by,
     PyObjectId,
     get_db,
 )
+from app.core.conditional import conditional_item, conditional_page
+from app.core.facets import facet_counts
+from app.core.responses import list_response, model_response
+from app.core.search import search_service
+from app.core.stats import dashboard_stats, tracked_fields
+from app.core.typeahead import typeahead_service
 from app.api.v1.endpoints.auth import get_current_active_user, oauth2_scheme
+from app.schemas.base import CursorPage, partial_model
 
 router = APIRouter(tags=["events"])
 
+EVENT_SORT = [("date", 1), ("_id", 1)]
+ATTENDEE_SORT = [("registered_at", 1), ("_id", 1)]
+
 class EventBase(BaseModel):
     title: str
     description: str
@@ -34,22 +59,55 @@ class EventUpdate(EventBase):
     pass
 
 class Event(EventBase):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(alias="_id")
     registered_count: int = 0
-    registered_users: List[PyObjectId] = []
     status: str = "upcoming"
     created_at: datetime = Field(default_factory=datetime.utcnow)
     created_by: PyObjectId
     updated_at: Optional[datetime] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PyObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
+
+class EventAttendee(BaseModel):
+    user_id: PyObjectId
+    user_name: str
+    registered_at: datetime
+
+EVENT_CARD_FIELDS = [
+    "title", "description", "date", "time", "location", "capacity", "category",
+    "registered_count", "status", "created_at", "created_by", "updated_at",
+]
+EVENT_FIELDS = [field for field in Event.model_fields if field != "id"]
+EventCard = partial_model(Event, "EventCard")
+
+def _event_access_filter(current_user: dict) -> Optional[Dict[str, Any]]:
+    """Admins and editors may modify any event, other users only those they organize."""
+    if current_user["role"] in ["admin", "editor"]:
+        return None
+    return owned_by("organizer.id", current_user["_id"])
 
-@router.get("/", response_model=List[Event])
+@router.get(
+    "/",
+    response_model=Union[List[EventCard], CursorPage[EventCard]],
+    response_model_exclude_unset=True,
+)
 async def list_events(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's next_cursor. "
+        "Pass an empty value to start cursor pagination.",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Comma-separated fields to return, or 'all'. "
+            "Defaults to the card fields."
+        ),
+    ),
     status: Optional[str] = None,
     category: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_db),
@@ -60,27 +118,60 @@ async def list_events(
     if category:
         query["category"] = category
 
-    events = await get_collection_items(
-        collection=db.events,
-        query=query,
-        skip=skip,
-        limit=limit,
-        sort_by=[("date", 1)]
-    )
-    return [Event.parse_obj(event) for event in events]
+    projection = build_projection(fields, EVENT_FIELDS, EVENT_CARD_FIELDS)
+
+    async def fetch(projection):
+        if cursor is not None:
+            return await get_collection_page(
+                collection=db.events,
+                query=query,
+                sort_by=EVENT_SORT,
+                cursor=cursor,
+                limit=limit,
+                projection=projection,
+            )
+        events = await get_collection_items(
+            collection=db.events,
+            query=query,
+            skip=skip,
+            limit=limit,
+            sort_by=EVENT_SORT,
+            projection=projection,
+        )
+        return events, None
+
+    page = await conditional_page(request, response, fetch, projection)
+    if isinstance(page, Response):
+        return page
+    events, next_cursor = page
+
+    if cursor is not None:
+        page = CursorPage[EventCard].model_validate(
+            {"items": events, "next_cursor": next_cursor}
+        )
+        return model_response(page, response, exclude_unset=True)
+    return list_response(EventCard, events, response, exclude_unset=True)
 
 @router.get("/{event_id}", response_model=Event)
 async def get_event(
     event_id: str,
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    event = await get_collection_item(
-        collection=db.events,
-        query={"_id": PyObjectId(event_id)}
-    )
+    async def fetch(projection):
+        return await get_collection_item(
+            collection=db.events,
+            query={"_id": object_id(event_id)},
+            projection=projection,
+        )
+
+    event = await conditional_item(request, response, fetch)
+    if isinstance(event, Response):
+        return event
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    return Event.parse_obj(event)
+    return model_response(Event.model_validate(event), response)
 
 @router.post("/", response_model=Event)
 async def create_event(
@@ -99,12 +190,13 @@ async def create_event(
             detail="Not enough permissions. Only admin and editor roles can create events."
         )
 
-    event_data = event.dict()
+    event_data = event.model_dump()
     event_data.update({
         "organizer": {
-            "id": PyObjectId(current_user["_id"]),
+            "id": str(current_user["_id"]),
             "name": current_user["full_name"],
         },
+        "registered_count": 0,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
     })
@@ -113,7 +205,11 @@ async def create_event(
         collection=db.events,
         item=event_data
     )
-    return Event.parse_obj(created_event)
+    search_service.index_event(created_event)
+    typeahead_service.index_event(created_event)
+    await facet_counts.record("events", None, created_event)
+    await dashboard_stats.record("events", None, created_event)
+    return model_response(Event.model_validate(created_event))
 
 @router.put("/{event_id}", response_model=Event)
 async def update_event(
@@ -127,26 +223,25 @@ async def update_event(
     Update an event. Only admin, editor, or the event organizer can update it.
     Requires authentication with Bearer token.
     """
-    existing_event = await get_collection_item(
-        collection=db.events,
-        query={"_id": PyObjectId(event_id)}
-    )
-    if not existing_event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    if (current_user["role"] not in ["admin", "editor"] and
-        existing_event["organizer"]["id"] != current_user["_id"]):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    event_data = event.dict()
+    event_data = event.model_dump()
     event_data["updated_at"] = datetime.utcnow()
 
-    updated_event = await update_collection_item(
+    previous_event = await update_collection_item(
         collection=db.events,
-        query={"_id": PyObjectId(event_id)},
-        update_data=event_data
+        query={"_id": object_id(event_id)},
+        update_data=event_data,
+        access_filter=_event_access_filter(current_user),
+        return_document=ReturnDocument.BEFORE,
     )
-    return Event.parse_obj(updated_event)
+    if not previous_event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    # Every field is $set, so the updated event is the old one plus the update.
+    updated_event = {**previous_event, **event_data}
+    search_service.index_event(updated_event)
+    typeahead_service.index_event(updated_event)
+    await facet_counts.record("events", previous_event, updated_event)
+    await dashboard_stats.record("events", previous_event, updated_event)
+    return model_response(Event.model_validate(updated_event))
 
 @router.delete("/{event_id}")
 async def delete_event(
@@ -159,21 +254,19 @@ async def delete_event(
     Delete an event. Only admin, editor, or the event organizer can delete it.
     Requires authentication with Bearer token.
     """
-    existing_event = await get_collection_item(
+    deleted = await delete_collection_item(
         collection=db.events,
-        query={"_id": PyObjectId(event_id)}
+        query={"_id": object_id(event_id)},
+        access_filter=_event_access_filter(current_user),
+        projection={"category": 1, **tracked_fields("events")},
     )
-    if not existing_event:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Event not found")
-
-    if (current_user["role"] not in ["admin", "editor"] and
-        existing_event["organizer"]["id"] != current_user["_id"]):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    await delete_collection_item(
-        collection=db.events,
-        query={"_id": PyObjectId(event_id)}
-    )
+    search_service.remove("event", event_id)
+    typeahead_service.remove("events", event_id)
+    await facet_counts.record("events", deleted, None)
+    await dashboard_stats.record("events", deleted, None)
+    await db.event_registrations.delete_many({"event_id": event_id})
     return {"message": "Event deleted successfully"}
 
 @router.post("/{event_id}/register")
@@ -186,30 +279,107 @@ async def register_for_event(
     """
     Register for an event. Any authenticated user can register.
     Requires authentication with Bearer token.
+
+    Registrations live in ``event_registrations`` with a unique
+    (event_id, user_id) index. The seat is taken with a single conditional
+    ``$inc`` that only matches while the event is below capacity.
+    """
+    event_oid = object_id(event_id)
+    registration = {
+        "event_id": str(event_oid),
+        "user_id": str(current_user["_id"]),
+        "user_name": current_user["full_name"],
+        "registered_at": datetime.utcnow(),
+    }
+    try:
+        await db.event_registrations.insert_one(registration)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=400, detail="Already registered for this event"
+        ) from None
+
+    updated_event = await db.events.find_one_and_update(
+        {
+            "_id": event_oid,
+            "$expr": {"$lt": [{"$ifNull": ["$registered_count", 0]}, "$capacity"]},
+        },
+        {"$inc": {"registered_count": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        projection={"_id": 1},
+    )
+    if not updated_event:
+        await db.event_registrations.delete_one({"_id": registration["_id"]})
+        event = await db.events.find_one({"_id": event_oid}, {"_id": 1})
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        raise HTTPException(
+            status_code=400, detail="This event has reached its capacity"
+        )
+    return {"message": "Successfully registered for the event"}
+
+@router.delete("/{event_id}/register")
+async def cancel_event_registration(
+    event_id: str,
+    token: str = Security(oauth2_scheme),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Cancel the current user's registration and free the seat.
+    Requires authentication with Bearer token.
+    """
+    event_oid = object_id(event_id)
+    result = await db.event_registrations.delete_one({
+        "event_id": str(event_oid),
+        "user_id": str(current_user["_id"]),
+    })
+    if result.deleted_count == 0:
+        event = await db.events.find_one({"_id": event_oid}, {"_id": 1})
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        raise HTTPException(status_code=404, detail="Registration not found")
+
+    await db.events.update_one(
+        {"_id": event_oid},
+        {"$inc": {"registered_count": -1}, "$set": {"updated_at": datetime.utcnow()}},
+    )
+    return {"message": "Registration cancelled successfully"}
+
+@router.get("/{event_id}/attendees", response_model=CursorPage[EventAttendee])
+async def list_event_attendees(
+    event_id: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's next_cursor.",
+    ),
+    token: str = Security(oauth2_scheme),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    List the attendees of an event in registration order, one page at a time.
+    Only admin, editor, or the event organizer can list attendees.
+    Requires authentication with Bearer token.
     """
+    event_oid = object_id(event_id)
     event = await get_collection_item(
         collection=db.events,
-        query={"_id": PyObjectId(event_id)}
+        query={"_id": event_oid},
+        projection={"_id": 1},
+        access_filter=_event_access_filter(current_user),
     )
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # Check if user is already registered
-    if any(reg["user_id"] == current_user["_id"] for reg in event.get("registrations", [])):
-        raise HTTPException(status_code=400, detail="Already registered for this event")
-
-    registration = {
-        "user_id": PyObjectId(current_user["_id"]),
-        "user_name": current_user["full_name"],
-        "registered_at": datetime.utcnow()
-    }
-
-    updated_event = await update_collection_item(
-        collection=db.events,
-        query={"_id": PyObjectId(event_id)},
-        update_data={
-            "registrations": [*event.get("registrations", []), registration],
-            "updated_at": datetime.utcnow()
-        }
+    registrations, next_cursor = await get_collection_page(
+        collection=db.event_registrations,
+        query={"event_id": str(event_oid)},
+        sort_by=ATTENDEE_SORT,
+        cursor=cursor,
+        limit=limit,
+        projection={"user_id": 1, "user_name": 1, "registered_at": 1},
+    )
+    page = CursorPage[EventAttendee].model_validate(
+        {"items": registrations, "next_cursor": next_cursor}
     )
-    return {"message": "Successfully registered for the event"} 
\ No newline at end of file
+    return model_response(page)
@@ -0,0 +1,32 @@
+from typing import List, Literal
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+from app.core.facets import FACETS, facet_counts
+from app.core.responses import model_response
+
+router = APIRouter(tags=["facets"])
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+class FacetCountsResponse(BaseModel):
+    facet: str
+    field: str
+    values: List[FacetValue]
+
+@router.get("/{facet}", response_model=FacetCountsResponse)
+async def get_facet_counts(facet: Literal["articles", "events", "volunteers"]):
+    """
+    Number of documents per article tag, event category or volunteer
+    opportunity category, most used first. Counts are maintained on write,
+    so this reads one small document per value.
+    """
+    counts = FacetCountsResponse.model_validate({
+        "facet": facet,
+        "field": FACETS[facet].field,
+        "values": await facet_counts.counts(facet),
+    })
+    return model_response(counts)
\ No newline at end of file
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Security, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel, EmailStr, Field, model_validator
+
+from app.api.v1.endpoints.articles import ArticleCreate
+from app.api.v1.endpoints.auth import get_current_active_user, oauth2_scheme
+from app.api.v1.endpoints.events import EventCreate
+from app.api.v1.endpoints.volunteers import OpportunityCreate
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.facets import facet_counts
+from app.core.imports import Import, parse_rows, run_import
+from app.core.responses import model_response
+from app.core.search import search_service
+from app.core.security import password_hasher
+from app.core.stats import dashboard_stats
+from app.core.typeahead import typeahead_service
+from app.schemas.user import UserRole
+
+router = APIRouter(tags=["admin"])
+logger = logging.getLogger(__name__)
+
+# Import rows are the create payloads plus the fields a migration from
+# another system needs to keep; everything else is set as on create.
+
+class ArticleImport(ArticleCreate):
+    status: str = "published"
+    published_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+class EventImport(EventCreate):
+    status: str = "upcoming"
+    created_at: Optional[datetime] = None
+
+class OpportunityImport(OpportunityCreate):
+    status: str = "open"
+    created_at: Optional[datetime] = None
+
+class UserImport(BaseModel):
+    email: EmailStr
+    full_name: str = Field(..., min_length=1, max_length=100)
+    role: UserRole = UserRole.USER
+    is_active: bool = True
+    password: Optional[str] = Field(None, min_length=8, max_length=100)
+    # bcrypt hash carried over from another system (exports leave hashes out)
+    hashed_password: Optional[str] = Field(
+        None, pattern=r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$"
+    )
+    created_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def one_password(self) -> "UserImport":
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError("Give either password or hashed_password")
+        return self
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportReport(BaseModel):
+    dataset: str
+    dry_run: bool
+    rows: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+
+async def prepare_articles(
+    items: List[ArticleImport], importer: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    author = {
+        "id": str(importer["_id"]),
+        "name": importer["full_name"],
+        "avatar": importer.get("avatar", ""),
+    }
+    documents = []
+    for item in items:
+        article_data = item.model_dump()
+        article_data.update({
+            "author": author,
+            "likes_count": 0,
+            "views_count": 0,
+            "comments_count": 0,
+            "created_at": item.created_at or now,
+            "published_at": item.published_at or item.created_at or now,
+        })
+        documents.append(article_data)
+    return documents
+
+async def prepare_events(
+    items: List[EventImport], importer: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    organizer = {"id": str(importer["_id"]), "name": importer["full_name"]}
+    documents = []
+    for item in items:
+        event_data = item.model_dump()
+        event_data.update({
+            "organizer": organizer,
+            "registered_count": 0,
+            "created_at": item.created_at or now,
+            "created_by": str(importer["_id"]),
+            "updated_at": now,
+        })
+        documents.append(event_data)
+    return documents
+
+async def prepare_opportunities(
+    items: List[OpportunityImport], importer: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    documents = []
+    for item in items:
+        opportunity_data = item.model_dump()
+        opportunity_data.update({
+            "applications_count": 0,
+            "created_at": item.created_at or now,
+            "created_by": str(importer["_id"]),
+            "updated_at": now,
+        })
+        documents.append(opportunity_data)
+    return documents
+
+async def prepare_users(
+    items: List[UserImport], importer: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    # At most half the hashing pool, so logins and registrations served by
+    # this worker only queue behind a few import hashes.
+    slots = asyncio.Semaphore(max(1, settings.PASSWORD_HASH_WORKERS // 2))
+
+    async def hash_password(password: str) -> str:
+        async with slots:
+            return await password_hasher.hash(password)
+
+    hashes = await asyncio.gather(*(
+        hash_password(item.password) for item in items if item.password is not None
+    ))
+    hashes = iter(hashes)
+    documents = []
+    for item in items:
+        user_data = item.model_dump(exclude={"password"})
+        user_data.update({
+            "role": item.role.value,
+            "hashed_password": item.hashed_password or next(hashes),
+            "created_at": item.created_at or now,
+        })
+        documents.append(user_data)
+    return documents
+
+IMPORTS: Dict[str, Import] = {
+    "articles": Import("articles", ArticleImport, prepare_articles, facet="articles"),
+    "events": Import("events", EventImport, prepare_events, facet="events"),
+    "users": Import("users", UserImport, prepare_users),
+    "opportunities": Import(
+        "volunteer_opportunities",
+        OpportunityImport,
+        prepare_opportunities,
+        facet="volunteers",
+    ),
+}
+
+async def refresh_derived_data(spec: Import) -> None:
+    """
+    Bulk inserts bypass the write handlers, so recompute the facet counts and
+    dashboard stats they would have maintained.
+    """
+    if spec.facet:
+        await facet_counts.reconcile(spec.facet)
+    await dashboard_stats.reconcile()
+
+@router.post("/imports/{dataset}", response_model=ImportReport)
+async def import_dataset(
+    request: Request,
+    dataset: Literal["articles", "events", "users", "opportunities"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    dry_run: bool = False,
+    token: str = Security(oauth2_scheme),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Bulk import a dataset from an NDJSON or CSV request body.
+    Only admin can access this endpoint.
+    Rows are validated and inserted in chunks as the body arrives; rows that fail
+    are reported by number and the rest are imported. With ``dry_run`` rows are
+    only validated.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    spec = IMPORTS[dataset]
+    result = await run_import(
+        db, spec, parse_rows(request.stream(), format), current_user, dry_run=dry_run,
+    )
+    if result.inserted and not dry_run:
+        # The rows are committed; a failed recount is left to the background
+        # reconcilers rather than turning the import into a 500.
+        try:
+            await refresh_derived_data(spec)
+        except Exception as e:
+            logger.error(f"Failed to refresh derived data after {dataset} import: {e}")
+        if spec.collection in ("articles", "events"):
+            search_service.refresh()
+        if spec.collection in ("articles", "events", "users"):
+            typeahead_service.refresh()
+    report = ImportReport(dataset=dataset, dry_run=dry_run, **vars(result))
+    return model_response(report)
\ No newline at end of file
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel
+
+from app.core.responses import list_response, model_response
+from app.core.search import search_service
+from app.core.typeahead import typeahead_service
+from app.schemas.base import Suggestion
+
+router = APIRouter(tags=["search"])
+
+class SearchHit(BaseModel):
+    id: str
+    type: Literal["article", "event"]
+    score: float
+    title: str
+    snippet: str = ""
+    date: Optional[Union[datetime, str]] = None
+    status: Optional[str] = None
+    image_url: Optional[str] = None
+    location: Optional[str] = None
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
+    total: int
+
+@router.get(
+    "/suggest", response_model=List[Suggestion], response_model_exclude_unset=True
+)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    type: Optional[Literal["article", "event", "tag", "location"]] = None,
+    limit: int = Query(10, ge=1, le=25),
+):
+    """
+    As-you-type suggestions: article and event titles, tags and event locations.
+    Served from this worker's in-memory prefix index.
+    """
+    if not typeahead_service.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Suggestions are still being indexed",
+            headers={"Retry-After": "5"},
+        )
+    types = {type} if type else None
+    return list_response(
+        Suggestion, typeahead_service.suggest(q, limit, types), exclude_unset=True
+    )
+
+
+@router.get("/", response_model=SearchResults, response_model_exclude_unset=True)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[Literal["article", "event"]] = None,
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Full-text search over articles and events, best matches first.
+    Served from this worker's in-memory index.
+    """
+    if not search_service.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search index is still being built",
+            headers={"Retry-After": "5"},
+        )
+    hits, total = search_service.search(q, kind=type, skip=skip, limit=limit)
+    results = SearchResults.model_validate({"items": hits, "total": total})
+    return model_response(results, exclude_unset=True)
\ No newline at end of file
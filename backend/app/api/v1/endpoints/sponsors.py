@@ -1,31 +1,48 @@
 from datetime import datetime
-from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from pydantic import BaseModel, Field, EmailStr
+from typing import List, Optional, Dict, Union
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+    Security,
+)
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
 from app.core.database import (
+    build_projection,
     get_collection_items,
+    get_collection_page,
     get_collection_item,
     create_collection_item,
     update_collection_item,
     delete_collection_item,
+    object_id,
     PyObjectId,
     get_db,
 )
+from app.core.conditional import conditional_item, conditional_page
+from app.core.responses import list_response, model_response
+from app.core.stats import dashboard_stats, tracked_fields
 from app.api.v1.endpoints.auth import get_current_active_user, oauth2_scheme
+from app.schemas.base import CursorPage, partial_model
 
 router = APIRouter(tags=["sponsors"])
 
+SPONSOR_SORT = [("created_at", -1), ("_id", -1)]
+
 class SponsorContact(BaseModel):
     name: str
     email: EmailStr
     phone: Optional[str] = None
     position: Optional[str] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PyObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
 class SponsorBase(BaseModel):
     name: str
@@ -42,15 +59,13 @@ class SponsorUpdate(SponsorBase):
     pass
 
 class Sponsor(SponsorBase):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(alias="_id")
     status: str = "active"
     created_at: datetime = Field(default_factory=datetime.utcnow)
     created_by: PyObjectId
     updated_at: Optional[datetime] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PyObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
 class SponsorshipInquiry(BaseModel):
     company_name: str
@@ -60,10 +75,35 @@ class SponsorshipInquiry(BaseModel):
     message: str
     desired_tier: str
 
-@router.get("/", response_model=List[Sponsor])
+SPONSOR_CARD_FIELDS = [
+    "name", "description", "logo_url", "website_url", "tier", "status",
+    "created_at", "created_by", "updated_at",
+]
+SPONSOR_FIELDS = [field for field in Sponsor.model_fields if field != "id"]
+SponsorCard = partial_model(Sponsor, "SponsorCard")
+
+@router.get(
+    "/",
+    response_model=Union[List[SponsorCard], CursorPage[SponsorCard]],
+    response_model_exclude_unset=True,
+)
 async def list_sponsors(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's next_cursor. "
+        "Pass an empty value to start cursor pagination.",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Comma-separated fields to return, or 'all'. "
+            "Defaults to the card fields."
+        ),
+    ),
     category: Optional[str] = None,
     status: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_db),
@@ -77,30 +117,63 @@ async def list_sponsors(
     if status:
         query["status"] = status
 
-    sponsors = await get_collection_items(
-        collection=db.sponsors,
-        query=query,
-        skip=skip,
-        limit=limit,
-        sort_by=[("created_at", -1)]
-    )
-    return [Sponsor.parse_obj(sponsor) for sponsor in sponsors]
+    projection = build_projection(fields, SPONSOR_FIELDS, SPONSOR_CARD_FIELDS)
+
+    async def fetch(projection):
+        if cursor is not None:
+            return await get_collection_page(
+                collection=db.sponsors,
+                query=query,
+                sort_by=SPONSOR_SORT,
+                cursor=cursor,
+                limit=limit,
+                projection=projection,
+            )
+        sponsors = await get_collection_items(
+            collection=db.sponsors,
+            query=query,
+            skip=skip,
+            limit=limit,
+            sort_by=SPONSOR_SORT,
+            projection=projection,
+        )
+        return sponsors, None
+
+    page = await conditional_page(request, response, fetch, projection)
+    if isinstance(page, Response):
+        return page
+    sponsors, next_cursor = page
+
+    if cursor is not None:
+        page = CursorPage[SponsorCard].model_validate(
+            {"items": sponsors, "next_cursor": next_cursor}
+        )
+        return model_response(page, response, exclude_unset=True)
+    return list_response(SponsorCard, sponsors, response, exclude_unset=True)
 
 @router.get("/{sponsor_id}", response_model=Sponsor)
 async def get_sponsor(
     sponsor_id: str,
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     """
     Get sponsor details. No authentication required.
     """
-    sponsor = await get_collection_item(
-        collection=db.sponsors,
-        query={"_id": PyObjectId(sponsor_id)}
-    )
+    async def fetch(projection):
+        return await get_collection_item(
+            collection=db.sponsors,
+            query={"_id": object_id(sponsor_id)},
+            projection=projection,
+        )
+
+    sponsor = await conditional_item(request, response, fetch)
+    if isinstance(sponsor, Response):
+        return sponsor
     if not sponsor:
         raise HTTPException(status_code=404, detail="Sponsor not found")
-    return Sponsor.parse_obj(sponsor)
+    return model_response(Sponsor.model_validate(sponsor), response)
 
 @router.post("/", response_model=Sponsor)
 async def create_sponsor(
@@ -119,18 +192,19 @@ async def create_sponsor(
             detail="Not enough permissions. Only admin can create sponsors."
         )
 
-    sponsor_data = sponsor.dict()
+    sponsor_data = sponsor.model_dump()
     sponsor_data.update({
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
-        "created_by": PyObjectId(current_user["_id"]),
+        "created_by": str(current_user["_id"]),
     })
 
     created_sponsor = await create_collection_item(
         collection=db.sponsors,
         item=sponsor_data
     )
-    return Sponsor.parse_obj(created_sponsor)
+    await dashboard_stats.record("sponsors", None, created_sponsor)
+    return model_response(Sponsor.model_validate(created_sponsor))
 
 @router.put("/{sponsor_id}", response_model=Sponsor)
 async def update_sponsor(
@@ -150,22 +224,21 @@ async def update_sponsor(
             detail="Not enough permissions. Only admin can update sponsors."
         )
 
-    existing_sponsor = await get_collection_item(
-        collection=db.sponsors,
-        query={"_id": PyObjectId(sponsor_id)}
-    )
-    if not existing_sponsor:
-        raise HTTPException(status_code=404, detail="Sponsor not found")
-
-    sponsor_data = sponsor.dict()
+    sponsor_data = sponsor.model_dump()
     sponsor_data["updated_at"] = datetime.utcnow()
 
-    updated_sponsor = await update_collection_item(
+    previous_sponsor = await update_collection_item(
         collection=db.sponsors,
-        query={"_id": PyObjectId(sponsor_id)},
-        update_data=sponsor_data
+        query={"_id": object_id(sponsor_id)},
+        update_data=sponsor_data,
+        return_document=ReturnDocument.BEFORE,
     )
-    return Sponsor.parse_obj(updated_sponsor)
+    if not previous_sponsor:
+        raise HTTPException(status_code=404, detail="Sponsor not found")
+    # Every field is $set, so the updated sponsor is the old one plus the update.
+    updated_sponsor = {**previous_sponsor, **sponsor_data}
+    await dashboard_stats.record("sponsors", previous_sponsor, updated_sponsor)
+    return model_response(Sponsor.model_validate(updated_sponsor))
 
 @router.delete("/{sponsor_id}")
 async def delete_sponsor(
@@ -184,23 +257,21 @@ async def delete_sponsor(
             detail="Not enough permissions. Only admin can delete sponsors."
         )
 
-    existing_sponsor = await get_collection_item(
+    deleted = await delete_collection_item(
         collection=db.sponsors,
-        query={"_id": PyObjectId(sponsor_id)}
+        query={"_id": object_id(sponsor_id)},
+        projection=tracked_fields("sponsors"),
     )
-    if not existing_sponsor:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Sponsor not found")
-
-    await delete_collection_item(
-        collection=db.sponsors,
-        query={"_id": PyObjectId(sponsor_id)}
-    )
+    await dashboard_stats.record("sponsors", deleted, None)
     return {"message": "Sponsor deleted successfully"}
 
 @router.post("/inquire")
 async def submit_sponsorship_inquiry(
     inquiry: SponsorshipInquiry,
-    current_user: dict = Depends(get_current_active_user)
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     inquiry_data = inquiry.model_dump()
     inquiry_data.update({
@@ -210,7 +281,7 @@ async def submit_sponsorship_inquiry(
     })
 
     created_inquiry = await create_collection_item(
-        collection=router.app.mongodb.sponsorship_inquiries,
+        collection=db.sponsorship_inquiries,
         item=inquiry_data
     )
     return {"message": "Sponsorship inquiry submitted successfully"} 
\ No newline at end of file
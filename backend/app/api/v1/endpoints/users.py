@@ -1,25 +1,39 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from bson import ObjectId
+from pymongo import ReturnDocument
 
 from app.core.database import (
     get_collection_items,
+    get_collection_page,
     get_collection_item,
     update_collection_item,
     delete_collection_item,
-    PydanticObjectId,
+    object_id,
+    PyObjectId,
     get_db,
     get_database,
     get_collection,
 )
-from app.api.v1.endpoints.auth import get_current_active_user, oauth2_scheme
+from app.api.v1.endpoints.auth import (
+    get_current_active_user,
+    get_password_hash,
+    oauth2_scheme,
+    user_cache,
+)
+from app.schemas.base import CursorPage, Suggestion
+from app.core.responses import list_response, model_response
+from app.core.security import security
+from app.core.stats import dashboard_stats, tracked_fields
+from app.core.typeahead import typeahead_service
 from app.schemas.user import UserRole
 
 router = APIRouter()
 
+USER_SORT = [("created_at", -1), ("_id", -1)]
+
 class UserBase(BaseModel):
     email: EmailStr
     full_name: str
@@ -31,26 +45,30 @@ class UserBase(BaseModel):
 class UserUpdate(BaseModel):
     role: Optional[UserRole] = None
     full_name: Optional[str] = None
+    password: Optional[str] = Field(None, min_length=8, max_length=100)
     avatar: Optional[str] = None
     bio: Optional[str] = None
     location: Optional[str] = None
     interests: Optional[List[str]] = None
 
 class User(UserBase):
-    id: PydanticObjectId = Field(default_factory=PydanticObjectId, alias="_id")
+    id: PyObjectId = Field(alias="_id")
     role: UserRole = UserRole.USER
     disabled: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PydanticObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
-@router.get("/", response_model=List[User])
+@router.get("/", response_model=Union[List[User], CursorPage[User]])
 async def list_users(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's next_cursor. "
+        "Pass an empty value to start cursor pagination.",
+    ),
     token: str = Security(oauth2_scheme),
     current_user: dict = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_db),
@@ -65,14 +83,56 @@ async def list_users(
             detail="Not enough permissions. Only admin can list users."
         )
 
+    if cursor is not None:
+        users, next_cursor = await get_collection_page(
+            collection=db.users,
+            query={},
+            sort_by=USER_SORT,
+            cursor=cursor,
+            limit=limit,
+        )
+        return model_response(
+            CursorPage[User].model_validate(
+                {"items": users, "next_cursor": next_cursor}
+            )
+        )
+
     users = await get_collection_items(
         collection=db.users,
         query={},
         skip=skip,
         limit=limit,
-        sort_by=[("created_at", -1)]
+        sort_by=USER_SORT
+    )
+    return list_response(User, users)
+
+@router.get("/suggest", response_model=List[Suggestion])
+async def suggest_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    token: str = Security(oauth2_scheme),
+    current_user: dict = Depends(get_current_active_user),
+):
+    """
+    As-you-type suggestions of user names and emails.
+    Only admin can access this endpoint.
+    Served from this worker's in-memory prefix index.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    if not typeahead_service.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Suggestions are still being indexed",
+            headers={"Retry-After": "5"},
+        )
+    return list_response(
+        Suggestion, typeahead_service.suggest_users(q, limit), exclude_unset=True
     )
-    return [User.parse_obj(user) for user in users]
+
 
 @router.get("/{user_id}", response_model=User)
 async def get_user(
@@ -93,11 +153,11 @@ async def get_user(
 
     user = await get_collection_item(
         collection=db.users,
-        query={"_id": PydanticObjectId(user_id)}
+        query={"_id": object_id(user_id)}
     )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return User.parse_obj(user)
+    return model_response(User.model_validate(user))
 
 @router.put("/{user_id}", response_model=User)
 async def update_user(
@@ -117,25 +177,33 @@ async def update_user(
             detail="Not enough permissions"
         )
 
-    existing_user = await get_collection_item(
-        collection=db.users,
-        query={"_id": PydanticObjectId(user_id)}
-    )
-    if not existing_user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    update_data = user_update.dict(exclude_unset=True)
+    update_data = user_update.model_dump(exclude_unset=True)
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
-    
+        update_data["hashed_password"] = await get_password_hash(
+            update_data.pop("password")
+        )
+
     update_data["updated_at"] = datetime.utcnow()
 
-    updated_user = await update_collection_item(
+    previous_user = await update_collection_item(
         collection=db.users,
-        query={"_id": PydanticObjectId(user_id)},
-        update_data=update_data
+        query={"_id": object_id(user_id)},
+        update_data=update_data,
+        return_document=ReturnDocument.BEFORE,
     )
-    return User.parse_obj(updated_user)
+    user_cache.invalidate(user_id)
+    if not previous_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if "hashed_password" in update_data or update_data.get(
+        "role", previous_user.get("role")
+    ) != previous_user.get("role"):
+        # Sessions opened with the old password or role end.
+        security.revoke_subject(user_id)
+    # Every field is $set, so the updated user is the old one plus the update.
+    updated_user = {**previous_user, **update_data}
+    typeahead_service.index_user(updated_user)
+    await dashboard_stats.record("users", previous_user, updated_user)
+    return model_response(User.model_validate(updated_user))
 
 @router.delete("/{user_id}")
 async def delete_user(
@@ -154,17 +222,17 @@ async def delete_user(
             detail="Not enough permissions. Only admin can delete users."
         )
 
-    existing_user = await get_collection_item(
+    deleted = await delete_collection_item(
         collection=db.users,
-        query={"_id": PydanticObjectId(user_id)}
+        query={"_id": object_id(user_id)},
+        projection=tracked_fields("users"),
     )
-    if not existing_user:
+    user_cache.invalidate(user_id)
+    security.revoke_subject(user_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="User not found")
-
-    await delete_collection_item(
-        collection=db.users,
-        query={"_id": PydanticObjectId(user_id)}
-    )
+    typeahead_service.remove("users", user_id)
+    await dashboard_stats.record("users", deleted, None)
     return {"message": "User deleted successfully"}
 
 @router.put("/{user_id}/role")
@@ -185,14 +253,16 @@ async def update_user_role(
 
     users_collection = await get_collection("users")
     result = await users_collection.update_one(
-        {"_id": ObjectId(user_id)},
+        {"_id": object_id(user_id)},
         {"$set": {"role": role, "updated_at": datetime.utcnow()}}
     )
+    user_cache.invalidate(user_id)
 
     if result.modified_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    security.revoke_subject(user_id)
 
     return {"message": f"User role updated to {role}"} 
\ No newline at end of file
@@ -1,23 +1,44 @@
 from datetime import datetime
-from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from pydantic import BaseModel, Field, EmailStr
+from typing import Any, List, Optional, Dict, Union
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+    Security,
+)
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi.security import OAuth2PasswordBearer
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from app.core.database import (
+    build_projection,
     get_collection_items,
+    get_collection_page,
     get_collection_item,
     create_collection_item,
     update_collection_item,
     delete_collection_item,
+    object_id,
+    owned_by,
     PyObjectId,
     get_db,
 )
+from app.core.conditional import conditional_item, conditional_page
+from app.core.facets import facet_counts
+from app.core.responses import list_response, model_response
 from app.api.v1.endpoints.auth import get_current_active_user, oauth2_scheme
+from app.schemas.base import CursorPage, partial_model
 
 router = APIRouter(tags=["volunteers"])
 
+OPPORTUNITY_SORT = [("created_at", -1), ("_id", -1)]
+
 class OpportunityBase(BaseModel):
     title: str
     description: str
@@ -40,27 +61,63 @@ class OpportunityApplication(BaseModel):
     availability: str
     references: Optional[List[Dict[str, str]]] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PyObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
 class Opportunity(OpportunityBase):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(alias="_id")
     applications_count: int = 0
-    applicants: List[PyObjectId] = []
     status: str = "open"
     created_at: datetime = Field(default_factory=datetime.utcnow)
     created_by: PyObjectId
     updated_at: Optional[datetime] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {PyObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
+
+OPPORTUNITY_CARD_FIELDS = [
+    "title",
+    "description",
+    "requirements",
+    "category",
+    "location",
+    "commitment",
+    "capacity",
+    "applications_count",
+    "status",
+    "created_at",
+    "created_by",
+    "updated_at",
+]
+OPPORTUNITY_FIELDS = [field for field in Opportunity.model_fields if field != "id"]
+OpportunityCard = partial_model(Opportunity, "OpportunityCard")
 
-@router.get("/", response_model=List[Opportunity])
+def _opportunity_access_filter(current_user: dict) -> Optional[Dict[str, Any]]:
+    """Admins and editors may modify any opportunity, other users only their own."""
+    if current_user["role"] in ["admin", "editor"]:
+        return None
+    return owned_by("created_by", current_user["_id"])
+
+@router.get(
+    "/",
+    response_model=Union[List[OpportunityCard], CursorPage[OpportunityCard]],
+    response_model_exclude_unset=True,
+)
 async def list_opportunities(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's next_cursor. "
+        "Pass an empty value to start cursor pagination.",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Comma-separated fields to return, or 'all'. "
+            "Defaults to the card fields."
+        ),
+    ),
     category: Optional[str] = None,
     status: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_db),
@@ -71,27 +128,60 @@ async def list_opportunities(
     if status:
         query["status"] = status
 
-    opportunities = await get_collection_items(
-        collection=db.volunteer_opportunities,
-        query=query,
-        skip=skip,
-        limit=limit,
-        sort_by=[("created_at", -1)]
-    )
-    return [Opportunity.parse_obj(opp) for opp in opportunities]
+    projection = build_projection(fields, OPPORTUNITY_FIELDS, OPPORTUNITY_CARD_FIELDS)
+
+    async def fetch(projection):
+        if cursor is not None:
+            return await get_collection_page(
+                collection=db.volunteer_opportunities,
+                query=query,
+                sort_by=OPPORTUNITY_SORT,
+                cursor=cursor,
+                limit=limit,
+                projection=projection,
+            )
+        opportunities = await get_collection_items(
+            collection=db.volunteer_opportunities,
+            query=query,
+            skip=skip,
+            limit=limit,
+            sort_by=OPPORTUNITY_SORT,
+            projection=projection,
+        )
+        return opportunities, None
+
+    page = await conditional_page(request, response, fetch, projection)
+    if isinstance(page, Response):
+        return page
+    opportunities, next_cursor = page
+
+    if cursor is not None:
+        page = CursorPage[OpportunityCard].model_validate(
+            {"items": opportunities, "next_cursor": next_cursor}
+        )
+        return model_response(page, response, exclude_unset=True)
+    return list_response(OpportunityCard, opportunities, response, exclude_unset=True)
 
 @router.get("/{opportunity_id}", response_model=Opportunity)
 async def get_opportunity(
     opportunity_id: str,
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    opportunity = await get_collection_item(
-        collection=db.volunteer_opportunities,
-        query={"_id": PyObjectId(opportunity_id)}
-    )
+    async def fetch(projection):
+        return await get_collection_item(
+            collection=db.volunteer_opportunities,
+            query={"_id": object_id(opportunity_id)},
+            projection=projection,
+        )
+
+    opportunity = await conditional_item(request, response, fetch)
+    if isinstance(opportunity, Response):
+        return opportunity
     if not opportunity:
         raise HTTPException(status_code=404, detail="Opportunity not found")
-    return Opportunity.parse_obj(opportunity)
+    return model_response(Opportunity.model_validate(opportunity), response)
 
 @router.post("/", response_model=Opportunity)
 async def create_opportunity(
@@ -110,13 +200,12 @@ async def create_opportunity(
             detail="Not enough permissions. Only admin and editor roles can create volunteer opportunities."
         )
 
-    opportunity_data = opportunity.dict()
+    opportunity_data = opportunity.model_dump()
     opportunity_data.update({
         "applications_count": 0,
-        "applicants": [],
         "status": "open",
         "created_at": datetime.utcnow(),
-        "created_by": PyObjectId(current_user["_id"]),
+        "created_by": str(current_user["_id"]),
         "updated_at": datetime.utcnow(),
     })
 
@@ -124,7 +213,8 @@ async def create_opportunity(
         collection=db.volunteer_opportunities,
         item=opportunity_data
     )
-    return Opportunity.parse_obj(created_opportunity)
+    await facet_counts.record("volunteers", None, created_opportunity)
+    return model_response(Opportunity.model_validate(created_opportunity))
 
 @router.put("/{opportunity_id}", response_model=Opportunity)
 async def update_opportunity(
@@ -138,26 +228,22 @@ async def update_opportunity(
     Update a volunteer opportunity. Only admin, editor, or the organizer can update it.
     Requires authentication with Bearer token.
     """
-    existing_opportunity = await get_collection_item(
-        collection=db.volunteer_opportunities,
-        query={"_id": PyObjectId(opportunity_id)}
-    )
-    if not existing_opportunity:
-        raise HTTPException(status_code=404, detail="Opportunity not found")
-
-    if (current_user["role"] not in ["admin", "editor"] and
-        str(existing_opportunity["created_by"]) != current_user["_id"]):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    opportunity_data = opportunity.dict()
+    opportunity_data = opportunity.model_dump()
     opportunity_data["updated_at"] = datetime.utcnow()
 
-    updated_opportunity = await update_collection_item(
+    previous_opportunity = await update_collection_item(
         collection=db.volunteer_opportunities,
-        query={"_id": PyObjectId(opportunity_id)},
-        update_data=opportunity_data
+        query={"_id": object_id(opportunity_id)},
+        update_data=opportunity_data,
+        access_filter=_opportunity_access_filter(current_user),
+        return_document=ReturnDocument.BEFORE,
     )
-    return Opportunity.parse_obj(updated_opportunity)
+    if not previous_opportunity:
+        raise HTTPException(status_code=404, detail="Opportunity not found")
+    # Every field is $set, so the updated opportunity is the old one plus the update.
+    updated_opportunity = {**previous_opportunity, **opportunity_data}
+    await facet_counts.record("volunteers", previous_opportunity, updated_opportunity)
+    return model_response(Opportunity.model_validate(updated_opportunity))
 
 @router.delete("/{opportunity_id}")
 async def delete_opportunity(
@@ -170,20 +256,17 @@ async def delete_opportunity(
     Delete a volunteer opportunity. Only admin, editor, or the organizer can delete it.
     Requires authentication with Bearer token.
     """
-    existing_opportunity = await get_collection_item(
+    deleted = await delete_collection_item(
         collection=db.volunteer_opportunities,
-        query={"_id": PyObjectId(opportunity_id)}
+        query={"_id": object_id(opportunity_id)},
+        access_filter=_opportunity_access_filter(current_user),
+        projection={"category": 1},
     )
-    if not existing_opportunity:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Opportunity not found")
-
-    if (current_user["role"] not in ["admin", "editor"] and
-        str(existing_opportunity["created_by"]) != current_user["_id"]):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    deleted = await delete_collection_item(
-        collection=db.volunteer_opportunities,
-        query={"_id": PyObjectId(opportunity_id)}
+    await facet_counts.record("volunteers", deleted, None)
+    await db.volunteer_applications.delete_many(
+        {"opportunity_id": str(deleted["_id"])}
     )
     return {"message": "Opportunity deleted successfully"}
 
@@ -198,45 +281,49 @@ async def apply_for_opportunity(
     Apply for a volunteer opportunity. Any authenticated user can apply.
     Requires authentication with Bearer token.
     """
-    opportunity = await get_collection_item(
-        collection=db.volunteer_opportunities,
-        query={"_id": PyObjectId(opportunity_id)}
-    )
-    if not opportunity:
-        raise HTTPException(status_code=404, detail="Opportunity not found")
-
-    if opportunity["status"] != "open":
-        raise HTTPException(status_code=400, detail="This opportunity is no longer accepting applications")
-
-    if opportunity["applications_count"] >= opportunity["capacity"]:
-        raise HTTPException(status_code=400, detail="This opportunity has reached its capacity")
-
-    if PyObjectId(current_user["_id"]) in opportunity["applicants"]:
-        raise HTTPException(status_code=400, detail="You have already applied for this opportunity")
-
-    # Store application in a separate collection
+    opportunity_oid = object_id(opportunity_id)
     application_data = {
-        "opportunity_id": PyObjectId(opportunity_id),
-        "user_id": PyObjectId(current_user["_id"]),
+        "opportunity_id": str(opportunity_oid),
+        "user_id": str(current_user["_id"]),
         "user_name": current_user["full_name"],
         "user_email": current_user["email"],
         "status": "pending",
         "created_at": datetime.utcnow(),
     }
+    # The unique (opportunity_id, user_id) index rejects duplicate applications.
+    try:
+        await db.volunteer_applications.insert_one(application_data)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=400, detail="You have already applied for this opportunity",
+        ) from None
 
-    await create_collection_item(
-        collection=db.volunteer_applications,
-        item=application_data
+    # Take a slot only while the opportunity is open and below capacity.
+    # Opportunities without a status are open, as in the Opportunity model.
+    updated_opportunity = await db.volunteer_opportunities.find_one_and_update(
+        {
+            "_id": opportunity_oid,
+            "status": {"$in": ["open", None]},
+            "$expr": {"$lt": [{"$ifNull": ["$applications_count", 0]}, "$capacity"]},
+        },
+        {"$inc": {"applications_count": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        projection={"_id": 1},
     )
+    if updated_opportunity:
+        return {"message": "Application submitted successfully"}
 
-    # Update opportunity stats
-    updated_opportunity = await update_collection_item(
-        collection=db.volunteer_opportunities,
-        query={"_id": PyObjectId(opportunity_id)},
-        update_data={
-            "applicants": [*opportunity["applicants"], PyObjectId(current_user["_id"])],
-            "applications_count": opportunity["applications_count"] + 1,
-            "updated_at": datetime.utcnow(),
-        }
+    await db.volunteer_applications.delete_one({"_id": application_data["_id"]})
+    opportunity = await db.volunteer_opportunities.find_one(
+        {"_id": opportunity_oid},
+        {"status": 1},
+    )
+    if not opportunity:
+        raise HTTPException(status_code=404, detail="Opportunity not found")
+    if opportunity.get("status", "open") != "open":
+        raise HTTPException(
+            status_code=400,
+            detail="This opportunity is no longer accepting applications",
+        )
+    raise HTTPException(
+        status_code=400, detail="This opportunity has reached its capacity"
     )
-    return {"message": "Application submitted successfully"} 
\ No newline at end of file
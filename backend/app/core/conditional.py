@@ -0,0 +1,175 @@
+"""
+Conditional GET support (ETag / Last-Modified).
+
+A document's version is its ``updated_at``, or ``created_at`` if it was
+never updated. Write handlers bump ``updated_at``, so a response's validators
+change whenever one of its documents changes. When a request carries
+If-None-Match or If-Modified-Since, the versions are first read with a
+projection of just ``_id`` and the version fields, and the request is
+answered with 304 without fetching or serializing the full documents.
+
+ETags are weak: counters updated without touching ``updated_at`` (buffered
+article views) may be stale in a 304.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from bson import json_util
+from fastapi import Request, Response
+
+VERSION_FIELDS = ("updated_at", "created_at")
+VERSION_PROJECTION = dict.fromkeys(VERSION_FIELDS, 1)
+
+Projection = Optional[Dict[str, int]]
+Page = Tuple[List[Dict[str, Any]], Optional[str]]
+
+
+def document_version(document: Dict[str, Any]) -> Optional[datetime]:
+    return document.get("updated_at") or document.get("created_at")
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(json_util.dumps(list(parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Motor returns naive datetimes in UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison) or, when absent,
+    If-Modified-Since against the current validators.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+        return "*" in tags or _opaque_tag(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second precision.
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def set_validators(
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    vary: Optional[str] = None,
+) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            _as_utc(last_modified), usegmt=True
+        )
+    # Let clients store the response but always revalidate it.
+    response.headers["Cache-Control"] = "no-cache"
+    if vary:
+        response.headers["Vary"] = vary
+
+
+def not_modified(
+    etag: str, last_modified: Optional[datetime] = None, vary: Optional[str] = None
+) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified, vary)
+    return response
+
+
+def item_validators(
+    document: Dict[str, Any], *vary_on: Any
+) -> Tuple[str, Optional[datetime]]:
+    version = document_version(document)
+    return make_etag(document["_id"], version, *vary_on), version
+
+
+def page_etag(request: Request, page: Page, *vary_on: Any) -> str:
+    """ETag of a list response: its query string plus each document's id and version."""
+    documents, next_cursor = page
+    versions = [(document["_id"], document_version(document)) for document in documents]
+    return make_etag(str(request.url.query), versions, next_cursor, *vary_on)
+
+
+async def conditional_item(
+    request: Request,
+    response: Response,
+    fetch: Callable[[Projection], Awaitable[Optional[Dict[str, Any]]]],
+    *vary_on: Any,
+    vary: Optional[str] = None,
+) -> Union[Response, Dict[str, Any], None]:
+    """
+    Fetch one document with ``fetch(projection)``. Returns None when it does
+    not exist, a 304 response when the client's copy is current, otherwise
+    the full document with ETag and Last-Modified set on ``response``.
+    ``vary_on`` lists anything else the response body depends on.
+    """
+    if is_conditional(request):
+        current = await fetch(VERSION_PROJECTION)
+        if current is None:
+            return None
+        etag, last_modified = item_validators(current, *vary_on)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified, vary)
+
+    document = await fetch(None)
+    if document is not None:
+        etag, last_modified = item_validators(document, *vary_on)
+        set_validators(response, etag, last_modified, vary)
+    return document
+
+
+async def conditional_page(
+    request: Request,
+    response: Response,
+    fetch: Callable[[Projection], Awaitable[Page]],
+    projection: Projection,
+    *vary_on: Any,
+    vary: Optional[str] = None,
+) -> Union[Response, Page]:
+    """
+    Fetch a page with ``fetch(projection)``, returning (documents, next_cursor)
+    or a 304 response. Lists only get an ETag: a deleted or reordered item
+    does not move their newest modification time.
+    """
+    if is_conditional(request):
+        etag = page_etag(request, await fetch(VERSION_PROJECTION), *vary_on)
+        if is_not_modified(request, etag):
+            return not_modified(etag, vary=vary)
+
+    fetch_projection = (
+        None if projection is None else {**projection, **VERSION_PROJECTION}
+    )
+    documents, next_cursor = await fetch(fetch_projection)
+    set_validators(
+        response, page_etag(request, (documents, next_cursor), *vary_on), vary=vary
+    )
+    if projection is not None:
+        # Only the requested fields go into the response.
+        for field in VERSION_FIELDS:
+            if field not in projection:
+                for document in documents:
+                    document.pop(field, None)
+    return documents, next_cursor
@@ -1,5 +1,5 @@
-from typing import List
-from pydantic import BaseSettings
+from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 import json
 
 class Settings(BaseSettings):
@@ -21,18 +21,81 @@ class Settings(BaseSettings):
     # MongoDB settings
     MONGODB_URL: str = "mongodb://mongo:27017"
     DATABASE_NAME: str = "globalnepali"
+    MONGODB_ENSURE_INDEXES: bool = True  # Build declared indexes on startup
+    MONGODB_MAX_POOL_SIZE: int = 100  # Connections per worker process
+    MONGODB_MIN_POOL_SIZE: int = 0
+    # Close idle connections after 5 minutes
+    MONGODB_MAX_IDLE_TIME_MS: int = 5 * 60 * 1000
+    # Max wait for a free connection
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGODB_PREWARM_CONNECTIONS: int = 0  # Connections to open on startup
+
+    # Write-behind counters
+    VIEW_COUNTER_FLUSH_INTERVAL_SECONDS: float = 5.0
+    # Flush early once increments are this old
+    VIEW_COUNTER_MAX_LAG_SECONDS: float = 30.0
+
+    # Authenticated-user cache (per worker)
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    # Max staleness of role/is_active after a change
+    USER_CACHE_TTL_SECONDS: float = 30.0
 
     # JWT settings
     JWT_SECRET: str = "your-secret-key"  # Change this in production!
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # Verified-token cache (per worker)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: float = 300.0
+
+    # Password hashing: "thread" or "process" pool; workers caps concurrent bcrypt calls
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    # Running + queued hashes before login/register return 429
+    PASSWORD_HASH_MAX_IN_FLIGHT: int = 32
+
+    # Admission control for login/register (per worker)
+    AUTH_IP_RATE_PER_MINUTE: float = 30
+    AUTH_IP_BURST: int = 10
+    AUTH_ACCOUNT_RATE_PER_MINUTE: float = 6
+    AUTH_ACCOUNT_BURST: int = 5
+
+    # In-process search and typeahead indexes (per worker)
+    # Pick up other workers' writes; 0 builds once
+    SEARCH_REBUILD_INTERVAL_SECONDS: float = 300.0
+
+    # Facet counts
+    # Recount with $group to fix drift; 0 disables
+    FACET_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+
+    # Admin dashboard stats
+    # Recompute from the collections; 0 disables
+    STATS_RECONCILE_INTERVAL_SECONDS: float = 600.0
+
+    # Admin exports
+    EXPORT_BATCH_SIZE: int = 1000  # Documents read and written per chunk
+
+    # Bulk imports
+    IMPORT_CHUNK_SIZE: int = 1000  # Rows validated and inserted per insert_many
+    # Failed rows listed in the report; the rest are only counted
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    IMPORT_MAX_ROW_BYTES: int = 1_000_000  # Longer lines abort the import
+
+    # Request timing
+    # Server-Timing header with phase and MongoDB timings
+    SERVER_TIMING_ENABLED: bool = True
+    # Log requests slower than this with their timings; 0 logs every request
+    TIMING_LOG_THRESHOLD_MS: float = 1000.0
+    # Raise when a route exceeds its MongoDB command budget (for tests)
+    ROUND_TRIP_BUDGET_STRICT: bool = False
+
     # Security settings
     SECRET_KEY: str = "your-secret-key"  # Change this in production!
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=True, extra="ignore"
+    )
 
 # Create global settings object
 settings = Settings() 
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Write-behind counters.
+
+Hot counters such as article views are aggregated in memory per process and
+flushed periodically as a single unordered ``bulk_write`` of ``$inc``
+operations, instead of one write per request. Pending increments are flushed
+on shutdown; increments of a process that dies without shutting down are
+lost, which is acceptable for view counts.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.metrics import LatencyStats, register_collector
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCounter:
+    """
+    Buffers ``$inc`` increments of one numeric field, keyed by document id.
+
+    The buffer is flushed every ``flush_interval`` seconds, and earlier when
+    the oldest pending increment is older than ``max_lag`` seconds.
+    """
+
+    def __init__(
+        self,
+        get_collection: Callable[[], Any],
+        field: str,
+        flush_interval: float,
+        max_lag: float,
+    ):
+        self._get_collection = get_collection
+        self.field = field
+        self.flush_interval = flush_interval
+        self.max_lag = max_lag
+        self._pending: Dict[Any, int] = {}
+        self._oldest: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # metrics
+        self.flushes = 0
+        self.flush_failures = 0
+        self.flushed_increments = 0
+        self.last_flush_size = 0
+        self.flush_lag = LatencyStats()
+        self.flush_duration = LatencyStats()
+
+    def increment(self, key: Any, amount: int = 1) -> None:
+        self._pending[key] = self._pending.get(key, 0) + amount
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        elif self._wake is not None and self.lag() >= self.max_lag:
+            self._wake.set()
+
+    def pending(self, key: Any) -> int:
+        """Increments of ``key`` not flushed yet by this process."""
+        return self._pending.get(key, 0)
+
+    def lag(self) -> float:
+        """Age in seconds of the oldest unflushed increment."""
+        return time.monotonic() - self._oldest if self._oldest is not None else 0.0
+
+    async def flush(self) -> int:
+        """Write all pending increments. Returns the number of documents updated."""
+        if self._lock is None:
+            # Created lazily so it binds to the running event loop.
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            lag, self._oldest = self.lag(), None
+            started = time.perf_counter()
+            try:
+                await self._get_collection().bulk_write(
+                    [UpdateOne({"_id": key}, {"$inc": {self.field: amount}})
+                     for key, amount in pending.items()],
+                    ordered=False,
+                )
+            except Exception as e:
+                failed = pending
+                if isinstance(e, BulkWriteError):
+                    # Unordered: the other operations were applied and must
+                    # not be counted again.
+                    keys = list(pending)
+                    failed = {keys[error["index"]]: pending[keys[error["index"]]]
+                              for error in e.details.get("writeErrors", [])}
+                # Put the increments back so the next flush retries them.
+                for key, amount in failed.items():
+                    self._pending[key] = self._pending.get(key, 0) + amount
+                if failed:
+                    retried_since = time.monotonic() - lag
+                    self._oldest = min(self._oldest or retried_since, retried_since)
+                self.flush_failures += 1
+                self.flushed_increments += sum(pending.values()) - sum(failed.values())
+                logger.error(f"Failed to flush {self.field} increments: {e}")
+                return len(pending) - len(failed)
+            self.flush_duration.record(time.perf_counter() - started)
+            self.flush_lag.record(lag)
+            self.flushes += 1
+            self.last_flush_size = len(pending)
+            self.flushed_increments += sum(pending.values())
+            return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            self._wake.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            self._wake = None
+        await self.flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pending_documents": len(self._pending),
+            "pending_increments": sum(self._pending.values()),
+            "lag_seconds": self.lag(),
+            "flushes": self.flushes,
+            "flush_failures": self.flush_failures,
+            "flushed_increments": self.flushed_increments,
+            "last_flush_size": self.last_flush_size,
+            "flush_lag": self.flush_lag.snapshot(),
+            "flush_duration": self.flush_duration.snapshot(),
+        }
+
+
+article_views = BufferedCounter(
+    get_collection=lambda: db.db.articles,
+    field="views_count",
+    flush_interval=settings.VIEW_COUNTER_FLUSH_INTERVAL_SECONDS,
+    max_lag=settings.VIEW_COUNTER_MAX_LAG_SECONDS,
+)
+register_collector("article_views", article_views.snapshot)
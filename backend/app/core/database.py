@@ -1,54 +1,197 @@
-from typing import Any, Dict, List, Optional, AsyncGenerator
-from bson import ObjectId
+import asyncio
+import base64
+import binascii
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, AsyncGenerator, Tuple
+from bson import ObjectId, json_util
+from bson.errors import BSONError
 from fastapi import HTTPException, Request
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ReturnDocument, monitoring
+from pymongo.collation import Collation
 from pymongo.errors import ConnectionFailure
 from app.core.config import settings
+from app.core.indexes import ensure_indexes
+from app.core.metrics import LatencyStats, register_collector
+from app.core.timing import current_timing
+from app.schemas.base import PyObjectId  # noqa: F401  (re-exported for endpoint models)
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-class PyObjectId(str):
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+def object_id(value: Any) -> ObjectId:
+    """Convert an id from a request path or body to an ObjectId, 400 if malformed."""
+    if isinstance(value, ObjectId):
+        return value
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail="Invalid id")
+    return ObjectId(value)
 
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return str(ObjectId(v))
+class ConnectionPoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Pool telemetry: checkout wait times, connections in use and open
+    connections. Events are emitted from driver threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.checkout_wait = LatencyStats()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.open_connections = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "open_connections": self.open_connections,
+                "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+            }
+        return {**counters, "checkout_wait": self.checkout_wait.snapshot()}
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            self.checkout_wait.record(time.perf_counter() - started)
+            self._local.started = None
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Times every MongoDB command and attributes it to the current request,
+    see app.core.timing. Events are emitted from driver threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duration = LatencyStats()
+        self.failures = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            failures = self.failures
+        return {"failures": failures, "duration": self.duration.snapshot()}
 
-    @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def _finished(self, event) -> None:
+        seconds = event.duration_micros / 1_000_000
+        self.duration.record(seconds)
+        timing = current_timing()
+        if timing is not None:
+            timing.add_command(seconds)
 
-PydanticObjectId = PyObjectId
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        with self._lock:
+            self.failures += 1
+        self._finished(event)
 
 class DatabaseManager:
+    """
+    Owns the single MongoDB client (and connection pool) of the process.
+    Connected once from the application lifespan.
+    """
     client: AsyncIOMotorClient = None
     db: AsyncIOMotorDatabase = None
 
+    def __init__(self):
+        self.pool_monitor = ConnectionPoolMonitor()
+        self.command_monitor = CommandMonitor()
+        register_collector("mongodb_pool", self.pool_monitor.snapshot)
+        register_collector("mongodb_commands", self.command_monitor.snapshot)
+
     async def connect_to_database(self):
+        if self.client is not None:
+            return
         logger.info("Connecting to MongoDB...")
         try:
             self.client = AsyncIOMotorClient(
                 settings.MONGODB_URL,
-                maxPoolSize=10,
-                minPoolSize=1
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+                event_listeners=[self.pool_monitor, self.command_monitor],
             )
             self.db = self.client[settings.DATABASE_NAME]
             await self.client.admin.command('ping')
             logger.info("Successfully connected to MongoDB.")
+            if settings.MONGODB_PREWARM_CONNECTIONS:
+                await self.prewarm_pool(settings.MONGODB_PREWARM_CONNECTIONS)
+            if settings.MONGODB_ENSURE_INDEXES:
+                await ensure_indexes(self.db)
         except ConnectionFailure as e:
             logger.error(f"Could not connect to MongoDB: {e}")
             raise
 
+    async def prewarm_pool(self, connections: int):
+        """
+        Open connections up front so the first requests after startup do not
+        pay for connection setup. Concurrent pings each check out their own
+        connection.
+        """
+        connections = min(connections, settings.MONGODB_MAX_POOL_SIZE)
+        await asyncio.gather(
+            *(self.client.admin.command("ping") for _ in range(connections))
+        )
+        logger.info(f"Pre-warmed MongoDB pool with up to {connections} connections.")
+
     async def close_database_connection(self):
         logger.info("Closing MongoDB connection...")
         if self.client:
             self.client.close()
+            self.client = None
+            self.db = None
             logger.info("MongoDB connection closed.")
 
 db = DatabaseManager()
@@ -95,11 +238,11 @@ async def update_document(
     """
     collection = await get_collection(collection_name)
     update_data["updated_at"] = datetime.utcnow()
-    await collection.update_one(
+    return await collection.find_one_and_update(
         {"_id": document_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=True,
     )
-    return await collection.find_one({"_id": document_id})
 
 async def delete_document(collection_name: str, document_id: str) -> bool:
     """
@@ -116,34 +259,191 @@ async def get_document(collection_name: str, document_id: str) -> Dict[str, Any]
     collection = await get_collection(collection_name)
     return await collection.find_one({"_id": document_id})
 
+def build_projection(
+    fields: Optional[str],
+    allowed: Iterable[str],
+    default: Iterable[str],
+) -> Optional[Dict[str, int]]:
+    """
+    Turn a comma-separated ``fields`` query parameter into a Mongo projection.
+    Falls back to ``default`` when no fields are requested; ``fields=all``
+    disables the projection and returns whole documents.
+    """
+    if fields == "all":
+        return None
+    requested = (
+        [f.strip() for f in fields.split(",") if f.strip()] if fields else list(default)
+    )
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return dict.fromkeys(requested, 1)
+
 async def get_collection_items(
     collection: Any,
-    query: Dict[str, Any] = {},
+    query: Optional[Dict[str, Any]] = None,
     skip: int = 0,
     limit: int = 100,
     sort_by: Optional[List[tuple]] = None,
+    projection: Optional[Dict[str, int]] = None,
 ) -> List[Dict[str, Any]]:
     """Generic function to get items from a MongoDB collection."""
     try:
-        cursor = collection.find(query).skip(skip).limit(limit)
+        cursor = collection.find(query or {}, projection).skip(skip).limit(limit)
         if sort_by:
             cursor = cursor.sort(sort_by)
         return await cursor.to_list(length=limit)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+def _get_sort_value(document: Dict[str, Any], field: str) -> Any:
+    value: Any = document
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def encode_cursor(document: Dict[str, Any], sort_by: List[tuple]) -> str:
+    """
+    Encode the sort key of a document as an opaque pagination cursor.
+    """
+    values = [_get_sort_value(document, field) for field, _ in sort_by]
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+# Types encode_cursor writes for sort values (None is allowed as well).
+CURSOR_VALUE_TYPES = (datetime, ObjectId, str, int, float)
+
+def decode_cursor(cursor: str, sort_by: List[tuple]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor for the same sort order.
+    Cursors come from clients, so only plain sort values are accepted: a
+    document or array could smuggle query operators into the filter.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json_util.loads(raw)
+    except (binascii.Error, ValueError, UnicodeDecodeError, BSONError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if not isinstance(values, list) or len(values) != len(sort_by):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not all(
+        value is None or isinstance(value, CURSOR_VALUE_TYPES) for value in values
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def keyset_filter(sort_by: List[tuple], values: List[Any]) -> Dict[str, Any]:
+    """
+    Build a filter matching documents strictly after the given sort key.
+    The last sort field must be unique (normally ``_id``).
+
+    MongoDB sorts null and missing values before everything else, and range
+    operators never match them, so they get their own branches: last on
+    descending sorts, first on ascending ones.
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort_by):
+        clause: Dict[str, Any] = {
+            prev_field: values[j] for j, (prev_field, _) in enumerate(sort_by[:i])
+        }
+        value = values[i]
+        if direction > 0:
+            clause[field] = {"$ne": None} if value is None else {"$gt": value}
+        elif value is None:
+            # Nothing sorts after null on a descending sort.
+            continue
+        elif field == "_id":
+            clause[field] = {"$lt": value}
+        else:
+            clause["$or"] = [{field: {"$lt": value}}, {field: None}]
+        clauses.append(clause)
+    # Only possible with a forged cursor: match nothing.
+    return {"$or": clauses} if clauses else {"_id": {"$in": []}}
+
+async def get_collection_page(
+    collection: Any,
+    query: Dict[str, Any],
+    sort_by: List[tuple],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Keyset (cursor) pagination. Returns a page of items and the cursor for
+    the next page, or None on the last page. ``sort_by`` must end with a
+    unique field so every document has a distinct position.
+    """
+    if cursor:
+        after = keyset_filter(sort_by, decode_cursor(cursor, sort_by))
+        query = {"$and": [query, after]} if query else after
+    if projection is not None:
+        # The next cursor is built from the sort key, so it must be fetched.
+        projection = {**projection, **{field: 1 for field, _ in sort_by}}
+    try:
+        items = (
+            await collection.find(query, projection)
+            .sort(sort_by)
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(items[-1], sort_by)
 
 async def get_collection_item(
     collection: Any,
     query: Dict[str, Any],
+    collation: Optional[Collation] = None,
+    projection: Optional[Dict[str, int]] = None,
+    access_filter: Optional[Dict[str, Any]] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Generic function to get a single item from a MongoDB collection."""
+    """
+    Generic function to get a single item from a MongoDB collection.
+    ``access_filter`` works as for update_collection_item: None when nothing
+    matches ``query``, 403 when the filter excludes the match.
+    """
     try:
-        item = await collection.find_one(query)
-        if not item:
-            return None
-        return item
+        item = await collection.find_one(
+            _with_access(query, access_filter), projection, collation=collation
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if not item:
+        if access_filter:
+            await _raise_if_forbidden(collection, query)
+        return None
+    return item
+
+def owned_by(field: str, user_id: Any) -> Dict[str, Any]:
+    """
+    Filter matching documents whose ``field`` references the given user.
+    Owner ids have been stored both as ObjectId and as string, match either.
+    """
+    return {field: {"$in": [ObjectId(user_id), str(user_id)]}}
+
+async def _raise_if_forbidden(collection: Any, query: Dict[str, Any]) -> None:
+    """
+    Called only after a conditional write matched nothing, to tell a missing
+    document (caller returns 404) from one the user may not modify (403).
+    """
+    try:
+        exists = await collection.find_one(query, {"_id": 1})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if exists is not None:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+def _with_access(
+    query: Dict[str, Any], access_filter: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {"$and": [query, access_filter]} if access_filter else query
 
 async def create_collection_item(
     collection: Any,
@@ -152,34 +452,59 @@ async def create_collection_item(
     """Generic function to create an item in a MongoDB collection."""
     try:
         result = await collection.insert_one(item)
-        created_item = await collection.find_one({"_id": result.inserted_id})
-        return created_item
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    # The inserted document is exactly what we sent, no need to read it back.
+    return {**item, "_id": result.inserted_id}
 
 async def update_collection_item(
     collection: Any,
     query: Dict[str, Any],
     update_data: Dict[str, Any],
+    access_filter: Optional[Dict[str, Any]] = None,
+    return_document: ReturnDocument = ReturnDocument.AFTER,
 ) -> Optional[Dict[str, Any]]:
-    """Generic function to update an item in a MongoDB collection."""
+    """
+    Generic function to update an item in a MongoDB collection.
+
+    ``access_filter`` restricts the update to documents the caller may modify
+    (e.g. ``owned_by("author.id", user_id)``) in the same round trip. Returns
+    None when no document matches ``query`` and raises 403 when one does but
+    the access filter excludes it. With ``ReturnDocument.BEFORE`` the
+    document is returned as it was before the update.
+    """
     try:
         result = await collection.find_one_and_update(
-            query,
+            _with_access(query, access_filter),
             {"$set": update_data},
-            return_document=True,
+            return_document=return_document,
         )
-        return result
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if result is None and access_filter:
+        await _raise_if_forbidden(collection, query)
+    return result
 
 async def delete_collection_item(
     collection: Any,
     query: Dict[str, Any],
-) -> bool:
-    """Generic function to delete an item from a MongoDB collection."""
+    access_filter: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Generic function to delete an item from a MongoDB collection.
+
+    Returns the deleted document, limited to ``projection`` (by default just
+    its ``_id``), or None when no document matches ``query``; see
+    update_collection_item for ``access_filter``.
+    """
     try:
-        result = await collection.delete_one(query)
-        return result.deleted_count > 0
+        result = await collection.find_one_and_delete(
+            _with_access(query, access_filter),
+            projection=projection or {"_id": 1},
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if result is None and access_filter:
+        await _raise_if_forbidden(collection, query)
+    return result
@@ -0,0 +1,229 @@
+"""
+Facet counts (documents per tag or category).
+
+Counts live in the ``facet_counts`` collection, one document per facet
+value, so reading a facet is a single indexed query returning one row per
+value. Write handlers apply the difference between a document's values
+before and after the write as ``$inc`` upserts. A periodic reconciliation
+recomputes the counts with ``$group`` and corrects any drift (e.g. a failed
+increment, or writes made outside the API).
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pymongo import DeleteOne, UpdateOne
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.metrics import LatencyStats, register_collector
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Facet:
+    """Counts of the values of ``field`` (a string or a list of strings)."""
+    name: str
+    collection: str
+    field: str
+
+
+FACETS: Dict[str, Facet] = {
+    facet.name: facet
+    for facet in (
+        Facet("articles", "articles", "tags"),
+        Facet("events", "events", "category"),
+        Facet("volunteers", "volunteer_opportunities", "category"),
+    )
+}
+
+
+def facet_values(document: Optional[Dict[str, Any]], field: str) -> List[str]:
+    """Distinct values of ``field`` in a document (None for a missing document)."""
+    if document is None:
+        return []
+    value = document.get(field)
+    if value is None:
+        return []
+    values = value if isinstance(value, list) else [value]
+    return list(
+        dict.fromkeys(item for item in values if isinstance(item, str) and item)
+    )
+
+
+def facet_delta(
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+    field: str,
+) -> Dict[str, int]:
+    """Per-value change in counts caused by a write; unchanged values are left out."""
+    delta = Counter(facet_values(after, field))
+    delta.subtract(facet_values(before, field))
+    return {value: amount for value, amount in delta.items() if amount}
+
+
+class FacetCounts:
+    """Maintains and reads ``facet_counts``."""
+
+    def __init__(self, get_db: Callable[[], Any], reconcile_interval: float):
+        self._get_db = get_db
+        self.reconcile_interval = reconcile_interval
+        self._task: Optional[asyncio.Task] = None
+        # metrics
+        self.updates = 0
+        self.update_failures = 0
+        self.reconciliations = 0
+        self.reconcile_failures = 0
+        self.corrections = 0
+        self.reconcile_duration = LatencyStats()
+
+    def _collection(self) -> Any:
+        return self._get_db().facet_counts
+
+    async def record(
+        self,
+        name: str,
+        before: Optional[Dict[str, Any]],
+        after: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Apply a write to facet ``name``: ``before`` is None for a created
+        document, ``after`` is None for a deleted one. Failures are logged,
+        not raised; the next reconciliation fixes the counts.
+        """
+        delta = facet_delta(before, after, FACETS[name].field)
+        if not delta:
+            return
+        try:
+            await self._collection().bulk_write(
+                [
+                    UpdateOne(
+                        {"facet": name, "value": value},
+                        {"$inc": {"count": amount}},
+                        upsert=True,
+                    )
+                    for value, amount in delta.items()
+                ],
+                ordered=False,
+            )
+            self.updates += 1
+        except Exception as e:
+            self.update_failures += 1
+            logger.error(f"Failed to update {name} facet counts: {e}")
+
+    async def counts(self, name: str) -> List[Dict[str, Any]]:
+        """Values of facet ``name`` with their counts, most used first."""
+        cursor = self._collection().find(
+            {"facet": name, "count": {"$gt": 0}},
+            {"_id": 0, "value": 1, "count": 1},
+        )
+        rows = await cursor.to_list(length=None)
+        rows.sort(key=lambda row: (-row["count"], row["value"]))
+        return rows
+
+    async def _actual_counts(self, facet: Facet) -> Dict[str, int]:
+        # Single categories are wrapped in a list and tag lists deduplicated,
+        # to count documents the same way as facet_values.
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {facet.field: {"$exists": True}}},
+            {"$project": {"values": {"$cond": [
+                {"$isArray": f"${facet.field}"},
+                {"$setUnion": [f"${facet.field}", []]},
+                [f"${facet.field}"],
+            ]}}},
+            {"$unwind": "$values"},
+            {"$match": {"values": {"$type": "string", "$ne": ""}}},
+            {"$group": {"_id": "$values", "count": {"$sum": 1}}},
+        ]
+        database = self._get_db()
+        cursor = database[facet.collection].aggregate(pipeline, allowDiskUse=True)
+        return {row["_id"]: row["count"] async for row in cursor}
+
+    async def reconcile(self, name: str) -> int:
+        """Recompute facet ``name`` and correct the stored counts.
+
+        Returns the number of corrections.
+        """
+        facet = FACETS[name]
+        started = time.perf_counter()
+        actual = await self._actual_counts(facet)
+        stored = {
+            row["value"]: row["count"]
+            async for row in self._collection().find(
+                {"facet": name}, {"_id": 0, "value": 1, "count": 1}
+            )
+        }
+        requests: List[Any] = []
+        for value, count in actual.items():
+            if stored.get(value) != count:
+                requests.append(
+                    UpdateOne(
+                        {"facet": name, "value": value},
+                        {"$set": {"count": count}},
+                        upsert=True,
+                    )
+                )
+        for value in stored.keys() - actual.keys():
+            requests.append(DeleteOne({"facet": name, "value": value}))
+        if requests:
+            await self._collection().bulk_write(requests, ordered=False)
+            logger.info(f"Corrected {len(requests)} {name} facet counts")
+        self.reconciliations += 1
+        self.corrections += len(requests)
+        self.reconcile_duration.record(time.perf_counter() - started)
+        return len(requests)
+
+    async def reconcile_all(self, names: Optional[Iterable[str]] = None) -> int:
+        corrections = 0
+        for name in names or FACETS:
+            try:
+                corrections += await self.reconcile(name)
+            except Exception as e:
+                self.reconcile_failures += 1
+                logger.error(f"Failed to reconcile {name} facet counts: {e}")
+        return corrections
+
+    async def _run(self) -> None:
+        # Counts are persistent, so only a fresh database needs an immediate
+        # pass; otherwise the first one waits a full interval.
+        try:
+            if await self._collection().find_one({}, {"_id": 1}) is None:
+                await self.reconcile_all()
+        except Exception as e:
+            logger.error(f"Failed to check facet counts: {e}")
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            await self.reconcile_all()
+
+    def start(self) -> None:
+        if self._task is None and self.reconcile_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "updates": self.updates,
+            "update_failures": self.update_failures,
+            "reconciliations": self.reconciliations,
+            "reconcile_failures": self.reconcile_failures,
+            "corrections": self.corrections,
+            "reconcile_duration": self.reconcile_duration.snapshot(),
+        }
+
+
+facet_counts = FacetCounts(
+    get_db=lambda: db.db,
+    reconcile_interval=settings.FACET_RECONCILE_INTERVAL_SECONDS,
+)
+register_collector("facets", facet_counts.snapshot)
@@ -0,0 +1,284 @@
+"""
+Streaming bulk imports from NDJSON or CSV.
+
+The upload is parsed incrementally from its byte stream, so the whole file is
+never held in memory. Rows are grouped in chunks of ``IMPORT_CHUNK_SIZE``;
+each chunk is validated against the dataset's model with one TypeAdapter
+call, turned into documents and written with one unordered ``insert_many``.
+Invalid rows and rows MongoDB rejects (e.g. duplicate e-mail addresses) are
+reported by row number and do not stop the import.
+"""
+import csv
+import logging
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+import orjson
+from pydantic import BaseModel, ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.responses import list_adapter
+
+logger = logging.getLogger(__name__)
+
+# (row number, parsed row or the reason it could not be parsed)
+Row = Tuple[int, Union[Dict[str, Any], str]]
+Prepare = Callable[[List[BaseModel], Dict[str, Any]], Awaitable[List[Dict[str, Any]]]]
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class UnreadableInput(ValueError):
+    """The input cannot be parsed any further (e.g. a line without an end)."""
+
+    def __init__(self, row: int, message: str):
+        super().__init__(message)
+        self.row = row
+
+
+@dataclass(frozen=True)
+class Import:
+    """
+    A dataset that can be imported: rows are validated as ``model`` and
+    turned into documents by ``prepare(items, importer)``, where importer is
+    the user running the import.
+    """
+    collection: str
+    model: Type[BaseModel]
+    prepare: Prepare
+    # Facet whose counts the collection feeds, see app.core.facets
+    facet: Optional[str] = None
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_error(self, row: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": error})
+        else:
+            self.errors_truncated = True
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a byte stream into numbered lines (1-based, without line endings)."""
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            yield (
+                number,
+                line.rstrip(b"\r").decode(
+                    "utf-8-sig" if number == 1 else "utf-8", "replace"
+                ),
+            )
+        if len(buffer) > settings.IMPORT_MAX_ROW_BYTES:
+            raise UnreadableInput(
+                number + 1, f"Line is longer than {settings.IMPORT_MAX_ROW_BYTES} bytes"
+            )
+    if buffer:
+        number += 1
+        yield (
+            number,
+            buffer.rstrip(b"\r").decode(
+                "utf-8-sig" if number == 1 else "utf-8", "replace"
+            ),
+        )
+
+
+async def ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    async for number, line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, "Expected a JSON object"
+            continue
+        yield number, row
+
+
+def csv_value(cell: str) -> Any:
+    """
+    Decode a CSV cell as written by the exports: lists and objects are JSON,
+    empty cells are missing values and a quote guards formula-like text.
+    """
+    if cell == "":
+        return None
+    if cell[0] in "[{":
+        try:
+            return orjson.loads(cell)
+        except orjson.JSONDecodeError:
+            return cell
+    if cell[0] == "'" and cell[1:2] in ("=", "+", "-", "@", "\t", "\r"):
+        return cell[1:]
+    return cell
+
+
+async def csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    """
+    Parse CSV with a header row. Quoted cells may span lines: lines are joined
+    into a record until its quotes balance.
+    """
+    columns: Optional[List[str]] = None
+    record: List[str] = []
+    start = 0
+    quotes = 0
+    async for number, line in _lines(chunks):
+        if not record:
+            start = number
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        text = "\n".join(record)
+        record, quotes = [], 0
+        if not text.strip():
+            continue
+        cells = next(csv.reader([text]))
+        if columns is None:
+            columns = [column.strip() for column in cells]
+            continue
+        if len(cells) != len(columns):
+            yield start, f"Expected {len(columns)} cells, got {len(cells)}"
+            continue
+        yield start, {
+            column: value
+            for column, value in zip(columns, map(csv_value, cells))
+            if column and value is not None
+        }
+    if record:
+        yield start, "Unterminated quoted cell"
+
+
+def parse_rows(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[Row]:
+    return csv_rows(chunks) if format == "csv" else ndjson_rows(chunks)
+
+
+def _describe(errors: List[Dict[str, Any]]) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in errors
+    )
+
+
+def validate_chunk(
+    model: Type[BaseModel],
+    rows: List[Tuple[int, Dict[str, Any]]],
+) -> Tuple[List[Tuple[int, BaseModel]], List[Tuple[int, str]]]:
+    """
+    Validate a chunk in one call. When some rows are invalid, the error
+    locations say which; the others are validated again without them.
+    """
+    adapter = list_adapter(model)
+    try:
+        items = adapter.validate_python([row for _, row in rows])
+        return [(number, item) for (number, _), item in zip(rows, items)], []
+    except ValidationError as e:
+        by_index: Dict[int, List[Dict[str, Any]]] = {}
+        for error in e.errors(include_url=False):
+            index, *loc = error["loc"]
+            by_index.setdefault(index, []).append({**error, "loc": loc})
+    invalid = [
+        (rows[index][0], _describe(errors))
+        for index, errors in sorted(by_index.items())
+    ]
+    remaining = [row for index, row in enumerate(rows) if index not in by_index]
+    valid = adapter.validate_python([row for _, row in remaining]) if remaining else []
+    return [(number, item) for (number, _), item in zip(remaining, valid)], invalid
+
+
+async def _insert_chunk(
+    collection: Any,
+    documents: List[Dict[str, Any]],
+    numbers: List[int],
+    result: ImportResult,
+) -> None:
+    try:
+        inserted = await collection.insert_many(documents, ordered=False)
+        result.inserted += len(inserted.inserted_ids)
+    except BulkWriteError as e:
+        result.inserted += e.details.get("nInserted", 0)
+        for error in e.details.get("writeErrors", []):
+            message = (
+                "Duplicate of an existing document"
+                if error.get("code") == DUPLICATE_KEY_ERROR
+                else error.get("errmsg", "")
+            )
+            result.add_error(numbers[error["index"]], message)
+    except Exception as e:
+        logger.error(f"Failed to insert import chunk: {e}")
+        for number in numbers:
+            result.add_error(number, "Could not be written")
+
+
+async def run_import(
+    database: Any,
+    spec: Import,
+    rows: AsyncIterator[Row],
+    importer: Dict[str, Any],
+    chunk_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> ImportResult:
+    """Validate and insert ``rows`` chunk by chunk.
+
+    With ``dry_run`` rows are only validated.
+    """
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    collection = database[spec.collection]
+    result = ImportResult()
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+
+    async def flush() -> None:
+        valid, invalid = validate_chunk(spec.model, chunk)
+        for number, error in invalid:
+            result.add_error(number, error)
+        if dry_run:
+            # Valid rows count as inserted; prepare (e.g. password hashing) is skipped.
+            result.inserted += len(valid)
+        elif valid:
+            documents = await spec.prepare([item for _, item in valid], importer)
+            await _insert_chunk(
+                collection, documents, [number for number, _ in valid], result
+            )
+        chunk.clear()
+
+    try:
+        async for number, row in rows:
+            result.rows += 1
+            if isinstance(row, str):
+                result.add_error(number, row)
+                continue
+            chunk.append((number, row))
+            if len(chunk) >= chunk_size:
+                await flush()
+    except UnreadableInput as e:
+        # Report what was imported up to the unreadable line.
+        result.add_error(e.row, str(e))
+    if chunk:
+        await flush()
+    return result
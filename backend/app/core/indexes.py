@@ -0,0 +1,272 @@
+"""
+Declarative MongoDB index registry.
+
+Every index the API relies on is declared here, next to ``DatabaseManager``,
+so that query shapes and the indexes serving them are reviewed together.
+Indexes are built idempotently on startup (see ``DatabaseManager``) or from
+the command line::
+
+    python -m app.core.indexes            # build missing indexes
+    python -m app.core.indexes --check    # report drift, exit 1 if any
+    python -m app.core.indexes --drop-mismatched
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.collation import Collation, CollationStrength
+from pymongo.errors import OperationFailure
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Case-insensitive comparison for e-mail addresses. Queries must pass the same
+# collation for MongoDB to pick the index.
+CASE_INSENSITIVE = Collation(locale="en", strength=CollationStrength.SECONDARY)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """A single declared index."""
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+    collation: Optional[Collation] = None
+    options: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+    @property
+    def name(self) -> str:
+        name = "_".join(f"{key}_{direction}" for key, direction in self.keys)
+        if self.unique:
+            name += "_unique"
+        if self.collation is not None:
+            name += "_ci"
+        return name
+
+    def to_model(self) -> IndexModel:
+        kwargs: Dict[str, Any] = {"name": self.name, **self.options}
+        if self.unique:
+            kwargs["unique"] = True
+        if self.collation is not None:
+            kwargs["collation"] = self.collation
+        return IndexModel(list(self.keys), **kwargs)
+
+
+def index(*keys: Tuple[str, int], **kwargs: Any) -> IndexSpec:
+    return IndexSpec(keys=tuple(keys), **kwargs)
+
+
+INDEXES: Dict[str, List[IndexSpec]] = {
+    "users": [
+        # authenticate_user / register look users up by e-mail
+        index(("email", ASCENDING), unique=True, collation=CASE_INSENSITIVE),
+        index(("created_at", DESCENDING), ("_id", DESCENDING)),
+    ],
+    "events": [
+        # list_events: optional status/category filters, sorted by date
+        index(("date", ASCENDING), ("_id", ASCENDING)),
+        index(("status", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)),
+        index(("category", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)),
+        index(
+            ("status", ASCENDING),
+            ("category", ASCENDING),
+            ("date", ASCENDING),
+            ("_id", ASCENDING),
+        ),
+    ],
+    "event_registrations": [
+        # register_for_event relies on this to reject duplicate registrations
+        index(("event_id", ASCENDING), ("user_id", ASCENDING), unique=True),
+        # list_event_attendees pages in registration order
+        index(
+            ("event_id", ASCENDING), ("registered_at", ASCENDING), ("_id", ASCENDING)
+        ),
+    ],
+    "articles": [
+        # list_articles: optional tag (multikey)/status filters, newest first
+        index(("published_at", DESCENDING), ("_id", DESCENDING)),
+        index(("tags", ASCENDING), ("published_at", DESCENDING), ("_id", DESCENDING)),
+        index(("status", ASCENDING), ("published_at", DESCENDING), ("_id", DESCENDING)),
+        index(
+            ("status", ASCENDING),
+            ("tags", ASCENDING),
+            ("published_at", DESCENDING),
+            ("_id", DESCENDING),
+        ),
+        index(("author.id", ASCENDING)),
+    ],
+    "article_likes": [
+        # like_article relies on this to reject duplicate likes
+        index(("article_id", ASCENDING), ("user_id", ASCENDING), unique=True),
+    ],
+    "volunteer_opportunities": [
+        index(("created_at", DESCENDING), ("_id", DESCENDING)),
+        index(("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)),
+        index(("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)),
+        index(
+            ("status", ASCENDING),
+            ("category", ASCENDING),
+            ("created_at", DESCENDING),
+            ("_id", DESCENDING),
+        ),
+    ],
+    "volunteer_applications": [
+        # apply_for_opportunity relies on this to reject duplicate applications
+        index(("opportunity_id", ASCENDING), ("user_id", ASCENDING), unique=True),
+        index(("user_id", ASCENDING)),
+    ],
+    "sponsors": [
+        index(("created_at", DESCENDING), ("_id", DESCENDING)),
+        index(("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)),
+        index(("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)),
+    ],
+    "sponsorship_inquiries": [
+        index(("status", ASCENDING), ("submitted_at", DESCENDING)),
+    ],
+    "facet_counts": [
+        # One document per facet value; facet handlers upsert by (facet, value)
+        index(("facet", ASCENDING), ("value", ASCENDING), unique=True),
+    ],
+}
+
+
+def _matches(spec: IndexSpec, info: Dict[str, Any]) -> bool:
+    """Check an entry of ``index_information()`` against its declaration."""
+    if [tuple(key) for key in info.get("key", [])] != list(spec.keys):
+        return False
+    if bool(info.get("unique", False)) != spec.unique:
+        return False
+    actual_collation = info.get("collation")
+    if spec.collation is None:
+        return actual_collation is None or actual_collation.get("locale") == "simple"
+    if actual_collation is None:
+        return False
+    # The server echoes back every collation option with its default value, so
+    # only compare the options we declared.
+    declared = spec.collation.document
+    return all(actual_collation.get(key) == value for key, value in declared.items())
+
+
+def diff_indexes(
+    specs: List[IndexSpec],
+    index_information: Dict[str, Dict[str, Any]],
+) -> Dict[str, List[str]]:
+    """
+    Compare declared indexes with ``collection.index_information()``.
+    Returns the names of missing, mismatched and undeclared (extra) indexes.
+    """
+    declared = {spec.name: spec for spec in specs}
+    missing = [name for name in declared if name not in index_information]
+    mismatched = [
+        name for name, spec in declared.items()
+        if name in index_information and not _matches(spec, index_information[name])
+    ]
+    extra = [
+        name for name in index_information
+        if name != "_id_" and name not in declared
+    ]
+    return {"missing": missing, "mismatched": mismatched, "extra": extra}
+
+
+async def get_index_drift(
+    database: AsyncIOMotorDatabase,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Report drift between declared and actual indexes for every collection.
+    Collections without drift are omitted.
+    """
+    drift = {}
+    for collection_name, specs in INDEXES.items():
+        info = await database[collection_name].index_information()
+        collection_drift = diff_indexes(specs, info)
+        if any(collection_drift.values()):
+            drift[collection_name] = collection_drift
+    return drift
+
+
+async def ensure_indexes(
+    database: AsyncIOMotorDatabase,
+    drop_mismatched: bool = False,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Build every declared index that does not exist yet.
+
+    Building is idempotent: existing indexes are left alone. Indexes whose
+    definition changed are only rebuilt when ``drop_mismatched`` is set,
+    otherwise they are reported as drift. An index that cannot be built, e.g.
+    a unique index over existing duplicates, is logged and left missing so
+    the application still starts. Returns the remaining drift.
+    """
+    for collection_name, specs in INDEXES.items():
+        collection = database[collection_name]
+        info = await collection.index_information()
+        collection_drift = diff_indexes(specs, info)
+
+        if drop_mismatched:
+            for name in collection_drift["mismatched"]:
+                logger.warning(f"Dropping mismatched index {collection_name}.{name}")
+                await collection.drop_index(name)
+            to_create = collection_drift["missing"] + collection_drift["mismatched"]
+        else:
+            to_create = collection_drift["missing"]
+
+        for spec in specs:
+            if spec.name not in to_create:
+                continue
+            try:
+                await collection.create_indexes([spec.to_model()])
+            except OperationFailure as e:
+                # Also covers DuplicateKeyError.
+                logger.error(
+                    f"Could not build index {collection_name}.{spec.name}: {e}"
+                )
+            else:
+                logger.info(f"Created index {collection_name}.{spec.name}")
+
+    drift = await get_index_drift(database)
+    for collection_name, collection_drift in drift.items():
+        for kind, names in collection_drift.items():
+            if names:
+                logger.warning(
+                    f"Index drift on {collection_name} ({kind}): {', '.join(names)}"
+                )
+    return drift
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and verify MongoDB indexes")
+    parser.add_argument("--check", action="store_true", help="only report drift")
+    parser.add_argument(
+        "--drop-mismatched",
+        action="store_true",
+        help="drop and rebuild indexes whose definition changed",
+    )
+    args = parser.parse_args(argv)
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        database = client[settings.DATABASE_NAME]
+        if args.check:
+            drift = await get_index_drift(database)
+        else:
+            drift = await ensure_indexes(database, drop_mismatched=args.drop_mismatched)
+    finally:
+        client.close()
+
+    for collection_name, collection_drift in drift.items():
+        for kind, names in collection_drift.items():
+            for name in names:
+                print(f"{collection_name}: {kind} {name}")
+    # Undeclared indexes are reported but do not count as failure.
+    failed = any(d["missing"] or d["mismatched"] for d in drift.values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main()))
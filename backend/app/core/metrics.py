@@ -0,0 +1,63 @@
+"""
+In-process metrics.
+
+Components register a collector returning a snapshot dict; ``GET /metrics``
+returns every snapshot, keyed by collector name. Metrics are per process, so
+with several workers each one reports its own numbers.
+"""
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict
+
+_collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+    """Register (or replace) a named metrics collector."""
+    _collectors[name] = collector
+
+
+def collect() -> Dict[str, Dict[str, Any]]:
+    """Return a snapshot of every registered collector."""
+    return {name: collector() for name, collector in _collectors.items()}
+
+
+class LatencyStats:
+    """
+    Thread-safe latency summary: count, total, max and percentiles over a
+    window of the most recent samples. Values are recorded in seconds and
+    reported in milliseconds.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, maximum = self.count, self.total, self.max
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+        return {
+            "count": count,
+            "avg_ms": (total / count * 1000) if count else 0.0,
+            "max_ms": maximum * 1000,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
@@ -0,0 +1,108 @@
+"""
+Admission control for CPU-heavy endpoints.
+
+Login and registration spend tens of milliseconds of CPU on bcrypt per
+call. Requests are checked against per-IP and per-account token buckets and
+a global cap on attempts in progress *before* any hashing happens, and
+rejected with 429 and a Retry-After header. State is per worker process.
+"""
+import math
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import register_collector
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by an arbitrary key (IP address, account, ...).
+    Each bucket holds up to ``burst`` tokens and refills at ``rate`` tokens
+    per second. Only the ``max_keys`` most recently used buckets are kept.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, key: Hashable) -> Optional[float]:
+        """
+        Take one token for ``key``. Returns None when allowed, otherwise the
+        number of seconds until a token becomes available.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            retry_after = None
+        else:
+            self._buckets[key] = (tokens, now)
+            retry_after = (1 - tokens) / self.rate if self.rate > 0 else 60.0
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+ip_limiter = RateLimiter(
+    rate=settings.AUTH_IP_RATE_PER_MINUTE / 60,
+    burst=settings.AUTH_IP_BURST,
+)
+account_limiter = RateLimiter(
+    rate=settings.AUTH_ACCOUNT_RATE_PER_MINUTE / 60,
+    burst=settings.AUTH_ACCOUNT_BURST,
+)
+rejections: Dict[str, int] = {"ip": 0, "account": 0, "hashing_busy": 0}
+# Admitted attempts that have not finished yet. Reserved at admission: the
+# hasher's own in-flight count only rises after the user lookup, too late to
+# stop a burst.
+in_progress = 0
+
+
+def admission_snapshot() -> Dict[str, Any]:
+    return {"in_progress": in_progress, "rejected": dict(rejections)}
+
+
+register_collector("auth_admission", admission_snapshot)
+
+
+def _too_many_requests(reason: str, retry_after: float) -> HTTPException:
+    rejections[reason] += 1
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests, please try again later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+@contextmanager
+def enforce_auth_admission(request: Request, account: str) -> Iterator[None]:
+    """
+    Admit a login/registration attempt or raise 429. Wrap everything the
+    attempt does, including password hashing or verification; the slot is
+    held until the block exits.
+    """
+    global in_progress  # noqa: PLW0603
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = ip_limiter.acquire(client_ip)
+    if retry_after is not None:
+        raise _too_many_requests("ip", retry_after)
+
+    retry_after = account_limiter.acquire(account.strip().lower())
+    if retry_after is not None:
+        raise _too_many_requests("account", retry_after)
+
+    if in_progress >= settings.PASSWORD_HASH_MAX_IN_FLIGHT:
+        raise _too_many_requests("hashing_busy", 1)
+    in_progress += 1
+    try:
+        yield
+    finally:
+        in_progress -= 1
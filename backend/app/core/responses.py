@@ -0,0 +1,81 @@
+"""
+Fast JSON responses.
+
+Handlers validate documents into their models once and return
+``model_response(...)``, or ``list_response(...)`` for a page of documents,
+which validates and dumps the whole page with one TypeAdapter call each.
+Models are dumped by pydantic-core in python mode, so datetime values stay
+native, and the result is encoded with orjson. Because a Response is
+returned, FastAPI skips its own validation and serialization pass through
+``response_model``, which stays on the routes for the OpenAPI schema.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.timing import phase
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    # orjson writes datetimes as RFC 3339, like datetime.isoformat().
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def _json_response(
+    data: Any, response: Optional[Response], status_code: int
+) -> FastJSONResponse:
+    result = FastJSONResponse(data, status_code=status_code)
+    if response is not None:
+        # Carry over headers already set on the injected response (e.g. ETag).
+        for name, value in response.headers.items():
+            if name != "content-length":
+                result.headers.append(name, value)
+    return result
+
+
+def model_response(
+    content: BaseModel,
+    response: Optional[Response] = None,
+    exclude_unset: bool = False,
+    status_code: int = 200,
+) -> FastJSONResponse:
+    """Serialize a model by alias, as the route's response_model would."""
+    with phase("serialize"):
+        data = content.model_dump(by_alias=True, exclude_unset=exclude_unset)
+        return _json_response(data, response, status_code)
+
+
+def list_response(
+    model: Type[BaseModel],
+    documents: List[Dict[str, Any]],
+    response: Optional[Response] = None,
+    exclude_unset: bool = False,
+) -> FastJSONResponse:
+    """Validate a list of documents as ``model`` and serialize them by alias."""
+    adapter = list_adapter(model)
+    with phase("validate"):
+        items = adapter.validate_python(documents)
+    with phase("serialize"):
+        data = adapter.dump_python(items, by_alias=True, exclude_unset=exclude_unset)
+        return _json_response(data, response, 200)
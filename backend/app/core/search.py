@@ -0,0 +1,251 @@
+"""
+In-process full-text search over articles and events.
+
+Each worker keeps an inverted index (term -> document -> weighted term
+frequency) built from MongoDB at startup and updated by the write handlers,
+and ranks matches with BM25. Queries never touch MongoDB. Writes made by
+other workers are picked up by a periodic rebuild (see app/core/views.py).
+"""
+import heapq
+import math
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.metrics import LatencyStats
+from app.core.text import tokenize, tokenize_all
+from app.core.views import MaterializedView, each_document
+
+DocKey = Tuple[str, str]  # (kind, id)
+
+# Term frequencies are weighted by the field the term occurs in.
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "excerpt": 1.5,
+    "location": 1.5,
+    "description": 1.0,
+    "content": 1.0,
+}
+
+ARTICLE_FIELDS = {
+    "title": 1, "excerpt": 1, "content": 1, "tags": 1,
+    "published_at": 1, "status": 1, "image_url": 1,
+}
+EVENT_FIELDS = {
+    "title": 1, "description": 1, "location": 1,
+    "date": 1, "time": 1, "status": 1, "category": 1,
+}
+
+SNIPPET_LENGTH = 200
+
+
+def _snippet(text: Optional[str]) -> str:
+    text = (text or "").strip()
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
+
+def article_entry(article: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Searchable fields and stored result fields of an article."""
+    fields = {
+        "title": article.get("title"),
+        "excerpt": article.get("excerpt"),
+        "content": article.get("content"),
+        "tags": article.get("tags") or [],
+    }
+    stored = {
+        "title": article.get("title", ""),
+        "snippet": _snippet(article.get("excerpt")),
+        "date": article.get("published_at"),
+        "status": article.get("status"),
+        "image_url": article.get("image_url"),
+    }
+    return fields, stored
+
+
+def event_entry(event: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Searchable fields and stored result fields of an event."""
+    fields = {
+        "title": event.get("title"),
+        "description": event.get("description"),
+        "location": event.get("location"),
+    }
+    stored = {
+        "title": event.get("title", ""),
+        "snippet": _snippet(event.get("description")),
+        "date": event.get("date"),
+        "status": event.get("status"),
+        "location": event.get("location"),
+    }
+    return fields, stored
+
+
+class InvertedIndex:
+    """
+    Inverted index with BM25 ranking over field-weighted term frequencies.
+    Not thread-safe; meant to be used from the event loop.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[DocKey, float]] = {}
+        self.doc_terms: Dict[DocKey, Tuple[str, ...]] = {}
+        self.doc_lengths: Dict[DocKey, float] = {}
+        self.stored: Dict[DocKey, Dict[str, Any]] = {}
+        self.total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, key: DocKey, fields: Dict[str, Any], stored: Dict[str, Any]) -> None:
+        """Index a document, replacing any previous version of it."""
+        self.remove(key)
+        frequencies: Counter = Counter()
+        for field, value in fields.items():
+            if not value:
+                continue
+            terms = tokenize_all(value) if isinstance(value, list) else tokenize(value)
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for term in terms:
+                frequencies[term] += weight
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[key] = frequency
+        length = sum(frequencies.values())
+        self.doc_terms[key] = tuple(frequencies)
+        self.doc_lengths[key] = length
+        self.total_length += length
+        self.stored[key] = stored
+
+    def remove(self, key: DocKey) -> None:
+        terms = self.doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            del postings[key]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(key)
+        del self.stored[key]
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> Tuple[List[Tuple[float, DocKey]], int]:
+        """
+        Rank documents matching any query term. Returns the requested page of
+        (score, key) pairs, best first, and the total number of matches.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.doc_lengths:
+            return [], 0
+        n_docs = len(self.doc_lengths)
+        avg_length = self.total_length / n_docs or 1.0
+        scores: Dict[DocKey, float] = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, frequency in postings.items():
+                if kind is not None and key[0] != kind:
+                    continue
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.doc_lengths[key] / avg_length
+                )
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (self.k1 + 1) / (
+                    frequency + norm
+                )
+        top = heapq.nlargest(
+            skip + limit, scores.items(), key=lambda item: (item[1], item[0])
+        )
+        return [(score, key) for key, score in top[skip:]], len(scores)
+
+
+class SearchService(MaterializedView):
+    """
+    The worker's search index. Changes are (key, entry) pairs, where entry is
+    None for a deleted document.
+    """
+
+    name = "search"
+
+    def __init__(self, get_db: Callable[[], Any], rebuild_interval: float):
+        super().__init__(get_db, rebuild_interval)
+        self.query_time = LatencyStats()
+
+    @property
+    def index(self) -> InvertedIndex:
+        return self.state
+
+    def empty(self) -> InvertedIndex:
+        return InvertedIndex()
+
+    async def load(self, database: Any, index: InvertedIndex) -> None:
+        async for article in each_document(database.articles, ARTICLE_FIELDS):
+            index.add(("article", str(article["_id"])), *article_entry(article))
+        async for event in each_document(database.events, EVENT_FIELDS):
+            index.add(("event", str(event["_id"])), *event_entry(event))
+
+    def apply_change(
+        self, index: InvertedIndex, change: Tuple[DocKey, Optional[Tuple[Dict, Dict]]]
+    ) -> None:
+        key, entry = change
+        if entry is None:
+            index.remove(key)
+        else:
+            index.add(key, *entry)
+
+    def index_article(self, article: Dict[str, Any]) -> None:
+        self.apply((("article", str(article["_id"])), article_entry(article)))
+
+    def index_event(self, event: Dict[str, Any]) -> None:
+        self.apply((("event", str(event["_id"])), event_entry(event)))
+
+    def remove(self, kind: str, doc_id: Any) -> None:
+        self.apply(((kind, str(doc_id)), None))
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        started = time.perf_counter()
+        index = self.index
+        ranked, total = index.search(query, kind, skip, limit)
+        hits = [
+            {
+                "id": doc_id,
+                "type": doc_kind,
+                "score": round(score, 4),
+                **index.stored[(doc_kind, doc_id)],
+            }
+            for score, (doc_kind, doc_id) in ranked
+        ]
+        self.query_time.record(time.perf_counter() - started)
+        return hits, total
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **super().snapshot(),
+            "documents": len(self.index),
+            "terms": len(self.index.postings),
+            "query_time": self.query_time.snapshot(),
+        }
+
+
+search_service = SearchService(
+    get_db=lambda: db.db,
+    rebuild_interval=settings.SEARCH_REBUILD_INTERVAL_SECONDS,
+)
+search_service.register()
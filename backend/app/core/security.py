@@ -1,14 +1,147 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import LatencyStats, register_collector
+import asyncio
+import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Claims of already verified tokens, keyed by the SHA-256 digest of the token.
+# Entries never outlive the token's own exp.
+token_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+# In-memory revocations (per worker): token digest -> token exp, and
+# subject -> time of revocation. Expired entries are pruned on revocation.
+_revoked_tokens: Dict[bytes, float] = {}
+_revoked_subjects: Dict[str, int] = {}
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+def _is_revoked(digest: bytes, claims: Dict[str, Any]) -> bool:
+    if digest in _revoked_tokens:
+        return True
+    revoked_at = _revoked_subjects.get(str(claims.get("sub")))
+    # iat is in whole seconds, so a token issued in the second of the
+    # revocation is kept: the user may just have logged in again. Tokens
+    # without iat predate subject revocation support; treat as revoked.
+    return revoked_at is not None and claims.get("iat", 0) < revoked_at
+
+def _prune_revocations() -> None:
+    now = time.time()
+    for digest in [d for d, exp in _revoked_tokens.items() if exp <= now]:
+        del _revoked_tokens[digest]
+    max_age = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    for subject in [s for s, at in _revoked_subjects.items() if at + max_age <= now]:
+        del _revoked_subjects[subject]
+
+def _token_cache_snapshot() -> Dict[str, Any]:
+    return {
+        **token_cache.snapshot(),
+        "revoked_tokens": len(_revoked_tokens),
+        "revoked_subjects": len(_revoked_subjects),
+    }
+
+register_collector("token_cache", _token_cache_snapshot)
+
+def _timed_verify(plain_password: str, hashed_password: str) -> Tuple[bool, float]:
+    started = time.perf_counter()
+    try:
+        result = pwd_context.verify(plain_password, hashed_password)
+    except Exception as e:
+        logger.error(f"Error verifying password: {e}")
+        result = False
+    return result, time.perf_counter() - started
+
+def _timed_hash(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    return pwd_context.hash(password), time.perf_counter() - started
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded executor so hashing never blocks the event loop.
+    The pool size caps how many hashes run at once; further calls queue.
+    Module-level worker functions keep a process pool usable as well.
+    """
+
+    def __init__(self, kind: str, workers: int):
+        self.kind = kind
+        self.workers = workers
+        self._executor: Optional[Executor] = None
+        self.in_flight = 0
+        self.hash_time = LatencyStats()
+        self.total_time = LatencyStats()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hash",
+                )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(0, self.in_flight - self.workers)
+
+    async def _run(self, func: Callable[..., Tuple[Any, float]], *args: Any) -> Any:
+        started = time.perf_counter()
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_seconds = await loop.run_in_executor(
+                self.executor, func, *args
+            )
+        finally:
+            self.in_flight -= 1
+        self.hash_time.record(hash_seconds)
+        self.total_time.record(time.perf_counter() - started)
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_timed_verify, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_timed_hash, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "hash_time": self.hash_time.snapshot(),
+            "total_time": self.total_time.snapshot(),
+        }
+
+password_hasher = PasswordHasher(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+)
+register_collector("password_hasher", password_hasher.snapshot)
+
 class SecurityManager:
     @staticmethod
     def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -22,7 +155,7 @@ class SecurityManager:
                 minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
             )
         
-        to_encode = {"exp": expire, "sub": str(subject)}
+        to_encode = {"exp": expire, "iat": datetime.utcnow(), "sub": str(subject)}
         try:
             encoded_jwt = jwt.encode(
                 to_encode,
@@ -37,7 +170,8 @@ class SecurityManager:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """
-        Verify a password against its hash
+        Verify a password against its hash. Blocks; request handlers should
+        await password_hasher.verify instead.
         """
         try:
             return pwd_context.verify(plain_password, hashed_password)
@@ -48,7 +182,8 @@ class SecurityManager:
     @staticmethod
     def get_password_hash(password: str) -> str:
         """
-        Hash a password
+        Hash a password. Blocks; request handlers should await
+        password_hasher.hash instead.
         """
         try:
             return pwd_context.hash(password)
@@ -59,20 +194,55 @@ class SecurityManager:
     @staticmethod
     def decode_token(token: str) -> Optional[Dict[str, Any]]:
         """
-        Decode and verify JWT token
+        Decode and verify JWT token. Verified claims are cached, so repeated
+        requests with the same token skip the signature check and parsing.
         """
-        try:
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET,
-                algorithms=[settings.JWT_ALGORITHM]
+        digest = _token_digest(token)
+        payload = token_cache.get(digest)
+        if payload is None:
+            try:
+                payload = jwt.decode(
+                    token,
+                    settings.JWT_SECRET,
+                    algorithms=[settings.JWT_ALGORITHM]
+                )
+            except JWTError as e:
+                logger.error(f"Error decoding token: {e}")
+                return None
+            except Exception as e:
+                logger.error(f"Unexpected error decoding token: {e}")
+                raise
+            exp = payload.get("exp")
+            token_cache.set(
+                digest, payload, expires_in=exp - time.time() if exp else None
             )
-            return payload
-        except JWTError as e:
-            logger.error(f"Error decoding token: {e}")
+        if _is_revoked(digest, payload):
             return None
-        except Exception as e:
-            logger.error(f"Unexpected error decoding token: {e}")
-            raise
+        return payload
+
+    @staticmethod
+    def revoke_token(token: str) -> None:
+        """
+        Reject this token from now on (e.g. on logout), in this worker.
+        """
+        digest = _token_digest(token)
+        token_cache.invalidate(digest)
+        try:
+            claims = jwt.get_unverified_claims(token)
+        except JWTError:
+            return
+        _prune_revocations()
+        _revoked_tokens[digest] = float(
+            claims.get("exp") or time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+
+    @staticmethod
+    def revoke_subject(subject: str) -> None:
+        """
+        Reject every token issued to ``subject`` so far (e.g. when a user is
+        deleted, demoted or changes their password), in this worker.
+        """
+        _prune_revocations()
+        _revoked_subjects[str(subject)] = int(time.time())
 
 security = SecurityManager() 
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Materialized admin dashboard stats.
+
+All dashboard numbers and lists live in a single ``stats`` document, so the
+dashboard is one ``find_one`` whatever the collection sizes. Write handlers
+report each write with the document before and after it; counters are
+adjusted with ``$inc`` and the "recent" lists with a capped, sorted
+``$push`` (after a ``$pull`` of the old entry), in one bulk write. A
+periodic reconciliation recomputes everything from the collections to
+correct drift, e.g. from writes made outside the API or events that have
+since taken place.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.metrics import LatencyStats, register_collector
+
+logger = logging.getLogger(__name__)
+
+STATS_ID = "dashboard"
+
+# Events are stored without ``status`` until it is changed (the model
+# defaults to "upcoming"), so active events are those not marked inactive.
+INACTIVE_EVENT_STATUSES = ["completed", "cancelled"]
+
+
+@dataclass(frozen=True)
+class Counted:
+    """Number of documents in ``collection`` matching ``query``."""
+    collection: str
+    query: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Recent:
+    """
+    The first ``size`` documents of ``collection`` matching ``query`` in
+    ``sort`` order, stored as items with ``fields`` (item field -> document
+    field). With ``from_today``, only documents whose ``from_today`` field
+    (an ISO date string) is today or later.
+    """
+    collection: str
+    fields: Dict[str, str]
+    sort: Tuple[str, int]
+    query: Dict[str, Any] = field(default_factory=dict)
+    from_today: Optional[str] = None
+    size: int = 10
+
+
+COUNTERS: Dict[str, Counted] = {
+    "total_members": Counted("users"),
+    "active_events": Counted("events", {"status": {"$nin": INACTIVE_EVENT_STATUSES}}),
+    "published_articles": Counted("articles", {"status": "published"}),
+    "sponsors": Counted("sponsors"),
+}
+
+RECENT: Dict[str, Recent] = {
+    "recent_members": Recent(
+        "users",
+        fields={"name": "full_name", "joined_at": "created_at"},
+        sort=("joined_at", -1),
+    ),
+    "upcoming_events": Recent(
+        "events",
+        fields={"title": "title", "date": "date"},
+        sort=("date", 1),
+        query={"status": {"$nin": INACTIVE_EVENT_STATUSES}},
+        from_today="date",
+    ),
+}
+
+
+def tracked_fields(collection: str) -> Dict[str, int]:
+    """Projection of the fields ``record`` reads from documents of ``collection``."""
+    projection: Dict[str, int] = {}
+    for spec in [*COUNTERS.values(), *RECENT.values()]:
+        if spec.collection == collection:
+            projection.update(dict.fromkeys(spec.query, 1))
+            projection.update(dict.fromkeys(getattr(spec, "fields", {}).values(), 1))
+    return projection
+
+
+def matches(document: Optional[Dict[str, Any]], query: Dict[str, Any]) -> bool:
+    """Evaluate the subset of query operators used above against a document."""
+    if document is None:
+        return False
+    for name, condition in query.items():
+        value = document.get(name)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$nin" in condition and value in condition["$nin"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def today() -> str:
+    return date.today().isoformat()
+
+
+def _item(spec: Recent, document: Dict[str, Any]) -> Dict[str, Any]:
+    item = {"id": str(document["_id"])}
+    for name, source in spec.fields.items():
+        item[name] = document.get(source)
+    return item
+
+
+def _qualifies(spec: Recent, document: Optional[Dict[str, Any]]) -> bool:
+    if not matches(document, spec.query):
+        return False
+    if spec.from_today is not None:
+        return str(document.get(spec.from_today) or "") >= today()
+    return True
+
+
+def stats_update(
+    collection: str,
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+) -> List[UpdateOne]:
+    """Updates of the stats document for one write (empty if nothing changes)."""
+    key = {"_id": STATS_ID}
+    document_id = str((after or before)["_id"])
+    increments = {}
+    for name, spec in COUNTERS.items():
+        if spec.collection == collection:
+            delta = matches(after, spec.query) - matches(before, spec.query)
+            if delta:
+                increments[f"counts.{name}"] = delta
+    pulls: Dict[str, Any] = {}
+    pushes: Dict[str, Any] = {}
+    for name, spec in RECENT.items():
+        if spec.collection != collection:
+            continue
+        if before is not None:
+            pulls[name] = {"id": document_id}
+        if _qualifies(spec, after):
+            sort_field, direction = spec.sort
+            pushes[name] = {
+                "$each": [_item(spec, after)],
+                "$sort": {sort_field: direction},
+                "$slice": spec.size,
+            }
+    # $pull and $push on the same array must be separate updates.
+    requests = []
+    if pulls:
+        requests.append(UpdateOne(key, {"$pull": pulls}, upsert=True))
+    update: Dict[str, Any] = {}
+    if increments:
+        update["$inc"] = increments
+    if pushes:
+        update["$push"] = pushes
+    if update:
+        requests.append(UpdateOne(key, update, upsert=True))
+    return requests
+
+
+class DashboardStats:
+    """Maintains and reads the stats document."""
+
+    def __init__(self, get_db: Callable[[], Any], reconcile_interval: float):
+        self._get_db = get_db
+        self.reconcile_interval = reconcile_interval
+        self._task: Optional[asyncio.Task] = None
+        # metrics
+        self.updates = 0
+        self.update_failures = 0
+        self.reconciliations = 0
+        self.reconcile_failures = 0
+        self.reconcile_duration = LatencyStats()
+
+    def _collection(self) -> Any:
+        return self._get_db().stats
+
+    async def record(
+        self,
+        collection: str,
+        before: Optional[Dict[str, Any]],
+        after: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Apply a write to ``collection``: ``before`` is None for a created
+        document, ``after`` is None for a deleted one. Both need the
+        ``tracked_fields`` of the collection. Failures are logged, not raised;
+        the next reconciliation fixes the stats.
+        """
+        requests = stats_update(collection, before, after)
+        if not requests:
+            return
+        try:
+            await self._collection().bulk_write(requests, ordered=True)
+            self.updates += 1
+        except Exception as e:
+            self.update_failures += 1
+            logger.error(f"Failed to update dashboard stats for {collection}: {e}")
+
+    async def read(self) -> Dict[str, Any]:
+        """The stats document; computed on the spot the first time."""
+        stats = await self._collection().find_one({"_id": STATS_ID})
+        if stats is None or "reconciled_at" not in stats:
+            await self.reconcile()
+            stats = await self._collection().find_one({"_id": STATS_ID}) or {}
+        counts = stats.get("counts", {})
+        result: Dict[str, Any] = {
+            name: max(counts.get(name, 0), 0) for name in COUNTERS
+        }
+        for name, spec in RECENT.items():
+            items = stats.get(name, [])
+            if spec.from_today is not None:
+                # Entries stay in the stored list until the next reconciliation.
+                items = [
+                    item
+                    for item in items
+                    if str(item.get(spec.from_today) or "") >= today()
+                ]
+            result[name] = items
+        result["reconciled_at"] = stats.get("reconciled_at")
+        return result
+
+    async def reconcile(self) -> None:
+        """Recompute the stats document from the collections."""
+        started = time.perf_counter()
+        database = self._get_db()
+        stats: Dict[str, Any] = {"counts": {}}
+        for name, spec in COUNTERS.items():
+            stats["counts"][name] = await database[spec.collection].count_documents(
+                spec.query
+            )
+        for name, spec in RECENT.items():
+            query = dict(spec.query)
+            if spec.from_today is not None:
+                query[spec.from_today] = {"$gte": today()}
+            sort_field, direction = spec.sort
+            cursor = (
+                database[spec.collection]
+                .find(query, dict.fromkeys(spec.fields.values(), 1))
+                .sort([(spec.fields[sort_field], direction), ("_id", direction)])
+                .limit(spec.size)
+            )
+            stats[name] = [_item(spec, document) async for document in cursor]
+        stats["reconciled_at"] = datetime.utcnow()
+        await self._collection().replace_one({"_id": STATS_ID}, stats, upsert=True)
+        self.reconciliations += 1
+        self.reconcile_duration.record(time.perf_counter() - started)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                self.reconcile_failures += 1
+                logger.error(f"Failed to reconcile dashboard stats: {e}")
+
+    def start(self) -> None:
+        if self._task is None and self.reconcile_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "updates": self.updates,
+            "update_failures": self.update_failures,
+            "reconciliations": self.reconciliations,
+            "reconcile_failures": self.reconcile_failures,
+            "reconcile_duration": self.reconcile_duration.snapshot(),
+        }
+
+
+dashboard_stats = DashboardStats(
+    get_db=lambda: db.db,
+    reconcile_interval=settings.STATS_RECONCILE_INTERVAL_SECONDS,
+)
+register_collector("dashboard_stats", dashboard_stats.snapshot)
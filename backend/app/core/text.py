@@ -0,0 +1,105 @@
+"""
+Text normalization and tokenization for mixed English/Nepali content.
+
+Python's ``\\w`` does not match Devanagari vowel signs, virama or anusvara,
+so it splits Nepali words apart. Tokens here are runs of letters and digits
+plus the Devanagari block (without the danda punctuation). Normalization
+folds case, unifies spelling variants that are common in Nepali text
+(chandrabindu/anusvara, nukta, zero-width joiners, hrasva/dirgha u in the
+plural suffix) and maps Devanagari digits to ASCII.
+"""
+import re
+import unicodedata
+from typing import Iterable, List
+
+_TOKEN = re.compile(
+    r"(?:[^\W_]|[\u0900-\u0963\u0966-\u097F\uA8E0-\uA8FF\u200C\u200D])+"
+)
+
+_FOLD = str.maketrans({
+    "\u0901": "\u0902",  # chandrabindu -> anusvara
+    "\u093C": None,  # nukta
+    "\u200C": None,  # zero-width non-joiner
+    "\u200D": None,  # zero-width joiner
+    **{chr(0x0966 + digit): str(digit) for digit in range(10)},
+})
+
+# Postpositions and the plural marker, written attached to the noun
+# ("नेपालमा", "मानिसहरूलाई"). Longest first.
+_NEPALI_SUFFIXES = sorted(
+    [
+        "लाई",
+        "देखि",
+        "सम्म",
+        "बाट",
+        "द्वारा",
+        "भित्र",
+        "माथि",
+        "तिर",
+        "को",
+        "का",
+        "की",
+        "ले",
+        "मा",
+        "हरू",
+    ],
+    key=len,
+    reverse=True,
+)
+_MIN_STEM = 3
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "was", "with",
+    "र", "छ", "छन्", "हो", "पनि", "यो", "त्यो", "यस", "तथा", "एक", "थियो", "लागि",
+})
+
+
+def normalize(text: str) -> str:
+    """Case- and spelling-folded NFC form of ``text``."""
+    return unicodedata.normalize("NFC", text).casefold().translate(_FOLD)
+
+
+def is_devanagari(token: str) -> bool:
+    return any("\u0900" <= char <= "\u097F" for char in token)
+
+
+def stem(token: str) -> str:
+    """
+    Light stemmer: strips up to two attached Nepali suffixes (a case marker,
+    then the plural). Other scripts are left as they are.
+    """
+    if not is_devanagari(token):
+        return token
+    token = token.replace("हरु", "हरू")
+    for _ in range(2):
+        for suffix in _NEPALI_SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+                token = token[: -len(suffix)]
+                break
+        else:
+            break
+    return token
+
+
+def words(text: str) -> List[str]:
+    """Normalized words of ``text``, without stemming or stopword removal."""
+    return _TOKEN.findall(normalize(text))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Index terms of ``text``: normalized, stemmed, without stopwords and
+    single letters (e.g. the "s" of "Nepal's").
+    """
+    return [
+        stem(word) for word in words(text)
+        if word not in STOPWORDS and (len(word) > 1 or word.isdigit())
+    ]
+
+
+def tokenize_all(values: Iterable[str]) -> List[str]:
+    terms: List[str] = []
+    for value in values:
+        terms.extend(tokenize(value))
+    return terms
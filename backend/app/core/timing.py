@@ -0,0 +1,243 @@
+"""
+Per-request timing.
+
+``TimingMiddleware`` gives every request a ``RequestTiming``, reachable from
+anywhere in the request through a context variable. Code marks phases with
+``with phase("auth"):``, and ``CommandMonitor`` (app.core.database) counts
+the MongoDB commands the request sends and their duration; Motor runs
+commands with the caller's context, so they are attributed to the right
+request. The result is sent as a ``Server-Timing`` header, which browser dev
+tools display, and logged with structured fields for slow requests.
+
+``ROUND_TRIP_BUDGETS`` caps the MongoDB commands of hot routes. Requests over
+budget are logged; with ``ROUND_TRIP_BUDGET_STRICT`` (meant for test runs)
+they raise ``RoundTripBudgetExceeded`` so the test fails.
+"""
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats, register_collector
+
+logger = logging.getLogger(__name__)
+
+# Most MongoDB commands a request to the route may send, keyed by
+# "METHOD path template". Authenticated routes include the user lookup on a
+# user_cache miss; conditional reads include the version-only query.
+ROUND_TRIP_BUDGETS: Dict[str, int] = {
+    "POST /api/v1/auth/login": 1,
+    "GET /api/v1/articles/": 3,
+    "GET /api/v1/articles/{article_id}": 3,
+    "POST /api/v1/articles/{article_id}/like": 5,
+    "GET /api/v1/events/": 2,
+    "GET /api/v1/events/{event_id}": 2,
+    "POST /api/v1/events/{event_id}/register": 5,
+    "DELETE /api/v1/events/{event_id}/register": 3,
+    "GET /api/v1/volunteers/": 2,
+    "GET /api/v1/volunteers/{opportunity_id}": 2,
+    "GET /api/v1/search/": 0,
+    "GET /api/v1/search/suggest": 0,
+    "GET /api/v1/facets/{facet}": 1,
+}
+
+
+class RoundTripBudgetExceeded(Exception):
+    pass
+
+
+class RequestTiming:
+    """Phase durations and MongoDB commands of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.db_commands = 0
+        self.db_seconds = 0.0
+        # Commands complete on driver threads.
+        self._lock = threading.Lock()
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_command(self, seconds: float) -> None:
+        with self._lock:
+            self.db_commands += 1
+            self.db_seconds += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        # Durations in milliseconds. db overlaps the phases that query.
+        entries = [f"total;dur={self.elapsed() * 1000:.1f}"]
+        entries += [
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()
+        ]
+        entries.append(
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_commands} commands"'
+        )
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar(
+    "request_timing", default=None
+)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to phase ``name`` of the current request."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add_phase(name, time.perf_counter() - started)
+
+
+class RouteTimings:
+    """Per-route request durations and MongoDB commands, for /metrics."""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self.over_budget = 0
+
+    def record(self, route: str, timing: RequestTiming, seconds: float) -> None:
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = {
+                "duration": LatencyStats(),
+                "db_commands": 0,
+                "max_db_commands": 0,
+            }
+        stats["duration"].record(seconds)
+        stats["db_commands"] += timing.db_commands
+        stats["max_db_commands"] = max(stats["max_db_commands"], timing.db_commands)
+
+    def snapshot(self) -> Dict[str, Any]:
+        routes = {}
+        for route, stats in self._routes.items():
+            duration = stats["duration"].snapshot()
+            routes[route] = {
+                **duration,
+                "avg_db_commands": stats["db_commands"] / duration["count"]
+                if duration["count"]
+                else 0.0,
+                "max_db_commands": stats["max_db_commands"],
+            }
+        return {"over_budget": self.over_budget, "routes": routes}
+
+
+route_timings = RouteTimings()
+register_collector("request_timing", route_timings.snapshot)
+
+
+def _route_name(scope: Dict[str, Any]) -> str:
+    """
+    "METHOD path template" of the matched route; unmatched paths are grouped.
+    The route's path may lack the prefixes of the routers it was included
+    with, so they are taken from the request path.
+    """
+    route = scope.get("route")
+    if route is None:
+        return f"{scope['method']} unmatched"
+    rendered = route.path
+    for name, value in scope.get("path_params", {}).items():
+        # A function replacement, so the value is used literally.
+        rendered = re.sub(
+            r"\{" + re.escape(name) + r"(:[^}]*)?\}",
+            lambda _, value=value: str(value),
+            rendered,
+        )
+    path = scope["path"]
+    prefix = path[:-len(rendered)] if rendered and path.endswith(rendered) else ""
+    return f"{scope['method']} {prefix}{route.path}"
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware, so streaming responses are not buffered."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        status_code = 500
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    headers: List = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception:
+            self._finish(scope, timing, status_code, strict=False)
+            raise
+        finally:
+            _current.reset(token)
+        self._finish(
+            scope, timing, status_code, strict=settings.ROUND_TRIP_BUDGET_STRICT
+        )
+
+    def _finish(
+        self,
+        scope: Dict[str, Any],
+        timing: RequestTiming,
+        status_code: int,
+        strict: bool,
+    ) -> None:
+        seconds = timing.elapsed()
+        route = _route_name(scope)
+        route_timings.record(route, timing, seconds)
+        fields = {
+            "route": route,
+            "status": status_code,
+            "duration_ms": round(seconds * 1000, 2),
+            "db_commands": timing.db_commands,
+            "db_ms": round(timing.db_seconds * 1000, 2),
+            **{
+                f"{name}_ms": round(value * 1000, 2)
+                for name, value in timing.phases.items()
+            },
+        }
+        threshold = settings.TIMING_LOG_THRESHOLD_MS
+        if threshold <= 0 or seconds * 1000 >= threshold:
+            logger.info(
+                f"{route} {status_code} {fields['duration_ms']}ms, "
+                f"{timing.db_commands} MongoDB commands in {fields['db_ms']}ms",
+                extra={"timing": fields},
+            )
+
+        budget = ROUND_TRIP_BUDGETS.get(route)
+        if budget is not None and timing.db_commands > budget:
+            route_timings.over_budget += 1
+            message = (
+                f"{route} sent {timing.db_commands} MongoDB commands, "
+                f"budget is {budget}"
+            )
+            if strict:
+                raise RoundTripBudgetExceeded(message)
+            logger.warning(message, extra={"timing": fields})
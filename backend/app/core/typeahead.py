@@ -0,0 +1,297 @@
+"""
+Typeahead suggestions from an in-memory prefix index.
+
+Suggestions are article and event titles (which link to the document), tags
+and event locations (ranked by how many documents use them) and, in a
+separate admin-only index, user names and emails. Each suggestion is stored
+in a sorted array under every word-start suffix of its normalized text, so a
+completion is a binary search plus a short forward scan: "dash" completes
+both "Dashain Festival" and "Festival of Dashain".
+"""
+import bisect
+import heapq
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.metrics import LatencyStats
+from app.core.text import normalize, words
+from app.core.views import MaterializedView, each_document
+
+EntryKey = Tuple[str, str]  # (type, id or normalized text)
+SourceKey = Tuple[str, str]  # (collection, document id)
+
+# Word-start suffixes indexed per suggestion, i.e. how deep into a long
+# title a prefix can start matching.
+MAX_KEYS_PER_TEXT = 8
+# Upper bound on index rows scanned per completion, which keeps very short
+# prefixes ("a") as fast as long ones at the cost of exhaustive ranking.
+MAX_SCAN = 1000
+
+
+class Spec(NamedTuple):
+    """A suggestion contributed by a document."""
+    type: str
+    text: str
+    id: Optional[str] = None  # None for suggestions shared between documents
+    detail: Optional[str] = None
+
+
+class Suggestion:
+    __slots__ = ("detail", "id", "keys", "text", "type", "weight")
+
+    def __init__(self, spec: Spec, keys: Tuple[str, ...]):
+        self.type = spec.type
+        self.text = spec.text
+        self.id = spec.id
+        self.detail = spec.detail
+        self.weight = 0
+        self.keys = keys
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = {"type": self.type, "text": self.text}
+        if self.id is not None:
+            result["id"] = self.id
+        if self.detail is not None:
+            result["detail"] = self.detail
+        if self.id is None:
+            result["count"] = self.weight
+        return result
+
+
+def prefix_key(text: str) -> str:
+    return " ".join(words(text))
+
+
+def _keys(spec: Spec) -> Tuple[str, ...]:
+    keys: List[str] = []
+    for value in (spec.text, spec.detail):
+        if not value:
+            continue
+        tokens = words(value)
+        for start in range(min(len(tokens), MAX_KEYS_PER_TEXT)):
+            key = " ".join(tokens[start:])
+            if key not in keys:
+                keys.append(key)
+    return tuple(keys)
+
+
+class PrefixIndex:
+    """
+    Sorted array of (key, entry) rows searched with bisect. Documents
+    contribute suggestions; shared suggestions (tags, locations) count the
+    documents that use them and disappear with the last one.
+    """
+
+    def __init__(self):
+        self._rows: List[Tuple[str, EntryKey]] = []
+        self._entries: Dict[EntryKey, Suggestion] = {}
+        self._sources: Dict[SourceKey, Tuple[EntryKey, ...]] = {}
+        self._building = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def start_build(self) -> None:
+        """Append rows unsorted until ``finish_build``, for bulk loading."""
+        self._building = True
+
+    def finish_build(self) -> None:
+        self._rows.sort()
+        self._building = False
+
+    def set_document(self, source: SourceKey, specs: Iterable[Spec]) -> None:
+        """Replace the suggestions contributed by a document."""
+        self.remove_document(source)
+        entry_keys = []
+        for spec in specs:
+            if not spec.text or not spec.text.strip():
+                continue
+            entry_key = (
+                spec.type,
+                spec.id if spec.id is not None else normalize(spec.text.strip()),
+            )
+            if entry_key in entry_keys:
+                continue
+            self._acquire(entry_key, spec)
+            entry_keys.append(entry_key)
+        if entry_keys:
+            self._sources[source] = tuple(entry_keys)
+
+    def remove_document(self, source: SourceKey) -> None:
+        for entry_key in self._sources.pop(source, ()):
+            self._release(entry_key)
+
+    def _acquire(self, entry_key: EntryKey, spec: Spec) -> None:
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            entry = self._entries[entry_key] = Suggestion(spec, _keys(spec))
+            for key in entry.keys:
+                if self._building:
+                    self._rows.append((key, entry_key))
+                else:
+                    bisect.insort(self._rows, (key, entry_key))
+        entry.weight += 1
+
+    def _release(self, entry_key: EntryKey) -> None:
+        entry = self._entries[entry_key]
+        entry.weight -= 1
+        if entry.weight > 0:
+            return
+        del self._entries[entry_key]
+        for key in entry.keys:
+            position = bisect.bisect_left(self._rows, (key, entry_key))
+            if position < len(self._rows) and self._rows[position] == (key, entry_key):
+                del self._rows[position]
+
+    def complete(
+        self, prefix: str, limit: int = 10, types: Optional[Set[str]] = None
+    ) -> List[Suggestion]:
+        """
+        Suggestions with a word starting with ``prefix``. Matches at the start
+        of the text rank first, then by weight, then shorter texts.
+        """
+        prefix = prefix_key(prefix)
+        if not prefix:
+            return []
+        entries = self._entries
+        start = bisect.bisect_left(self._rows, (prefix,))
+        leading: Dict[EntryKey, bool] = {}
+        for key, entry_key in self._rows[start:start + MAX_SCAN]:
+            if not key.startswith(prefix):
+                break
+            if types is not None and entry_key[0] not in types:
+                continue
+            if not leading.get(entry_key):
+                leading[entry_key] = key == entries[entry_key].keys[0]
+        ranked = heapq.nsmallest(
+            limit,
+            leading,
+            key=lambda entry_key: (
+                not leading[entry_key],
+                -entries[entry_key].weight,
+                len(entries[entry_key].text),
+                entry_key,
+            ),
+        )
+        return [entries[entry_key] for entry_key in ranked]
+
+
+def article_specs(article: Dict[str, Any]) -> List[Spec]:
+    specs = [Spec("article", article.get("title", ""), str(article["_id"]))]
+    specs.extend(Spec("tag", tag) for tag in article.get("tags") or [])
+    return specs
+
+
+def event_specs(event: Dict[str, Any]) -> List[Spec]:
+    return [
+        Spec("event", event.get("title", ""), str(event["_id"])),
+        Spec("location", event.get("location") or ""),
+    ]
+
+
+def user_specs(user: Dict[str, Any]) -> List[Spec]:
+    return [
+        Spec(
+            "user",
+            user.get("full_name") or user.get("email", ""),
+            str(user["_id"]),
+            user.get("email"),
+        )
+    ]
+
+
+class TypeaheadState(NamedTuple):
+    public: PrefixIndex
+    users: PrefixIndex
+
+
+class TypeaheadService(MaterializedView):
+    """
+    The worker's typeahead indexes. Changes are (index name, source, specs)
+    tuples, where specs is None for a deleted document.
+    """
+
+    name = "typeahead"
+
+    def __init__(self, get_db: Callable[[], Any], rebuild_interval: float):
+        super().__init__(get_db, rebuild_interval)
+        self.query_time = LatencyStats()
+
+    def empty(self) -> TypeaheadState:
+        return TypeaheadState(PrefixIndex(), PrefixIndex())
+
+    async def load(self, database: Any, state: TypeaheadState) -> None:
+        for index in state:
+            index.start_build()
+        async for article in each_document(database.articles, {"title": 1, "tags": 1}):
+            state.public.set_document(
+                ("articles", str(article["_id"])), article_specs(article)
+            )
+        async for event in each_document(database.events, {"title": 1, "location": 1}):
+            state.public.set_document(("events", str(event["_id"])), event_specs(event))
+        async for user in each_document(database.users, {"full_name": 1, "email": 1}):
+            state.users.set_document(("users", str(user["_id"])), user_specs(user))
+        for index in state:
+            index.finish_build()
+
+    def apply_change(
+        self, state: TypeaheadState, change: Tuple[str, SourceKey, Optional[List[Spec]]]
+    ) -> None:
+        index_name, source, specs = change
+        index = getattr(state, index_name)
+        if specs is None:
+            index.remove_document(source)
+        else:
+            index.set_document(source, specs)
+
+    def index_article(self, article: Dict[str, Any]) -> None:
+        self.apply(
+            ("public", ("articles", str(article["_id"])), article_specs(article))
+        )
+
+    def index_event(self, event: Dict[str, Any]) -> None:
+        self.apply(("public", ("events", str(event["_id"])), event_specs(event)))
+
+    def index_user(self, user: Dict[str, Any]) -> None:
+        self.apply(("users", ("users", str(user["_id"])), user_specs(user)))
+
+    def remove(self, collection: str, doc_id: Any) -> None:
+        index_name = "users" if collection == "users" else "public"
+        self.apply((index_name, (collection, str(doc_id)), None))
+
+    def _complete(
+        self, index: PrefixIndex, prefix: str, limit: int, types: Optional[Set[str]]
+    ) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        suggestions = [
+            entry.as_dict() for entry in index.complete(prefix, limit, types)
+        ]
+        self.query_time.record(time.perf_counter() - started)
+        return suggestions
+
+    def suggest(
+        self, prefix: str, limit: int = 10, types: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Public suggestions: article and event titles, tags and locations."""
+        return self._complete(self.state.public, prefix, limit, types)
+
+    def suggest_users(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """User names and emails. Admin only."""
+        return self._complete(self.state.users, prefix, limit, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **super().snapshot(),
+            "suggestions": len(self.state.public),
+            "users": len(self.state.users),
+            "query_time": self.query_time.snapshot(),
+        }
+
+
+typeahead_service = TypeaheadService(
+    get_db=lambda: db.db,
+    rebuild_interval=settings.SEARCH_REBUILD_INTERVAL_SECONDS,
+)
+typeahead_service.register()
@@ -0,0 +1,144 @@
+"""
+Per-worker in-memory views of MongoDB data.
+
+A view is built from MongoDB on startup, kept current by the write handlers
+of the worker that serves the write, and rebuilt periodically to pick up
+writes served by other workers (and to correct any drift). A rebuild fills a
+fresh state off to the side and swaps it in; changes applied while it runs
+are replayed onto the new state first, so none are lost.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+# Retry interval while the first build keeps failing
+INITIAL_RETRY_SECONDS = 5.0
+# Documents loaded between yields to the event loop during a rebuild
+LOAD_BATCH_SIZE = 500
+
+
+async def each_document(
+    collection: Any, projection: Dict[str, int], query: Optional[Dict] = None
+):
+    """Iterate a collection, yielding to the event loop every LOAD_BATCH_SIZE docs."""
+    loaded = 0
+    async for document in collection.find(query or {}, projection):
+        yield document
+        loaded += 1
+        if loaded % LOAD_BATCH_SIZE == 0:
+            # Building a view is CPU bound; let requests through.
+            await asyncio.sleep(0)
+
+
+class MaterializedView(ABC):
+    """
+    Base class of in-memory views. Subclasses implement ``empty`` (a new
+    state), ``load`` (fill a state from the database) and ``apply_change``
+    (apply a change made by a write handler to a state).
+    """
+
+    name = "view"
+
+    def __init__(self, get_db: Callable[[], Any], rebuild_interval: float):
+        self._get_db = get_db
+        self.rebuild_interval = rebuild_interval
+        self.state = self.empty()
+        self.ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Changes seen while a rebuild is running, replayed onto the new state.
+        self._replay: Optional[List[Any]] = None
+        # metrics
+        self.rebuilds = 0
+        self.rebuild_failures = 0
+        self.last_rebuild_seconds = 0.0
+
+    @abstractmethod
+    def empty(self) -> Any:
+        ...
+
+    @abstractmethod
+    async def load(self, database: Any, state: Any) -> None:
+        ...
+
+    @abstractmethod
+    def apply_change(self, state: Any, change: Any) -> None:
+        ...
+
+    def apply(self, change: Any) -> None:
+        self.apply_change(self.state, change)
+        if self._replay is not None:
+            self._replay.append(change)
+
+    async def rebuild(self) -> None:
+        """Build a new state from MongoDB and swap it in."""
+        started = time.perf_counter()
+        state = self.empty()
+        self._replay = []
+        try:
+            await self.load(self._get_db(), state)
+            for change in self._replay:
+                self.apply_change(state, change)
+        finally:
+            self._replay = None
+        self.state = state
+        self.ready = True
+        self.rebuilds += 1
+        self.last_rebuild_seconds = time.perf_counter() - started
+        logger.info(f"Rebuilt {self.name} view in {self.last_rebuild_seconds:.2f}s")
+
+    async def _try_rebuild(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception as e:
+            self.rebuild_failures += 1
+            logger.error(f"Failed to rebuild {self.name} view: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await self._try_rebuild()
+            if self.rebuild_interval <= 0 and self.ready:
+                return
+            await asyncio.sleep(
+                self.rebuild_interval if self.ready else INITIAL_RETRY_SECONDS
+            )
+
+    def refresh(self) -> None:
+        """
+        Rebuild in the background without waiting for the next interval, e.g.
+        after a bulk write. Does nothing unless started or while rebuilding.
+        """
+        if self._task is None or self._replay is not None:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._try_rebuild())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refresh_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = self._refresh_task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "rebuilds": self.rebuilds,
+            "rebuild_failures": self.rebuild_failures,
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+        }
+
+    def register(self) -> None:
+        register_collector(self.name, self.snapshot)
@@ -1,13 +1,22 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from motor.motor_asyncio import AsyncIOMotorClient
 from mangum import Mangum
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from app.core.config import settings
+from app.core.counters import article_views
 from app.core.database import db
+from app.core.facets import facet_counts
+from app.core.metrics import collect
+from app.core.search import search_service
+from app.core.typeahead import typeahead_service
+from app.core.security import password_hasher
+from app.core.stats import dashboard_stats
+from app.core.timing import TimingMiddleware
 from app.api.v1.api import api_router
+from app.api.v1.endpoints.auth import get_current_active_user
 import logging
 
 # Configure logging
@@ -17,13 +26,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize services on startup and clean them up on shutdown.
+    The process shares a single MongoDB client owned by ``db``.
+    """
+    logger.info("Starting up application...")
+    await db.connect_to_database()
+    article_views.start()
+    search_service.start()
+    typeahead_service.start()
+    facet_counts.start()
+    dashboard_stats.start()
+    yield
+    logger.info("Shutting down application...")
+    await dashboard_stats.stop()
+    await facet_counts.stop()
+    await typeahead_service.stop()
+    await search_service.stop()
+    await article_views.stop()
+    await db.close_database_connection()
+    password_hasher.shutdown()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="API for Global Nepali platform",
     version="1.0.0",
     docs_url=None,  # Disable default docs
     redoc_url=None,  # Disable default redoc
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -37,37 +70,13 @@ app.add_middleware(
     max_age=600,  # Maximum time to cache preflight requests (10 minutes)
 )
 
-# MongoDB connection
-@app.on_event("startup")
-async def startup_db_client():
-    app.mongodb_client = AsyncIOMotorClient(settings.MONGODB_URL)
-    app.mongodb = app.mongodb_client[settings.DATABASE_NAME]
-    await db.connect_to_database()
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    app.mongodb_client.close()
-    await db.close_database_connection()
+# Server-Timing header and per-request MongoDB accounting; outermost, so it
+# times the whole request
+app.add_middleware(TimingMiddleware)
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-@app.on_event("startup")
-async def startup_event():
-    """
-    Initialize services on startup
-    """
-    logger.info("Starting up application...")
-    await db.connect_to_database()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Clean up services on shutdown
-    """
-    logger.info("Shutting down application...")
-    await db.close_database_connection()
-
 @app.get("/")
 async def root():
     """
@@ -89,6 +98,19 @@ async def health_check():
         "database": "connected" if db.client else "disconnected"
     }
 
+@app.get("/metrics")
+async def metrics(current_user: dict = Depends(get_current_active_user)):
+    """
+    In-process metrics (connection pool, caches, ...) for this worker.
+    Only admin can access this endpoint.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return collect()
+
 # AWS Lambda handler
 handler = Mangum(app)
 
@@ -1,38 +1,69 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, Generic, List, Optional, Type, TypeVar
+from pydantic import BaseModel, ConfigDict, Field, create_model
+from pydantic_core import core_schema
 from bson import ObjectId
 
-class PyObjectId(str):
+class _ObjectIdAnnotation:
+    """
+    Accepts an ObjectId or its 24 character hex string and always holds
+    (and serializes) the string. Strings are checked by pydantic-core without
+    calling back into Python.
+    """
+
     @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        from_object_id = core_schema.chain_schema([
+            core_schema.is_instance_schema(ObjectId),
+            core_schema.no_info_plain_validator_function(str),
+        ])
+        return core_schema.union_schema(
+            [core_schema.str_schema(pattern="^[0-9a-fA-F]{24}$"), from_object_id],
+            custom_error_type="object_id",
+            custom_error_message="Invalid ObjectId",
+        )
 
     @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(str(v)):
-            raise ValueError("Invalid ObjectId")
-        return str(v)
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {"type": "string", "pattern": "^[0-9a-fA-F]{24}$"}
+
+PyObjectId = Annotated[str, _ObjectIdAnnotation]
 
 class MongoBaseModel(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda dt: dt.isoformat()
-        }
-        
+    model_config = ConfigDict(populate_by_name=True)
+
 class UpdateBaseModel(BaseModel):
     """Base model for update operations"""
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda dt: dt.isoformat()
-        } 
\ No newline at end of file
+    model_config = ConfigDict(populate_by_name=True)
+
+T = TypeVar("T")
+
+class CursorPage(BaseModel, Generic[T]):
+    """A page of results from keyset pagination"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+class Suggestion(BaseModel):
+    """A typeahead completion"""
+    type: str
+    text: str
+    id: Optional[str] = None
+    detail: Optional[str] = None
+    count: Optional[int] = None
+
+def partial_model(model: Type[BaseModel], name: str) -> Type[BaseModel]:
+    """
+    Build a copy of ``model`` where every field is optional, for responses
+    that only carry a projected subset of a document's fields.
+    """
+    fields = {
+        field_name: (Optional[field.annotation], Field(default=None, alias=field.alias))
+        for field_name, field in model.model_fields.items()
+    }
+    return create_model(name, __config__=model.model_config, **fields)
@@ -1,9 +1,15 @@
 from typing import Optional
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    ValidationInfo,
+    field_validator,
+)
 from datetime import datetime
 from enum import Enum
-from app.core.database import PydanticObjectId
-from app.schemas.base import MongoBaseModel, UpdateBaseModel
+from app.schemas.base import MongoBaseModel, PyObjectId, UpdateBaseModel
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -23,9 +29,10 @@ class UserCreate(UserBase):
     password: str = Field(..., min_length=8, max_length=100)
     confirm_password: str = Field(..., min_length=8, max_length=100)
 
-    @validator('confirm_password')
-    def passwords_match(cls, v, values, **kwargs):
-        if 'password' in values and v != values['password']:
+    @field_validator('confirm_password')
+    @classmethod
+    def passwords_match(cls, v: str, info: ValidationInfo) -> str:
+        if 'password' in info.data and v != info.data['password']:
             raise ValueError('Passwords do not match')
         return v
 
@@ -42,9 +49,7 @@ class UserInDB(UserBase, MongoBaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = {
-        "populate_by_name": True
-    }
+    model_config = ConfigDict(populate_by_name=True)
 
 class UserResponse(UserBase, MongoBaseModel):
     """Schema for user responses (without sensitive data)"""
@@ -65,11 +70,8 @@ class TokenPayload(BaseModel):
     sub: Optional[str] = None
 
 class User(UserBase):
-    id: PydanticObjectId = Field(alias="_id")
+    id: PyObjectId = Field(alias="_id")
     created_at: datetime
     updated_at: datetime
 
-    model_config = {
-        "from_attributes": True,
-        "populate_by_name": True
-    } 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True) 
\ No newline at end of file
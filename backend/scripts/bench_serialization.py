@@ -0,0 +1,148 @@
+"""
+Microbenchmark of the per-item cost of turning MongoDB documents into a JSON
+response body, for the previous path and for ``list_response``.
+
+Previous path: the handler validates each document, FastAPI dumps the
+result, validates it again against ``response_model``, dumps it in JSON mode
+and ``JSONResponse`` encodes it with ``json.dumps``.
+Current path: ``list_response`` (one TypeAdapter validation and dump of the
+whole page in pydantic-core, then orjson).
+
+    python scripts/bench_serialization.py [--items 100] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.v1.endpoints.articles import Article
+from app.api.v1.endpoints.events import Event
+from app.api.v1.endpoints.volunteers import Opportunity
+from app.core.responses import list_response
+
+
+def article_doc(i: int) -> Dict[str, Any]:
+    now = datetime(2024, 1, 1) + timedelta(minutes=i)
+    return {
+        "_id": ObjectId(),
+        "title": f"Nepali community news {i}",
+        "excerpt": "A short summary of the article shown on cards. " * 2,
+        "content": "Full article body paragraph. " * 80,
+        "image_url": f"https://example.com/images/{i}.jpg",
+        "tags": ["community", "culture", "events"],
+        "author": {"id": str(ObjectId()), "name": "Sita Sharma", "avatar": ""},
+        "published_at": now,
+        "likes_count": i % 50,
+        "views_count": i * 3,
+        "comments_count": i % 7,
+        "liked_by_me": False,
+        "status": "published",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def event_doc(i: int) -> Dict[str, Any]:
+    now = datetime(2024, 1, 1) + timedelta(minutes=i)
+    return {
+        "_id": ObjectId(),
+        "title": f"Dashain gathering {i}",
+        "description": "Join us for food, music and dance. " * 5,
+        "date": "2024-10-12",
+        "time": "18:00",
+        "location": "Community Hall, Sydney",
+        "capacity": 200,
+        "category": "cultural",
+        "organizer": {"id": str(ObjectId()), "name": "Organizer"},
+        "registered_count": i % 200,
+        "status": "upcoming",
+        "created_at": now,
+        "created_by": str(ObjectId()),
+        "updated_at": now,
+    }
+
+
+def opportunity_doc(i: int) -> Dict[str, Any]:
+    now = datetime(2024, 1, 1) + timedelta(minutes=i)
+    return {
+        "_id": ObjectId(),
+        "title": f"Volunteer teacher {i}",
+        "description": "Help teach Nepali to children on weekends. " * 4,
+        "requirements": ["Fluent in Nepali", "Weekend availability"],
+        "category": "education",
+        "location": "Melbourne",
+        "commitment": "4 hours/week",
+        "capacity": 10,
+        "applications_count": i % 10,
+        "status": "open",
+        "created_at": now,
+        "created_by": str(ObjectId()),
+        "updated_at": now,
+    }
+
+
+def previous_path(
+    model: Any, adapter: TypeAdapter, docs: List[Dict[str, Any]]
+) -> bytes:
+    items = [model.model_validate(doc) for doc in docs]
+    content = [item.model_dump(by_alias=True) for item in items]
+    value = adapter.validate_python(content)
+    data = adapter.dump_python(value, mode="json", by_alias=True)
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def current_path(model: Any, docs: List[Dict[str, Any]]) -> bytes:
+    return list_response(model, docs).body
+
+
+def per_item_us(fn: Callable[[], Any], items: int, repeat: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    return best / items * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=100, help="Documents per response")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<12} {'previous us/item':>17} {'current us/item':>16} {'speedup':>8}"
+    )
+    for model, make_doc in (
+        (Article, article_doc),
+        (Event, event_doc),
+        (Opportunity, opportunity_doc),
+    ):
+        docs = [make_doc(i) for i in range(args.items)]
+        adapter = TypeAdapter(List[model])
+        previous = per_item_us(
+            lambda model=model, adapter=adapter, docs=docs: previous_path(
+                model, adapter, docs
+            ),
+            args.items,
+            args.repeat,
+        )
+        current = per_item_us(
+            lambda model=model, docs=docs: current_path(model, docs),
+            args.items,
+            args.repeat,
+        )
+        print(
+            f"{model.__name__:<12} {previous:>17.1f} {current:>16.1f} "
+            f"{previous / current:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
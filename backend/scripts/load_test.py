@@ -0,0 +1,520 @@
+"""
+Load test of the API with a weighted mix of public reads, logins, likes,
+event registrations and article writes, reporting throughput and
+p50/p95/p99 latency per route.
+
+Load a database with ``scripts/seed_data.py`` first. Against a running server
+(e.g. ``docker-compose up`` or uvicorn with production settings):
+
+    python scripts/load_test.py --base-url http://localhost:8000 --duration 60 \
+        -o results.json
+
+Without ``--base-url`` the app runs in this process (ASGI transport, using
+MONGODB_URL), which is handy for quick comparisons but shares the CPU with
+the load generator. Logins are rate limited per client IP and account; raise
+``AUTH_IP_RATE_PER_MINUTE`` / ``AUTH_IP_BURST`` / ``AUTH_ACCOUNT_*`` on the
+server under test, otherwise most logins are counted as rejected.
+
+Results are written as JSON. Compare a run against an earlier one, failing
+(exit 1) when a route's p95 or throughput is worse by more than the tolerance:
+
+    python scripts/load_test.py --duration 60 -o new.json \
+        --compare baseline.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+API = "/api/v1"
+# seed_data.py passwords: user N has password{(N - 1) % 64 + 1}
+SEED_PASSWORDS = 64
+# Title words shorter than this make poor search terms
+MIN_TERM_LENGTH = 4
+
+
+@dataclass
+class RouteStats:
+    latencies: List[float] = field(default_factory=list)
+    # 4xx answers, e.g. rate limited logins or full events
+    rejected: int = 0
+    # 5xx answers and transport errors
+    errors: int = 0
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            # Nearest rank
+            if not latencies:
+                return None
+            return round(latencies[min(count - 1, int(p / 100 * count))] * 1000, 2)
+
+        return {
+            "requests": count,
+            "throughput": round(count / duration, 2),
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "mean_ms": round(sum(latencies) / count * 1000, 2) if count else None,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": round(latencies[-1] * 1000, 2) if count else None,
+        }
+
+
+class Results:
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+        self.recording = False
+
+    def record(self, route: str, seconds: float, status_code: int) -> None:
+        if not self.recording:
+            return
+        stats = self.routes.setdefault(route, RouteStats())
+        stats.latencies.append(seconds)
+        if status_code >= httpx.codes.INTERNAL_SERVER_ERROR:
+            stats.errors += 1
+        elif status_code >= httpx.codes.BAD_REQUEST:
+            stats.rejected += 1
+
+
+class Session:
+    """What the virtual users share: the client, tokens and ids to request."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        results: Results,
+        rng: random.Random,
+        seed_users: int,
+    ):
+        self.client = client
+        self.results = results
+        self.rng = rng
+        self.seed_users = seed_users
+        self.user_tokens: List[str] = []
+        self.admin_token = ""
+        self.article_ids: List[str] = []
+        self.event_ids: List[str] = []
+        self.terms: List[str] = []
+
+    async def request(
+        self, route: str, method: str, url: str, token: Optional[str] = None, **kwargs
+    ) -> Optional[httpx.Response]:
+        if token:
+            kwargs["headers"] = {"Authorization": f"Bearer {token}"}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, API + url, **kwargs)
+        except httpx.HTTPError:
+            self.results.record(route, time.perf_counter() - started, 599)
+            return None
+        self.results.record(route, time.perf_counter() - started, response.status_code)
+        return response
+
+    def pick(self, ids: List[str]) -> str:
+        # A few hot items get most of the traffic.
+        return ids[min(len(ids) - 1, int(self.rng.paretovariate(1.2)) - 1)]
+
+    def user_token(self) -> str:
+        return self.rng.choice(self.user_tokens)
+
+
+async def login(session: Session, email: str, password: str) -> Optional[str]:
+    response = await session.request(
+        "POST /auth/login",
+        "POST",
+        "/auth/login",
+        data={"username": email, "password": password},
+    )
+    if response is None or response.status_code != httpx.codes.OK:
+        return None
+    return response.json()["access_token"]
+
+
+def seed_credentials(number: int) -> Tuple[str, str]:
+    return f"user{number}@example.com", f"password{(number - 1) % SEED_PASSWORDS + 1}"
+
+
+async def list_articles(session: Session) -> None:
+    tag = session.rng.choice([None, None, None, "Culture", "Community", "Education"])
+    await session.request(
+        "GET /articles",
+        "GET",
+        "/articles/",
+        params={"limit": 10, **({"tag": tag} if tag else {})},
+    )
+
+
+async def get_article(session: Session) -> None:
+    await session.request(
+        "GET /articles/{id}", "GET", f"/articles/{session.pick(session.article_ids)}"
+    )
+
+
+async def list_events(session: Session) -> None:
+    await session.request("GET /events", "GET", "/events/", params={"limit": 10})
+
+
+async def get_event(session: Session) -> None:
+    await session.request(
+        "GET /events/{id}", "GET", f"/events/{session.pick(session.event_ids)}"
+    )
+
+
+async def list_opportunities(session: Session) -> None:
+    await session.request(
+        "GET /volunteers", "GET", "/volunteers/", params={"limit": 10}
+    )
+
+
+async def search(session: Session) -> None:
+    await session.request(
+        "GET /search",
+        "GET",
+        "/search/",
+        params={"q": session.rng.choice(session.terms)},
+    )
+
+
+async def suggest(session: Session) -> None:
+    term = session.rng.choice(session.terms)
+    await session.request(
+        "GET /search/suggest",
+        "GET",
+        "/search/suggest",
+        params={"q": term[: session.rng.randint(1, 4)]},
+    )
+
+
+async def facets(session: Session) -> None:
+    facet = session.rng.choice(["articles", "events", "volunteers"])
+    await session.request("GET /facets/{facet}", "GET", f"/facets/{facet}")
+
+
+async def login_user(session: Session) -> None:
+    await login(session, *seed_credentials(session.rng.randint(1, session.seed_users)))
+
+
+async def like_article(session: Session) -> None:
+    # Toggles: liking twice unlikes, so the data stays bounded.
+    await session.request(
+        "POST /articles/{id}/like",
+        "POST",
+        f"/articles/{session.pick(session.article_ids)}/like",
+        token=session.user_token(),
+    )
+
+
+async def register_event(session: Session) -> None:
+    event_id = session.pick(session.event_ids)
+    token = session.user_token()
+    response = await session.request(
+        "POST /events/{id}/register",
+        "POST",
+        f"/events/{event_id}/register",
+        token=token,
+    )
+    if response is not None and response.status_code == httpx.codes.BAD_REQUEST:
+        # Already registered: cancel, so the next try registers again.
+        await session.request(
+            "DELETE /events/{id}/register",
+            "DELETE",
+            f"/events/{event_id}/register",
+            token=token,
+        )
+
+
+async def create_article(session: Session) -> None:
+    await session.request(
+        "POST /articles",
+        "POST",
+        "/articles/",
+        token=session.admin_token,
+        json={
+            "title": f"Load test {session.rng.choice(session.terms)}",
+            "excerpt": "Written by the load test.",
+            "content": " ".join(session.rng.choices(session.terms, k=200)),
+            "image_url": "https://picsum.photos/800/400",
+            "tags": ["loadtest"],
+        },
+    )
+
+
+OPERATIONS: Dict[str, Callable[[Session], Awaitable[None]]] = {
+    "list_articles": list_articles,
+    "get_article": get_article,
+    "list_events": list_events,
+    "get_event": get_event,
+    "list_opportunities": list_opportunities,
+    "search": search,
+    "suggest": suggest,
+    "facets": facets,
+    "login": login_user,
+    "like_article": like_article,
+    "register_event": register_event,
+    "create_article": create_article,
+}
+
+DEFAULT_MIX = {
+    "list_articles": 20, "get_article": 15, "list_events": 12, "get_event": 10,
+    "list_opportunities": 5, "search": 8, "suggest": 8, "facets": 4,
+    "login": 3, "like_article": 8, "register_event": 5, "create_article": 2,
+}
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, float]:
+    if not text:
+        return DEFAULT_MIX
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(
+                f"Unknown operation {name!r}, choose from {', '.join(OPERATIONS)}"
+            )
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def prepare(session: Session, args: argparse.Namespace) -> None:
+    """Log the virtual users in and collect ids and search terms to request."""
+    articles = (
+        await session.client.get(
+            f"{API}/articles/", params={"limit": 100, "fields": "title"}
+        )
+    ).json()
+    events = (await session.client.get(f"{API}/events/", params={"limit": 100})).json()
+    session.article_ids = [article["_id"] for article in articles]
+    session.event_ids = [event["_id"] for event in events]
+    if not session.article_ids or not session.event_ids:
+        raise SystemExit(
+            "No articles or events found; load data with scripts/seed_data.py first"
+        )
+    session.terms = sorted(
+        {
+            word.lower()
+            for article in articles
+            for word in article["title"].split()
+            if len(word) >= MIN_TERM_LENGTH
+        }
+    )
+    session.terms = session.terms or ["nepal"]
+
+    session.admin_token = (
+        await login(session, args.admin_email, args.admin_password) or ""
+    )
+    numbers = session.rng.sample(
+        range(1, args.seed_users + 1), min(args.users, args.seed_users)
+    )
+    tokens = await asyncio.gather(
+        *(login(session, *seed_credentials(number)) for number in numbers)
+    )
+    session.user_tokens = [token for token in tokens if token]
+    if not session.admin_token or not session.user_tokens:
+        raise SystemExit(
+            "Logins failed; check the credentials and the server's AUTH_* rate limits"
+        )
+
+
+async def virtual_user(
+    session: Session, names: List[str], weights: List[float], stop_at: float
+) -> None:
+    while time.perf_counter() < stop_at:
+        operation = session.rng.choices(names, weights)[0]
+        await OPERATIONS[operation](session)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    results = Results()
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+        lifespan = None
+    else:
+        # Only needed in-process; a remote run does not import the app.
+        from asgi_lifespan import LifespanManager  # noqa: PLC0415
+
+        from app.main import app  # noqa: PLC0415
+
+        lifespan = LifespanManager(app, startup_timeout=120)
+        await lifespan.__aenter__()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=lifespan.app),
+            base_url="http://loadtest",
+            timeout=30,
+        )
+    try:
+        session = Session(client, results, random.Random(args.seed), args.seed_users)
+        await prepare(session, args)
+        names, weights = list(mix), list(mix.values())
+
+        started = time.perf_counter()
+        warmup_ends = started + args.warmup
+        stop_at = warmup_ends + args.duration
+        workers = [
+            asyncio.create_task(virtual_user(session, names, weights, stop_at))
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.sleep(args.warmup)
+        results.recording = True
+        await asyncio.gather(*workers)
+        duration = time.perf_counter() - warmup_ends
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+    routes = {
+        route: stats.summary(duration)
+        for route, stats in sorted(results.routes.items())
+    }
+    return {
+        "started_at": datetime.utcnow().isoformat(),
+        "commit": git_commit(),
+        "target": args.base_url or "in-process",
+        "duration_seconds": round(duration, 2),
+        "concurrency": args.concurrency,
+        "mix": mix,
+        "total": {
+            "requests": sum(route["requests"] for route in routes.values()),
+            "throughput": round(
+                sum(route["requests"] for route in routes.values()) / duration, 2
+            ),
+            "rejected": sum(route["rejected"] for route in routes.values()),
+            "errors": sum(route["errors"] for route in routes.values()),
+        },
+        "routes": routes,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{'route':32} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'4xx':>6} {'5xx':>6}"
+    )
+    for route, stats in report["routes"].items():
+        print(
+            f"{route:32} {stats['throughput']:>9} {stats['p50_ms']:>9} "
+            f"{stats['p95_ms']:>9} {stats['p99_ms']:>9} "
+            f"{stats['rejected']:>6} {stats['errors']:>6}"
+        )
+    total = report["total"]
+    print(
+        f"{'total':32} {total['throughput']:>9} {'':>9} {'':>9} {'':>9} "
+        f"{total['rejected']:>6} {total['errors']:>6}"
+    )
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Routes whose p95 latency or throughput got worse than ``baseline``.
+
+    Only changes larger than ``tolerance`` count.
+    """
+    regressions = []
+    for route, stats in report["routes"].items():
+        before = baseline["routes"].get(route)
+        if not before or not before["requests"] or not stats["requests"]:
+            continue
+        if stats["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{route}: p95 {before['p95_ms']} -> {stats['p95_ms']} ms"
+            )
+        if stats["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{route}: throughput "
+                f"{before['throughput']} -> {stats['throughput']} req/s"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--base-url", help="server to test; default: run the app in this process"
+    )
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="seconds of load before measuring"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=20, help="virtual users sending requests"
+    )
+    parser.add_argument(
+        "--mix",
+        help=(
+            "operation weights, e.g. list_articles=5,login=1 "
+            "(default: a read-heavy mix)"
+        ),
+    )
+    parser.add_argument(
+        "--users", type=int, default=50, help="seeded users logged in for the writes"
+    )
+    parser.add_argument(
+        "--seed-users",
+        type=int,
+        default=200,
+        help="users in the database (the seed_data.py scale)",
+    )
+    parser.add_argument("--admin-email", default="admin@globalnepali.org")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument(
+        "--seed", type=int, default=1, help="random seed for the request sequence"
+    )
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument(
+        "--compare", help="results file of an earlier run to compare with"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative regression (default 0.2)",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Move embedded ``articles.liked_by`` arrays into the ``article_likes`` edge
+collection and recompute ``likes_count`` from the edges.
+
+Safe to run more than once: edges are upserted and the arrays are only
+removed once their likes have been copied.
+
+    python scripts/migrate_article_likes.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings
+from app.core.indexes import ensure_indexes
+
+
+async def migrate_article_likes():
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.DATABASE_NAME]
+    await ensure_indexes(db)
+
+    migrated = 0
+    cursor = db.articles.find({"liked_by": {"$exists": True}}, {"liked_by": 1})
+    async for article in cursor:
+        article_id = str(article["_id"])
+        liked_by = {str(user_id) for user_id in article.get("liked_by") or []}
+        if liked_by:
+            await db.article_likes.bulk_write(
+                [
+                    UpdateOne(
+                        {"article_id": article_id, "user_id": user_id},
+                        {"$setOnInsert": {"created_at": datetime.utcnow()}},
+                        upsert=True,
+                    )
+                    for user_id in liked_by
+                ],
+                ordered=False,
+            )
+        likes_count = await db.article_likes.count_documents({"article_id": article_id})
+        await db.articles.update_one(
+            {"_id": article["_id"]},
+            {"$set": {"likes_count": likes_count}, "$unset": {"liked_by": ""}},
+        )
+        migrated += 1
+
+    print(f"Migrated likes of {migrated} articles.")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_article_likes())
@@ -0,0 +1,77 @@
+"""
+Move embedded ``events.registrations`` arrays into the
+``event_registrations`` collection and recompute ``registered_count``.
+
+Safe to run more than once: registrations are upserted and the arrays are
+only removed once they have been copied.
+
+    python scripts/migrate_event_registrations.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings
+from app.core.indexes import ensure_indexes
+
+
+async def migrate_event_registrations():
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.DATABASE_NAME]
+    await ensure_indexes(db)
+
+    migrated = 0
+    cursor = db.events.find(
+        {
+            "$or": [
+                {"registrations": {"$exists": True}},
+                {"registered_users": {"$exists": True}},
+            ]
+        },
+        {"registrations": 1},
+    )
+    async for event in cursor:
+        event_id = str(event["_id"])
+        registrations = event.get("registrations") or []
+        if registrations:
+            await db.event_registrations.bulk_write(
+                [
+                    UpdateOne(
+                        {"event_id": event_id, "user_id": str(registration["user_id"])},
+                        {
+                            "$setOnInsert": {
+                                "user_name": registration.get("user_name", ""),
+                                "registered_at": registration.get("registered_at")
+                                or datetime.utcnow(),
+                            }
+                        },
+                        upsert=True,
+                    )
+                    for registration in registrations
+                ],
+                ordered=False,
+            )
+        registered_count = await db.event_registrations.count_documents(
+            {"event_id": event_id}
+        )
+        await db.events.update_one(
+            {"_id": event["_id"]},
+            {
+                "$set": {"registered_count": registered_count},
+                "$unset": {"registrations": "", "registered_users": ""},
+            },
+        )
+        migrated += 1
+
+    print(f"Migrated registrations of {migrated} events.")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_event_registrations())
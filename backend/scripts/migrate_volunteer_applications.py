@@ -0,0 +1,100 @@
+"""
+Fold embedded ``volunteer_opportunities.applicants`` arrays into the
+``volunteer_applications`` collection and recompute ``applications_count``.
+
+Earlier versions appended to ``applicants`` and inserted an application
+without a uniqueness check, so concurrent requests could leave duplicate
+applications behind; those are removed first (the earliest is kept) so the
+unique (opportunity_id, user_id) index can be built.
+
+Safe to run more than once: applications are upserted and the arrays are
+only removed once they have been copied.
+
+    python scripts/migrate_volunteer_applications.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings
+from app.core.indexes import ensure_indexes
+
+
+async def remove_duplicate_applications(db) -> int:
+    removed = 0
+    duplicates = db.volunteer_applications.aggregate([
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {
+            "_id": {"opportunity_id": "$opportunity_id", "user_id": "$user_id"},
+            "ids": {"$push": "$_id"},
+        }},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ], allowDiskUse=True)
+    async for duplicate in duplicates:
+        result = await db.volunteer_applications.delete_many(
+            {"_id": {"$in": duplicate["ids"][1:]}}
+        )
+        removed += result.deleted_count
+    return removed
+
+
+async def migrate_volunteer_applications():
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.DATABASE_NAME]
+
+    removed = await remove_duplicate_applications(db)
+    await ensure_indexes(db)
+
+    migrated = 0
+    cursor = db.volunteer_opportunities.find(
+        {"applicants": {"$exists": True}}, {"applicants": 1}
+    )
+    async for opportunity in cursor:
+        opportunity_id = str(opportunity["_id"])
+        applicants = {str(user_id) for user_id in opportunity.get("applicants") or []}
+        if applicants:
+            # Applicants normally have an application already; fill in the
+            # ones that were lost.
+            await db.volunteer_applications.bulk_write(
+                [
+                    UpdateOne(
+                        {"opportunity_id": opportunity_id, "user_id": user_id},
+                        {"$setOnInsert": {
+                            "user_name": "",
+                            "user_email": "",
+                            "status": "pending",
+                            "created_at": datetime.utcnow(),
+                        }},
+                        upsert=True,
+                    )
+                    for user_id in applicants
+                ],
+                ordered=False,
+            )
+        applications_count = await db.volunteer_applications.count_documents(
+            {"opportunity_id": opportunity_id}
+        )
+        await db.volunteer_opportunities.update_one(
+            {"_id": opportunity["_id"]},
+            {
+                "$set": {"applications_count": applications_count},
+                "$unset": {"applicants": ""},
+            },
+        )
+        migrated += 1
+
+    print(
+        f"Removed {removed} duplicate applications; "
+        f"migrated applicants of {migrated} opportunities."
+    )
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_volunteer_applications())
@@ -1,144 +1,552 @@
+"""
+Generate a synthetic dataset at a chosen scale, for local development and for
+checking performance work against realistic volumes.
+
+Tags, categories, likes, registrations and applications follow skewed
+distributions (a few popular tags and articles, a long tail of rarely used
+ones), and counters such as ``likes_count`` match the generated edges.
+Documents are written with unordered ``insert_many`` batches, several in
+flight at once; the collections are dropped first and indexes are built after
+loading, which is much faster than maintaining them row by row. Facet counts
+and dashboard stats are computed at the end.
+
+Passwords are bcrypt-hashed in parallel, but only once per distinct password:
+user N logs in as ``userN@example.com`` with ``password{(N - 1) % passwords + 1}``,
+and the admin as ``admin@globalnepali.org`` / ``admin123``.
+
+    python scripts/seed_data.py                  # 1k documents
+    python scripts/seed_data.py --scale 1m --seed 7
+"""
+import argparse
 import asyncio
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from motor.motor_asyncio import AsyncIOMotorClient
-from passlib.context import CryptContext
+from typing import Any, Dict, List, Set
+
 from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings
+from app.core.facets import FacetCounts
+from app.core.indexes import ensure_indexes
+from app.core.security import pwd_context
+from app.core.stats import DashboardStats
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    articles: int
+    events: int
+    opportunities: int
+    sponsors: int
+
+
+# Named by the approximate total number of documents, likes, registrations
+# and applications included (about 5 of those per user).
+SCALES: Dict[str, Scale] = {
+    "1k": Scale(users=200, articles=40, events=10, opportunities=4, sponsors=4),
+    "10k": Scale(users=2_000, articles=400, events=100, opportunities=40, sponsors=10),
+    "100k": Scale(
+        users=20_000, articles=4_000, events=1_000, opportunities=400, sponsors=25
+    ),
+    "1m": Scale(
+        users=200_000, articles=40_000, events=10_000, opportunities=4_000, sponsors=50
+    ),
+    "10m": Scale(
+        users=2_000_000,
+        articles=400_000,
+        events=100_000,
+        opportunities=40_000,
+        sponsors=100,
+    ),
+}
+
+COLLECTIONS = [
+    "users", "articles", "article_likes", "events", "event_registrations",
+    "volunteer_opportunities", "volunteer_applications", "sponsors",
+    "sponsorship_inquiries", "facet_counts", "stats",
+]
+
+# Every 100th user is an editor; editors write the articles and run the events.
+EDITOR_EVERY = 100
+
+FIRST_NAMES = [
+    "Aarav", "Sita", "Ram", "Gita", "Bikash", "Sunita", "Prakash", "Anjali", "Suman",
+    "Nisha", "Rajesh", "Puja", "Dipak", "Sabina", "Kiran", "Asha", "Nabin", "Rita",
+    "Sanjay", "Mina", "Binod", "Sarita", "Hari", "Laxmi", "Ashish", "Srijana", "Manish",
+    "Kabita", "Roshan", "Ganga",
+]
+LAST_NAMES = [
+    "Sharma", "Shrestha", "Thapa", "Gurung", "Rai", "Tamang", "Magar", "Adhikari",
+    "Karki", "Bhandari", "Poudel", "Bhusal", "Khadka", "Basnet", "Limbu", "Sherpa",
+    "Joshi", "Pandey", "Koirala", "Maharjan",
+]
+CITIES = [
+    "New York, NY", "San Francisco, CA", "Dallas, TX", "Boston, MA", "Seattle, WA",
+    "Chicago, IL", "Toronto, ON", "London, UK", "Sydney, AU", "Tokyo, JP", "Doha, QA",
+    "Kathmandu, NP",
+]
+# Most used first; picked with Zipf-like weights.
+TAGS = [
+    "Culture", "Community", "Education", "Technology", "Festivals", "Food", "Travel",
+    "Business", "Health", "Sports", "Music", "Art", "Language", "History", "Youth",
+    "Immigration", "Careers", "Literature", "Film", "Fashion", "Environment",
+    "Politics", "Science", "Volunteering", "Dashain", "Tihar", "Himalaya", "Trekking",
+    "Startups", "Scholarships",
+]
+EVENT_CATEGORIES = [
+    "Cultural", "Social", "Educational", "Professional", "Sports", "Fundraiser",
+    "Religious",
+]
+OPPORTUNITY_CATEGORIES = [
+    "Event Planning", "Teaching", "Community Service", "Technical", "Mentoring",
+    "Fundraising",
+]
+SPONSOR_TIERS = ["Bronze", "Silver", "Gold", "Platinum"]
+SPONSOR_KINDS = ["Group", "Foundation", "Traders", "Tech", "Restaurant"]
+WORDS = (
+    "nepali community diaspora festival culture family student education language "
+    "heritage celebration program volunteer support network career mentor youth music "
+    "dance food tradition event local global together journey story annual new guide "
+    "experience "
+    "नेपाल समुदाय संस्कृति शिक्षा चाड परिवार"
+).split()
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+TAG_WEIGHTS = zipf_weights(len(TAGS))
+EVENT_CATEGORY_WEIGHTS = zipf_weights(len(EVENT_CATEGORIES), 0.8)
+OPPORTUNITY_CATEGORY_WEIGHTS = zipf_weights(len(OPPORTUNITY_CATEGORIES), 0.8)
+CITY_WEIGHTS = zipf_weights(len(CITIES), 0.7)
+
+
+def heavy_tail(rng: random.Random, median: float, sigma: float, cap: int) -> int:
+    """A log-normal count: most are near ``median``, a few are far above it."""
+    return min(cap, int(rng.lognormvariate(math.log(median), sigma)))
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize() + "."
+
+
+def title(rng: random.Random, topic: str) -> str:
+    return f"{sentence(rng, rng.randint(2, 5))[:-1]} {topic.lower()}"
+
+
+def pick_tags(rng: random.Random) -> List[str]:
+    return list(
+        dict.fromkeys(rng.choices(TAGS, TAG_WEIGHTS, k=rng.choice([1, 1, 2, 2, 3, 4])))
+    )
+
+
+def days_ago(now: datetime, rng: random.Random, max_days: int) -> datetime:
+    # Skewed towards recent dates: the square of a uniform value.
+    return now - timedelta(
+        days=max_days * rng.random() ** 2, seconds=rng.randrange(86400)
+    )
+
+
+class Users:
+    """
+    Users are identified by their number (1-based), from which id, name and
+    e-mail are derived, so edges can reference millions of users without
+    keeping them in memory. User 0 is the admin.
+    """
+
+    def __init__(self, count: int, run: int):
+        self.count = count
+        # 4 bytes of run timestamp, then the user number: unique per run.
+        self._prefix = f"{run:08x}01"
+
+    def id(self, number: int) -> str:
+        return f"{self._prefix}{number:014x}"
+
+    @staticmethod
+    def name(number: int) -> str:
+        if number == 0:
+            return "Admin User"
+        first = FIRST_NAMES[number % len(FIRST_NAMES)]
+        last = LAST_NAMES[(number // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        return f"{first} {last}"
 
-# MongoDB connection settings
-MONGODB_URL = "mongodb://localhost:27017"
-DATABASE_NAME = "globalnepali"
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-async def seed_data():
-    # Connect to MongoDB
-    client = AsyncIOMotorClient(MONGODB_URL)
-    db = client[DATABASE_NAME]
-
-    # Clear existing data
-    await db.users.delete_many({})
-    await db.events.delete_many({})
-    await db.articles.delete_many({})
-    await db.volunteer_opportunities.delete_many({})
-    await db.sponsors.delete_many({})
-
-    # Create admin user
-    admin_id = ObjectId()
-    admin_user = {
-        "_id": admin_id,
-        "email": "admin@globalnepali.org",
-        "hashed_password": pwd_context.hash("admin123"),
-        "full_name": "Admin User",
-        "role": "admin",
-        "disabled": False,
-        "created_at": datetime.utcnow(),
-    }
-    await db.users.insert_one(admin_user)
-
-    # Create regular users
-    user_ids = []
-    for i in range(5):
-        user_id = ObjectId()
-        user = {
-            "_id": user_id,
-            "email": f"user{i+1}@example.com",
-            "hashed_password": pwd_context.hash(f"password{i+1}"),
-            "full_name": f"User {i+1}",
-            "role": "user",
-            "disabled": False,
-            "created_at": datetime.utcnow(),
-        }
-        await db.users.insert_one(user)
-        user_ids.append(user_id)
-
-    # Create events
-    event_categories = ["Cultural", "Educational", "Social", "Professional"]
-    for i in range(10):
-        event = {
-            "title": f"Event {i+1}",
-            "description": f"Description for Event {i+1}",
-            "date": (datetime.utcnow() + timedelta(days=i*7)).strftime("%Y-%m-%d"),
-            "time": "18:00",
-            "location": "San Francisco, CA",
-            "capacity": 50,
-            "category": event_categories[i % len(event_categories)],
-            "registered_count": 0,
-            "registered_users": [],
-            "status": "upcoming",
-            "created_at": datetime.utcnow(),
-            "created_by": admin_id,
-        }
-        await db.events.insert_one(event)
-
-    # Create articles
-    article_tags = ["Culture", "Community", "Education", "Technology"]
-    for i in range(10):
-        article = {
-            "title": f"Article {i+1}",
-            "excerpt": f"Excerpt for Article {i+1}",
-            "content": f"Content for Article {i+1}...",
-            "image_url": f"https://picsum.photos/800/400?random={i+1}",
-            "tags": [article_tags[i % len(article_tags)]],
-            "author": {
-                "id": admin_id,
-                "name": admin_user["full_name"],
-                "avatar": "",
+    @staticmethod
+    def email(number: int) -> str:
+        return "admin@globalnepali.org" if number == 0 else f"user{number}@example.com"
+
+    @staticmethod
+    def role(number: int) -> str:
+        if number == 0:
+            return "admin"
+        return "editor" if number % EDITOR_EVERY == 0 else "user"
+
+    def random_editor(self, rng: random.Random) -> int:
+        editors = self.count // EDITOR_EVERY
+        return EDITOR_EVERY * rng.randint(1, editors) if editors else 0
+
+    def sample(self, rng: random.Random, count: int) -> List[int]:
+        return [
+            number + 1
+            for number in rng.sample(range(self.count), min(count, self.count))
+        ]
+
+
+class BulkLoader:
+    """Buffers documents per collection and writes full batches.
+
+    Up to ``concurrency`` batches are written at once.
+    """
+
+    def __init__(self, database: Any, batch_size: int, concurrency: int):
+        self.database = database
+        self.batch_size = batch_size
+        self._slots = asyncio.Semaphore(concurrency)
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        # Finished tasks leave _tasks, so failures are kept here.
+        self._errors: List[BaseException] = []
+        self.counts: Dict[str, int] = {}
+
+    async def add(self, collection: str, document: Dict[str, Any]) -> None:
+        buffer = self._buffers.setdefault(collection, [])
+        buffer.append(document)
+        if len(buffer) >= self.batch_size:
+            await self._flush(collection)
+
+    def _raise_failure(self) -> None:
+        if self._errors:
+            raise self._errors[0]
+
+    async def _flush(self, collection: str) -> None:
+        # Stop generating as soon as a batch failed.
+        self._raise_failure()
+        batch = self._buffers.pop(collection, [])
+        if not batch:
+            return
+        await self._slots.acquire()
+        task = asyncio.create_task(self._insert(collection, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _insert(self, collection: str, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await self.database[collection].insert_many(batch, ordered=False)
+            self.counts[collection] = self.counts.get(collection, 0) + len(batch)
+        except Exception as e:
+            self._errors.append(e)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        for collection in list(self._buffers):
+            await self._flush(collection)
+        await asyncio.gather(*self._tasks)
+        # Re-raises the first failed insert.
+        self._raise_failure()
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+async def hash_passwords(passwords: List[str], workers: int) -> Dict[str, str]:
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        hashes = await asyncio.gather(
+            *(loop.run_in_executor(executor, _hash, password) for password in passwords)
+        )
+    return dict(zip(passwords, hashes))
+
+
+async def generate_users(
+    loader: BulkLoader,
+    rng: random.Random,
+    users: Users,
+    hashes: Dict[str, str],
+    now: datetime,
+):
+    distinct = len(hashes) - 1
+    for number in range(users.count + 1):
+        password = (
+            "admin123" if number == 0 else f"password{(number - 1) % distinct + 1}"
+        )
+        await loader.add("users", {
+            "_id": ObjectId(users.id(number)),
+            "email": users.email(number),
+            "hashed_password": hashes[password],
+            "full_name": users.name(number),
+            "role": users.role(number),
+            "is_active": rng.random() > 0.02,
+            "location": rng.choices(CITIES, CITY_WEIGHTS)[0],
+            "interests": pick_tags(rng),
+            "created_at": days_ago(now, rng, 5 * 365),
+        })
+
+
+async def generate_articles(
+    loader: BulkLoader, rng: random.Random, users: Users, count: int, now: datetime
+):
+    for i in range(count):
+        article_id = ObjectId()
+        tags = pick_tags(rng)
+        author = users.random_editor(rng)
+        published_at = days_ago(now, rng, 3 * 365)
+        liked_by = users.sample(
+            rng, heavy_tail(rng, median=5, sigma=1.2, cap=users.count)
+        )
+        for number in liked_by:
+            await loader.add("article_likes", {
+                "article_id": str(article_id),
+                "user_id": users.id(number),
+                "created_at": published_at + (now - published_at) * rng.random(),
+            })
+        await loader.add(
+            "articles",
+            {
+                "_id": article_id,
+                "title": title(rng, tags[0]),
+                "excerpt": sentence(rng, rng.randint(12, 25)),
+                "content": " ".join(
+                    sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(5, 30))
+                ),
+                "image_url": f"https://picsum.photos/800/400?random={i + 1}",
+                "tags": tags,
+                "author": {
+                    "id": users.id(author),
+                    "name": users.name(author),
+                    "avatar": "",
+                },
+                "published_at": published_at,
+                "likes_count": len(liked_by),
+                "views_count": len(liked_by) * rng.randint(5, 40) + rng.randint(0, 50),
+                "comments_count": 0,
+                "status": "published" if rng.random() > 0.05 else "draft",
+                "created_at": published_at,
+                "updated_at": published_at,
             },
-            "published_at": datetime.utcnow() - timedelta(days=i),
-            "likes_count": 0,
-            "views_count": 0,
-            "comments_count": 0,
-            "liked_by": [],
-            "status": "published",
-            "created_at": datetime.utcnow() - timedelta(days=i),
-        }
-        await db.articles.insert_one(article)
-
-    # Create volunteer opportunities
-    opportunity_categories = ["Teaching", "Event Planning", "Technical", "Community Service"]
-    for i in range(5):
-        opportunity = {
-            "title": f"Volunteer Opportunity {i+1}",
-            "description": f"Description for Opportunity {i+1}",
-            "requirements": ["Requirement 1", "Requirement 2"],
-            "location": "San Francisco Bay Area",
-            "commitment": "5 hours per week",
-            "category": opportunity_categories[i % len(opportunity_categories)],
-            "contact": {
-                "name": "Contact Person",
-                "email": "contact@globalnepali.org",
-                "phone": "123-456-7890"
+        )
+
+
+async def generate_events(
+    loader: BulkLoader, rng: random.Random, users: Users, count: int, now: datetime
+):
+    today = now.strftime("%Y-%m-%d")
+    for _ in range(count):
+        event_id = ObjectId()
+        category = rng.choices(EVENT_CATEGORIES, EVENT_CATEGORY_WEIGHTS)[0]
+        day = now + timedelta(days=rng.randint(-730, 180))
+        date = day.strftime("%Y-%m-%d")
+        capacity = rng.choice([25, 50, 100, 200, 500])
+        created_at = min(now, day - timedelta(days=rng.randint(7, 90)))
+        if date < today:
+            event_status = "completed"
+        else:
+            event_status = "cancelled" if rng.random() < 0.03 else "upcoming"
+        organizer = users.random_editor(rng)
+        attendees = users.sample(
+            rng, heavy_tail(rng, median=capacity / 8, sigma=0.8, cap=capacity)
+        )
+        for number in attendees:
+            await loader.add(
+                "event_registrations",
+                {
+                    "event_id": str(event_id),
+                    "user_id": users.id(number),
+                    "user_name": users.name(number),
+                    "registered_at": created_at
+                    + (min(now, day) - created_at) * rng.random(),
+                },
+            )
+        await loader.add(
+            "events",
+            {
+                "_id": event_id,
+                "title": title(rng, category),
+                "description": " ".join(
+                    sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(2, 6))
+                ),
+                "date": date,
+                "time": rng.choice(["10:00", "13:00", "17:30", "18:00", "19:00"]),
+                "location": rng.choices(CITIES, CITY_WEIGHTS)[0],
+                "capacity": capacity,
+                "category": category,
+                "status": event_status,
+                "organizer": {"id": users.id(organizer), "name": users.name(organizer)},
+                "registered_count": len(attendees),
+                "created_at": created_at,
+                "created_by": users.id(organizer),
+                "updated_at": created_at,
             },
-            "status": "active",
-            "applicants": [],
-            "created_at": datetime.utcnow(),
-            "created_by": admin_id,
-        }
-        await db.volunteer_opportunities.insert_one(opportunity)
-
-    # Create sponsors
-    sponsor_tiers = ["Platinum", "Gold", "Silver", "Bronze"]
-    for i in range(4):
-        sponsor = {
-            "name": f"Sponsor {i+1}",
-            "description": f"Description for Sponsor {i+1}",
-            "logo_url": f"https://picsum.photos/200/100?random={i+1}",
-            "website_url": "https://example.com",
-            "tier": sponsor_tiers[i],
-            "contact": {
-                "name": "Sponsor Contact",
-                "email": "sponsor@example.com",
-                "phone": "123-456-7890"
+        )
+
+
+async def generate_opportunities(
+    loader: BulkLoader, rng: random.Random, users: Users, count: int, now: datetime
+):
+    for _ in range(count):
+        opportunity_id = ObjectId()
+        category = rng.choices(OPPORTUNITY_CATEGORIES, OPPORTUNITY_CATEGORY_WEIGHTS)[0]
+        capacity = rng.choice([5, 10, 20, 50])
+        created_at = days_ago(now, rng, 2 * 365)
+        applicants = users.sample(
+            rng, heavy_tail(rng, median=capacity / 3, sigma=0.9, cap=capacity)
+        )
+        for number in applicants:
+            await loader.add(
+                "volunteer_applications",
+                {
+                    "opportunity_id": str(opportunity_id),
+                    "user_id": users.id(number),
+                    "user_name": users.name(number),
+                    "user_email": users.email(number),
+                    "status": rng.choices(
+                        ["pending", "accepted", "rejected"], [6, 3, 1]
+                    )[0],
+                    "message": sentence(rng, rng.randint(8, 30)),
+                    "availability": rng.choice(
+                        ["Weekends", "Evenings", "Flexible", "5 hours per week"]
+                    ),
+                    "created_at": created_at + (now - created_at) * rng.random(),
+                },
+            )
+        await loader.add(
+            "volunteer_opportunities",
+            {
+                "_id": opportunity_id,
+                "title": title(rng, category),
+                "description": " ".join(
+                    sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(2, 5))
+                ),
+                "requirements": [
+                    sentence(rng, rng.randint(3, 8)) for _ in range(rng.randint(1, 4))
+                ],
+                "category": category,
+                "location": rng.choices(CITIES, CITY_WEIGHTS)[0],
+                "commitment": rng.choice(
+                    ["2 hours per week", "5 hours per week", "One day", "Weekends"]
+                ),
+                "capacity": capacity,
+                "applications_count": len(applicants),
+                "status": "open"
+                if len(applicants) < capacity and rng.random() > 0.2
+                else "closed",
+                "created_at": created_at,
+                "created_by": users.id(0),
+                "updated_at": created_at,
             },
-            "status": "active",
-            "created_at": datetime.utcnow(),
-            "created_by": admin_id,
-        }
-        await db.sponsors.insert_one(sponsor)
+        )
+
+
+async def generate_sponsors(
+    loader: BulkLoader, rng: random.Random, users: Users, count: int, now: datetime
+):
+    for i in range(count):
+        created_at = days_ago(now, rng, 3 * 365)
+        surname = rng.choice(LAST_NAMES)
+        kind = rng.choice(SPONSOR_KINDS)
+        await loader.add(
+            "sponsors",
+            {
+                "name": f"{surname} {kind} {i + 1}",
+                "description": sentence(rng, rng.randint(10, 25)),
+                "logo_url": f"https://picsum.photos/200/100?random={i + 1}",
+                "website_url": "https://example.com",
+                "tier": rng.choices(SPONSOR_TIERS, [8, 4, 2, 1])[0],
+                "contact": {
+                    "name": Users.name(i + 1),
+                    "email": f"sponsor{i + 1}@example.com",
+                    "phone": "123-456-7890",
+                },
+                "created_at": created_at,
+                "updated_at": created_at,
+                "created_by": users.id(0),
+            },
+        )
+
+
+async def seed_data(args: argparse.Namespace):
+    scale = SCALES[args.scale]
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    database = client[settings.DATABASE_NAME]
+    try:
+        for name in COLLECTIONS:
+            await database.drop_collection(name)
+
+        passwords = ["admin123"] + [
+            f"password{i + 1}" for i in range(min(args.passwords, scale.users))
+        ]
+        hashes = await hash_passwords(passwords, args.hash_workers)
+        print(
+            f"Hashed {len(passwords)} passwords in {time.perf_counter() - started:.1f}s"
+        )
+
+        users = Users(scale.users, int(now.timestamp()))
+        loader = BulkLoader(database, args.batch_size, args.concurrency)
+        await generate_users(loader, rng, users, hashes, now)
+        for generate, count in [
+            (generate_articles, scale.articles),
+            (generate_events, scale.events),
+            (generate_opportunities, scale.opportunities),
+            (generate_sponsors, scale.sponsors),
+        ]:
+            await generate(loader, rng, users, count, now)
+        await loader.close()
+        print(f"Loaded documents in {time.perf_counter() - started:.1f}s")
+
+        index_started = time.perf_counter()
+        await ensure_indexes(database)
+        print(f"Built indexes in {time.perf_counter() - index_started:.1f}s")
+        await FacetCounts(lambda: database, 0).reconcile_all()
+        await DashboardStats(lambda: database, 0).reconcile()
+    finally:
+        client.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(loader.counts.values())
+    for name, count in sorted(loader.counts.items()):
+        print(f"  {name}: {count}")
+    print(
+        f"Seeded {total} documents in {elapsed:.1f}s "
+        f"({total / elapsed:.0f} documents/s)."
+    )
 
-    print("Seed data created successfully!")
-    await client.close()
 
 if __name__ == "__main__":
-    asyncio.run(seed_data()) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scale", choices=list(SCALES), default="1k")
+    parser.add_argument(
+        "--seed", type=int, default=1, help="random seed for the generated content"
+    )
+    parser.add_argument(
+        "--passwords", type=int, default=64, help="distinct user passwords to hash"
+    )
+    parser.add_argument(
+        "--hash-workers",
+        type=int,
+        default=os.cpu_count(),
+        help="processes hashing passwords",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=5000, help="documents per insert_many"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="insert_many calls in flight"
+    )
+    asyncio.run(seed_data(parser.parse_args()))
@@ -0,0 +1,42 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_lru_eviction_and_counters():
+    """The least recently used entry is evicted first"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    snapshot = cache.snapshot()
+    assert (snapshot["hits"], snapshot["misses"], snapshot["evictions"]) == (3, 1, 1)
+
+
+def test_entries_expire(monkeypatch):
+    """Entries expire after the TTL or an earlier explicit deadline"""
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("user", {"role": "admin"})
+    cache.set("token", {"sub": "user"}, expires_in=5)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("user") == {"role": "admin"}
+    assert cache.get("token") is None
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert cache.get("user") is None
+
+
+def test_invalidate():
+    """Invalidated entries are gone immediately"""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("user", {"role": "user"})
+    cache.invalidate("user")
+    assert cache.get("user") is None
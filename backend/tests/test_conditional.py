@@ -0,0 +1,118 @@
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import Request, Response
+
+from app.core.conditional import (
+    conditional_item,
+    conditional_page,
+    is_not_modified,
+    item_validators,
+    set_validators,
+)
+
+
+def make_request(headers=None, query=""):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/events/",
+            "query_string": query.encode(),
+            "headers": [
+                (k.lower().encode(), v.encode()) for k, v in (headers or {}).items()
+            ],
+        }
+    )
+
+
+def test_validators_follow_updated_at():
+    """The ETag changes with updated_at, and also with anything listed in vary_on"""
+    event = {
+        "_id": ObjectId(),
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 2, 1),
+    }
+    etag, last_modified = item_validators(event)
+
+    assert last_modified == datetime(2024, 2, 1)
+    assert etag.startswith('W/"')
+    assert item_validators(dict(event, updated_at=datetime(2024, 3, 1)))[0] != etag
+    assert item_validators(event, "user-1")[0] != etag
+
+
+def test_if_none_match_and_if_modified_since():
+    """If-None-Match is compared weakly and takes precedence over If-Modified-Since"""
+    response = Response()
+    set_validators(response, 'W/"abc"', datetime(2024, 2, 1, 12, 0, 0, 500000))
+    assert response.headers["last-modified"] == "Thu, 01 Feb 2024 12:00:00 GMT"
+
+    assert is_not_modified(make_request({"If-None-Match": '"xyz", "abc"'}), 'W/"abc"')
+    assert not is_not_modified(
+        make_request(
+            {
+                "If-None-Match": '"xyz"',
+                "If-Modified-Since": "Thu, 01 Feb 2024 12:00:00 GMT",
+            }
+        ),
+        'W/"abc"',
+        datetime(2024, 2, 1),
+    )
+    since = make_request({"If-Modified-Since": response.headers["last-modified"]})
+    assert is_not_modified(since, 'W/"abc"', datetime(2024, 2, 1, 12, 0, 0, 500000))
+    assert not is_not_modified(since, 'W/"abc"', datetime(2024, 2, 1, 12, 0, 1))
+    assert not is_not_modified(
+        make_request({"If-Modified-Since": "yesterday"}),
+        'W/"abc"',
+        datetime(2024, 2, 1),
+    )
+
+
+async def test_conditional_item_answers_304_from_projected_lookup():
+    """A matching revalidation only reads the version fields"""
+    event = {"_id": ObjectId(), "title": "Dashain", "created_at": datetime(2024, 1, 1)}
+    projections = []
+
+    async def fetch(projection):
+        projections.append(projection)
+        return event
+
+    response = Response()
+    assert await conditional_item(make_request(), response, fetch) is event
+    etag = response.headers["etag"]
+
+    projections.clear()
+    result = await conditional_item(
+        make_request({"If-None-Match": etag}), Response(), fetch
+    )
+    assert result.status_code == 304
+    assert result.headers["etag"] == etag
+    assert projections == [{"updated_at": 1, "created_at": 1}]
+
+
+async def test_conditional_page_keeps_only_requested_fields():
+    """Version fields are fetched for the ETag but not returned unless requested"""
+    events = [{"_id": ObjectId(), "title": "Tihar", "created_at": datetime(2024, 1, 1)}]
+
+    async def fetch(projection):
+        return [dict(event) for event in events], None
+
+    response = Response()
+    documents, _ = await conditional_page(
+        make_request(query="fields=title"), response, fetch, {"title": 1}
+    )
+    assert documents == [{"_id": events[0]["_id"], "title": "Tihar"}]
+    assert "last-modified" not in response.headers
+
+    request = make_request(
+        {"If-None-Match": response.headers["etag"]}, query="fields=title"
+    )
+    assert (
+        await conditional_page(request, Response(), fetch, {"title": 1})
+    ).status_code == 304
+    other_query = make_request(
+        {"If-None-Match": response.headers["etag"]}, query="fields=title,date"
+    )
+    assert isinstance(
+        await conditional_page(other_query, Response(), fetch, {"title": 1}), tuple
+    )
@@ -0,0 +1,85 @@
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.counters import BufferedCounter
+
+
+class FakeCollection:
+    def __init__(self, fail=False, fail_indexes=()):
+        self.fail = fail
+        self.fail_indexes = set(fail_indexes)
+        self.requests = []
+
+    async def bulk_write(self, requests, ordered=True):
+        if self.fail:
+            raise RuntimeError("primary stepped down")
+        errors = [
+            {"index": index, "code": 50, "errmsg": "operation exceeded time limit"}
+            for index in sorted(self.fail_indexes)
+        ]
+        self.requests.extend(
+            request
+            for index, request in enumerate(requests)
+            if index not in self.fail_indexes
+        )
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": 0})
+
+
+async def test_increments_are_aggregated_per_document():
+    """Repeated views of one article become a single $inc"""
+    collection = FakeCollection()
+    counter = BufferedCounter(
+        lambda: collection, "views_count", flush_interval=60, max_lag=60
+    )
+    for _ in range(3):
+        counter.increment("a")
+    counter.increment("b")
+
+    assert counter.pending("a") == 3
+    assert await counter.flush() == 2
+    assert collection.requests == [
+        UpdateOne({"_id": "a"}, {"$inc": {"views_count": 3}}),
+        UpdateOne({"_id": "b"}, {"$inc": {"views_count": 1}}),
+    ]
+    assert counter.pending("a") == 0
+    assert counter.snapshot()["flushed_increments"] == 4
+
+
+async def test_failed_flush_keeps_increments():
+    """Increments survive a failed flush and are retried"""
+    collection = FakeCollection(fail=True)
+    counter = BufferedCounter(
+        lambda: collection, "views_count", flush_interval=60, max_lag=60
+    )
+    counter.increment("a", 2)
+
+    assert await counter.flush() == 0
+    assert counter.pending("a") == 2
+
+    collection.fail = False
+    await counter.stop()
+    assert counter.pending("a") == 0
+    assert counter.snapshot()["flush_failures"] == 1
+
+
+async def test_partially_failed_flush_only_retries_failed_documents():
+    """Increments applied before a BulkWriteError are not counted twice"""
+    # "b" is the second operation
+    collection = FakeCollection(fail_indexes={1})
+    counter = BufferedCounter(
+        lambda: collection, "views_count", flush_interval=60, max_lag=60
+    )
+    counter.increment("a", 2)
+    counter.increment("b", 3)
+
+    assert await counter.flush() == 1
+    assert counter.pending("a") == 0
+    assert counter.pending("b") == 3
+
+    collection.fail_indexes.clear()
+    await counter.flush()
+    assert collection.requests == [
+        UpdateOne({"_id": "a"}, {"$inc": {"views_count": 2}}),
+        UpdateOne({"_id": "b"}, {"$inc": {"views_count": 3}}),
+    ]
@@ -0,0 +1,170 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+from app.api.v1.endpoints.events import (
+    cancel_event_registration,
+    list_event_attendees,
+    register_for_event,
+)
+
+
+class FakeRegistrations:
+    """Enforces the unique (event_id, user_id) index."""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def insert_one(self, document):
+        await asyncio.sleep(0)
+        key = (document["event_id"], document["user_id"])
+        if key in self.documents:
+            raise DuplicateKeyError("E11000 duplicate key")
+        document["_id"] = ObjectId()
+        self.documents[key] = document
+
+    async def delete_one(self, query):
+        if "_id" in query:
+            key = next(
+                (k for k, d in self.documents.items() if d["_id"] == query["_id"]), None
+            )
+        else:
+            key = (query["event_id"], query["user_id"])
+        deleted = self.documents.pop(key, None) if key else None
+        return SimpleNamespace(deleted_count=int(deleted is not None))
+
+
+class FakeEvents:
+    """Applies the conditional $inc of register_for_event atomically."""
+
+    def __init__(self, event):
+        self.event = event
+
+    async def find_one_and_update(self, query, update, projection=None):
+        await asyncio.sleep(0)
+        if (
+            self.event["_id"] != query["_id"]
+            or self.event.get("registered_count", 0) >= self.event["capacity"]
+        ):
+            return None
+        self.event["registered_count"] = self.event.get("registered_count", 0) + 1
+        return {"_id": self.event["_id"]}
+
+    async def update_one(self, query, update):
+        if self.event["_id"] == query["_id"]:
+            self.event["registered_count"] += update["$inc"]["registered_count"]
+
+    async def find_one(self, query, projection=None, collation=None):
+        # {"_id": ...}, optionally and-ed with owned_by("organizer.id", ...)
+        query, access = query.get("$and", (query, None))
+        if self.event["_id"] != query["_id"]:
+            return None
+        if (
+            access
+            and self.event.get("organizer", {}).get("id")
+            not in access["organizer.id"]["$in"]
+        ):
+            return None
+        return self.event
+
+
+class FakeDatabase:
+    def __init__(self, capacity):
+        self.events = FakeEvents({"_id": ObjectId(), "capacity": capacity})
+        self.event_registrations = FakeRegistrations()
+
+    @property
+    def event_id(self):
+        return str(self.events.event["_id"])
+
+
+def user(number, role="user"):
+    return {"_id": ObjectId(), "full_name": f"Attendee {number}", "role": role}
+
+
+async def register(db, current_user, event_id=None):
+    return await register_for_event(
+        event_id or db.event_id, token="token", current_user=current_user, db=db
+    )
+
+
+async def cancel(db, current_user, event_id=None):
+    return await cancel_event_registration(
+        event_id or db.event_id, token="token", current_user=current_user, db=db
+    )
+
+
+async def test_concurrent_registrations_race_for_the_last_seat():
+    """Only one of several concurrent registrations gets the last seat"""
+    db = FakeDatabase(capacity=3)
+    for number in range(2):
+        await register(db, user(number))
+
+    results = await asyncio.gather(
+        *(register(db, user(number)) for number in range(2, 6)), return_exceptions=True,
+    )
+    assert sum(not isinstance(result, HTTPException) for result in results) == 1
+    assert db.events.event["registered_count"] == 3
+    assert len(db.event_registrations.documents) == 3
+
+
+async def test_double_registration_is_rejected():
+    """Registering twice keeps one registration and one seat"""
+    db = FakeDatabase(capacity=5)
+    attendee = user(1)
+    await register(db, attendee)
+
+    with pytest.raises(HTTPException) as exc:
+        await register(db, attendee)
+    assert exc.value.detail == "Already registered for this event"
+    assert db.events.event["registered_count"] == 1
+
+
+async def test_cancellation_frees_the_seat():
+    """A cancelled registration can be taken by someone else"""
+    db = FakeDatabase(capacity=1)
+    attendee = user(1)
+    await register(db, attendee)
+    await cancel(db, attendee)
+
+    assert db.events.event["registered_count"] == 0
+    await register(db, user(2))
+    with pytest.raises(HTTPException) as exc:
+        await cancel(db, attendee)
+    assert (exc.value.status_code, exc.value.detail) == (404, "Registration not found")
+
+
+async def test_cancellation_validates_the_event():
+    """Malformed ids are a 400 and unknown events a 404"""
+    db = FakeDatabase(capacity=1)
+    with pytest.raises(HTTPException) as exc:
+        await cancel(db, user(1), event_id="not-an-id")
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        await cancel(db, user(1), event_id=str(ObjectId()))
+    assert (exc.value.status_code, exc.value.detail) == (404, "Event not found")
+
+
+async def test_attendees_of_unknown_event_are_not_found():
+    """Listing attendees checks the id and the event before permissions"""
+    db = FakeDatabase(capacity=1)
+    for event_id, status_code in (
+        ("not-an-id", 400),
+        (str(ObjectId()), 404),
+        (db.event_id, 403),
+    ):
+        with pytest.raises(HTTPException) as exc:
+            await list_event_attendees(
+                event_id,
+                limit=50,
+                cursor=None,
+                token="token",
+                current_user=user(1),
+                db=db,
+            )
+        assert exc.value.status_code == status_code
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.core.exports import EXPORTS, csv_cell, csv_chunks, ndjson_chunks
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+    async def close(self):
+        self.closed = True
+
+
+def registrations(count):
+    return [
+        {
+            "_id": ObjectId(),
+            "event_id": "e1",
+            "user_id": f"u{i}",
+            "user_name": f"User {i}",
+            "registered_at": datetime(2024, 1, 1, 12, i % 60),
+        }
+        for i in range(count)
+    ]
+
+
+async def test_ndjson_is_written_in_batches():
+    cursor = FakeCursor(registrations(5))
+    chunks = [chunk async for chunk in ndjson_chunks(cursor, batch_size=2)]
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert rows[0]["user_id"] == "u0"
+    assert rows[0]["registered_at"] == "2024-01-01T12:00:00"
+    assert isinstance(rows[0]["_id"], str)
+    assert cursor.closed
+
+
+async def test_csv_has_header_and_declared_columns():
+    columns = EXPORTS["event_registrations"].columns
+    cursor = FakeCursor(registrations(3))
+    body = b"".join(
+        [chunk async for chunk in csv_chunks(cursor, columns, batch_size=2)]
+    ).decode()
+
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == list(columns)
+    assert len(rows) == 4
+    assert rows[1][columns.index("user_name")] == "User 0"
+
+
+def test_csv_cells():
+    assert csv_cell(None) == ""
+    assert csv_cell(["culture", "news"]) == '["culture","news"]'
+    assert csv_cell(True) == "True"
+    # Spreadsheet formulas are neutralized
+    assert csv_cell("=HYPERLINK(\"x\")") == "'=HYPERLINK(\"x\")"
+    assert csv_cell("-5") == "'-5"
+
+
+def test_user_export_never_reads_password_hashes():
+    assert "hashed_password" not in EXPORTS["users"].projection
@@ -0,0 +1,96 @@
+from pymongo import DeleteOne, UpdateOne
+
+from app.core.facets import FacetCounts, facet_delta
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self.rows:
+            yield row
+
+
+class FakeCollection:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.requests = []
+
+    def find(self, query, projection=None):
+        return FakeCursor(
+            [row for row in self.rows if row.get("facet") == query.get("facet")]
+        )
+
+    def aggregate(self, pipeline, **kwargs):
+        return FakeCursor(self.rows)
+
+    async def bulk_write(self, requests, ordered=True):
+        self.requests.extend(requests)
+
+
+class FakeDatabase(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+def test_delta_counts_only_changed_values():
+    before = {"tags": ["culture", "news", "news"]}
+    after = {"tags": ["culture", "sports"]}
+    assert facet_delta(before, after, "tags") == {"news": -1, "sports": 1}
+    assert facet_delta(None, {"category": "cultural"}, "category") == {"cultural": 1}
+    assert facet_delta({"category": "cultural"}, None, "category") == {"cultural": -1}
+    assert (
+        facet_delta({"category": "cultural"}, {"category": "cultural"}, "category")
+        == {}
+    )
+    assert facet_delta(None, {"tags": None}, "tags") == {}
+
+
+async def test_record_upserts_increments():
+    counts = FakeCollection()
+    database = FakeDatabase(facet_counts=counts)
+    facets = FacetCounts(lambda: database, reconcile_interval=0)
+
+    await facets.record("articles", {"tags": ["a"]}, {"tags": ["b"]})
+    await facets.record("articles", {"tags": ["b"]}, {"tags": ["b"]})
+
+    assert counts.requests == [
+        UpdateOne(
+            {"facet": "articles", "value": "b"}, {"$inc": {"count": 1}}, upsert=True
+        ),
+        UpdateOne(
+            {"facet": "articles", "value": "a"}, {"$inc": {"count": -1}}, upsert=True
+        ),
+    ]
+
+
+async def test_reconcile_corrects_drift():
+    stored = FakeCollection([
+        {"facet": "events", "value": "cultural", "count": 3},
+        {"facet": "events", "value": "sports", "count": 1},
+        {"facet": "events", "value": "gone", "count": 2},
+    ])
+    events = FakeCollection(
+        [
+            {"_id": "cultural", "count": 3},
+            {"_id": "sports", "count": 2},
+            {"_id": "new", "count": 1},
+        ]
+    )
+    database = FakeDatabase(facet_counts=stored, events=events)
+    facets = FacetCounts(lambda: database, reconcile_interval=0)
+
+    assert await facets.reconcile("events") == 3
+    assert stored.requests == [
+        UpdateOne(
+            {"facet": "events", "value": "sports"}, {"$set": {"count": 2}}, upsert=True
+        ),
+        UpdateOne(
+            {"facet": "events", "value": "new"}, {"$set": {"count": 1}}, upsert=True
+        ),
+        DeleteOne({"facet": "events", "value": "gone"}),
+    ]
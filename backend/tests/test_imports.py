@@ -0,0 +1,218 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+from pymongo.errors import BulkWriteError
+
+from app.api.v1.endpoints import imports
+from app.api.v1.endpoints.events import Event
+from app.api.v1.endpoints.imports import (
+    EventImport,
+    UserImport,
+    import_dataset,
+    prepare_events,
+    prepare_users,
+)
+from app.core.config import settings
+from app.core.imports import (
+    Import,
+    ImportResult,
+    csv_rows,
+    ndjson_rows,
+    run_import,
+    validate_chunk,
+)
+from app.core.security import password_hasher
+
+
+class Row(BaseModel):
+    name: str
+    capacity: int
+
+
+async def chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def prepare(items, importer):
+    return [item.model_dump() for item in items]
+
+
+class FakeCollection:
+    def __init__(self, duplicates=()):
+        self.duplicates = set(duplicates)
+        self.calls = []
+
+    async def insert_many(self, documents, ordered=True):
+        self.calls.append((len(documents), ordered))
+        errors = [
+            {"index": index, "code": 11000, "errmsg": "E11000 duplicate key"}
+            for index, document in enumerate(documents)
+            if document["name"] in self.duplicates
+        ]
+        if errors:
+            raise BulkWriteError(
+                {"writeErrors": errors, "nInserted": len(documents) - len(errors)}
+            )
+        return SimpleNamespace(inserted_ids=list(range(len(documents))))
+
+
+async def test_ndjson_rows_are_parsed_across_chunk_boundaries():
+    data = (
+        b'{"name": "a", "capacity": 1}\r\n\nnot json\n[1]\n{"name": "b", "capacity": 2}'
+    )
+    rows = [row async for row in ndjson_rows(chunks(data))]
+
+    assert rows[0] == (1, {"name": "a", "capacity": 1})
+    assert rows[1][0] == 3 and rows[1][1].startswith("Invalid JSON")
+    assert rows[2] == (4, "Expected a JSON object")
+    assert rows[3] == (5, {"name": "b", "capacity": 2})
+
+
+async def test_csv_rows_join_quoted_multiline_cells():
+    data = (
+        b'name,capacity,tags\n'
+        b'"Dashain\nMela",100,"[""culture"",""food""]"\n'
+        b"'=SUM(A1),5,\n"
+        b'short,row\n'
+    )
+    rows = [row async for row in csv_rows(chunks(data))]
+
+    assert rows == [
+        (2, {"name": "Dashain\nMela", "capacity": "100", "tags": ["culture", "food"]}),
+        (4, {"name": "=SUM(A1)", "capacity": "5"}),
+        (5, "Expected 3 cells, got 2"),
+    ]
+
+
+def test_validate_chunk_reports_invalid_rows_by_number():
+    rows = [
+        (2, {"name": "a", "capacity": "1"}),
+        (3, {"name": "b"}),
+        (4, {"name": "c", "capacity": 3}),
+    ]
+    valid, invalid = validate_chunk(Row, rows)
+
+    assert [(number, item.name) for number, item in valid] == [(2, "a"), (4, "c")]
+    assert invalid == [(3, "capacity: Field required")]
+
+
+async def test_import_inserts_unordered_chunks_and_reports_failures():
+    collection = FakeCollection(duplicates={"b"})
+    spec = Import("rows", Row, prepare)
+    data = b"\n".join(
+        b'{"name": "%s", "capacity": %s}' % (name, capacity)
+        for name, capacity in [
+            (b"a", b"1"),
+            (b"b", b"2"),
+            (b"c", b'"x"'),
+            (b"d", b"4"),
+            (b"e", b"5"),
+        ]
+    )
+    result = await run_import(
+        {"rows": collection}, spec, ndjson_rows(chunks(data)), {}, chunk_size=2
+    )
+
+    assert collection.calls == [(2, False), (1, False), (1, False)]
+    assert (result.rows, result.inserted, result.failed) == (5, 3, 2)
+    assert result.errors == [
+        {"row": 2, "error": "Duplicate of an existing document"},
+        {
+            "row": 3,
+            "error": (
+                "capacity: Input should be a valid integer, "
+                "unable to parse string as an integer"
+            ),
+        },
+    ]
+
+
+async def test_dry_run_writes_nothing():
+    collection = FakeCollection()
+    spec = Import("rows", Row, prepare)
+    rows = ndjson_rows(chunks(b'{"name": "a", "capacity": 1}\n{"name": "b"}\n'))
+    result = await run_import({"rows": collection}, spec, rows, {}, dry_run=True)
+
+    assert collection.calls == []
+    assert (result.inserted, result.failed) == (1, 1)
+
+
+async def test_user_import_hashes_on_part_of_the_pool(monkeypatch):
+    """A large chunk of users does not take over the password hashing pool"""
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 4)
+    running = peak = 0
+
+    async def fake_hash(password):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return f"hashed {password}"
+
+    monkeypatch.setattr(password_hasher, "hash", fake_hash)
+    items = [
+        UserImport(
+            email=f"user{number}@example.com",
+            full_name="Sita Sharma",
+            password=f"password{number}",
+        )
+        for number in range(20)
+    ]
+    documents = await prepare_users(items, {})
+
+    assert peak == 2
+    assert documents[7]["hashed_password"] == "hashed password7"
+
+
+async def test_imported_events_validate_as_events():
+    """Imported events carry the fields the event responses require"""
+    importer = {"_id": ObjectId(), "full_name": "Sita Sharma"}
+    item = EventImport(
+        title="Dashain Night",
+        description="Music and food",
+        date="2026-10-20",
+        time="18:00",
+        location="Boston, MA",
+        capacity=50,
+        category="Cultural",
+    )
+    [document] = await prepare_events([item], importer)
+
+    event = Event.model_validate({"_id": ObjectId(), **document})
+    assert event.created_by == str(importer["_id"])
+
+
+async def test_failed_refresh_still_reports_the_import(monkeypatch):
+    """Committed rows are reported even when recounting the facets fails"""
+    refreshed = []
+
+    async def fake_run_import(db, spec, rows, importer, dry_run=False):
+        return ImportResult(rows=2, inserted=2)
+
+    async def failing_reconcile(*args):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(imports, "run_import", fake_run_import)
+    monkeypatch.setattr(imports.facet_counts, "reconcile", failing_reconcile)
+    monkeypatch.setattr(
+        imports.search_service, "refresh", lambda: refreshed.append("search")
+    )
+    monkeypatch.setattr(
+        imports.typeahead_service, "refresh", lambda: refreshed.append("typeahead")
+    )
+    response = await import_dataset(
+        SimpleNamespace(stream=lambda: chunks(b"")),
+        "events",
+        token="token",
+        current_user={"_id": ObjectId(), "role": "admin"},
+        db={},
+    )
+
+    assert response.status_code == 200
+    assert orjson.loads(response.body)["inserted"] == 2
+    assert refreshed == ["search", "typeahead"]
@@ -0,0 +1,104 @@
+from pymongo.errors import DuplicateKeyError
+
+from app.core.indexes import (
+    CASE_INSENSITIVE,
+    INDEXES,
+    diff_indexes,
+    ensure_indexes,
+    index,
+)
+
+
+class FakeCollection:
+    """Enough of a collection to build single-field unique indexes."""
+
+    def __init__(self, documents=()):
+        self.documents = list(documents)
+        self.indexes = {"_id_": {"key": [("_id", 1)]}}
+
+    async def index_information(self):
+        return self.indexes
+
+    async def create_indexes(self, models):
+        for model in models:
+            document = model.document
+            keys = list(document["key"].items())
+            if document.get("unique"):
+                values = [
+                    tuple(doc.get(key) for key, _ in keys) for doc in self.documents
+                ]
+                if "collation" in document:
+                    values = [tuple(str(v).lower() for v in value) for value in values]
+                if len(values) != len(set(values)):
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error index: {document['name']}"
+                    )
+            self.indexes[document["name"]] = {
+                "key": keys,
+                **{
+                    option: document[option]
+                    for option in ("unique", "collation")
+                    if option in document
+                },
+            }
+        return [model.document["name"] for model in models]
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection()
+        return collection
+
+
+def test_index_names_are_unique_per_collection():
+    """Declared index names must not collide within a collection"""
+    for collection_name, specs in INDEXES.items():
+        names = [spec.name for spec in specs]
+        assert len(names) == len(set(names)), collection_name
+
+
+def test_diff_indexes_reports_missing_and_extra():
+    """Missing declared indexes and undeclared ones are reported"""
+    specs = [index(("date", 1)), index(("status", 1), ("date", 1))]
+    info = {
+        "_id_": {"key": [("_id", 1)]},
+        "date_1": {"key": [("date", 1)]},
+        "legacy_1": {"key": [("legacy", 1)]},
+    }
+    drift = diff_indexes(specs, info)
+    assert drift == {
+        "missing": ["status_1_date_1"],
+        "mismatched": [],
+        "extra": ["legacy_1"],
+    }
+
+
+def test_diff_indexes_detects_option_changes():
+    """An index with the declared name but different options is mismatched"""
+    spec = index(("email", 1), unique=True, collation=CASE_INSENSITIVE)
+    info = {
+        spec.name: {
+            "key": [("email", 1)],
+            "unique": True,
+            "collation": {"locale": "en", "strength": 2, "caseLevel": False},
+        },
+    }
+    assert diff_indexes([spec], info)["mismatched"] == []
+
+    info[spec.name]["unique"] = False
+    assert diff_indexes([spec], info)["mismatched"] == [spec.name]
+
+
+async def test_duplicates_leave_unique_index_missing_without_failing():
+    """Existing case-variant e-mails are logged instead of aborting startup"""
+    database = FakeDatabase(users=FakeCollection([
+        {"_id": 1, "email": "sita@example.com"},
+        {"_id": 2, "email": "Sita@Example.com"},
+    ]))
+
+    drift = await ensure_indexes(database)
+
+    email_index = INDEXES["users"][0].name
+    assert drift["users"]["missing"] == [email_index]
+    assert list(drift) == ["users"]
+    assert "created_at_-1__id_-1" in database["users"].indexes
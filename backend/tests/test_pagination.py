@@ -0,0 +1,67 @@
+import base64
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.core.database import decode_cursor, encode_cursor, keyset_filter
+
+SORT = [("published_at", -1), ("_id", -1)]
+
+
+def test_cursor_round_trip_preserves_bson_types():
+    """Cursors keep datetimes and ObjectIds intact"""
+    doc = {"_id": ObjectId(), "published_at": datetime(2024, 4, 14, 12, 30)}
+    values = decode_cursor(encode_cursor(doc, SORT), SORT)
+    assert values == [doc["published_at"], doc["_id"]]
+
+
+def test_invalid_cursor_is_rejected():
+    """Garbage or mismatched cursors are a client error"""
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", SORT)
+    assert exc.value.status_code == 400
+
+    other_sort = [("date", 1), ("title", 1), ("_id", 1)]
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor({"_id": ObjectId()}, SORT), other_sort)
+
+
+def test_keyset_filter_follows_sort_direction():
+    """Documents after the cursor sort strictly after it"""
+    published_at, _id = datetime(2024, 4, 14), ObjectId()
+    assert keyset_filter(SORT, [published_at, _id]) == {
+        "$or": [
+            {"$or": [{"published_at": {"$lt": published_at}}, {"published_at": None}]},
+            {"published_at": published_at, "_id": {"$lt": _id}},
+        ]
+    }
+    assert keyset_filter([("date", 1), ("_id", 1)], ["2024-04-14", _id])["$or"][0] == {
+        "date": {"$gt": "2024-04-14"}
+    }
+
+
+def test_cursor_values_must_be_scalars():
+    """Cursors cannot inject query operators or crash the decoder"""
+    for values in [
+        '[{"$ne": null}, {"$oid": "%s"}]' % ObjectId(),
+        '[{"$oid": "zz"}, 1]',
+        '[{"$regex": "a", "$options": 1}, 1]',
+        "[[1], 1]",
+    ]:
+        cursor = base64.urlsafe_b64encode(values.encode()).decode()
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor, SORT)
+        assert exc.value.status_code == 400
+
+
+def test_keyset_filter_pages_missing_sort_values():
+    """Documents without the sort field come last descending and first ascending"""
+    _id = ObjectId()
+    assert keyset_filter(SORT, [None, _id]) == {
+        "$or": [{"published_at": None, "_id": {"$lt": _id}}]
+    }
+    assert keyset_filter([("date", 1), ("_id", 1)], [None, _id])["$or"][0] == {
+        "date": {"$ne": None}
+    }
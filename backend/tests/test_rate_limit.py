@@ -0,0 +1,58 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter, enforce_auth_admission
+
+
+def test_bucket_allows_burst_then_limits(monkeypatch):
+    """A bucket admits `burst` requests, then reports when to retry"""
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    limiter = RateLimiter(rate=1, burst=2)
+
+    assert limiter.acquire("1.2.3.4") is None
+    assert limiter.acquire("1.2.3.4") is None
+    assert limiter.acquire("1.2.3.4") == 1.0
+    assert limiter.acquire("5.6.7.8") is None
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 1)
+    assert limiter.acquire("1.2.3.4") is None
+
+
+def test_least_recently_used_buckets_are_dropped():
+    """Only max_keys buckets are kept"""
+    limiter = RateLimiter(rate=0, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        assert limiter.acquire(key) is None
+
+    assert limiter.acquire("c") is not None
+    assert limiter.acquire("a") is None
+
+
+async def test_concurrent_burst_is_capped_at_admission(monkeypatch):
+    """Slots are reserved when admitted, before the attempt awaits anything"""
+    monkeypatch.setattr(rate_limit, "ip_limiter", RateLimiter(rate=0, burst=100))
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_IN_FLIGHT", 3)
+    request = SimpleNamespace(client=SimpleNamespace(host="1.2.3.4"))
+    release = asyncio.Event()
+
+    async def attempt(number):
+        try:
+            with enforce_auth_admission(request, f"user{number}@example.com"):
+                # The user lookup and hashing happen here.
+                await release.wait()
+        except HTTPException as e:
+            return e.status_code
+        return 200
+
+    attempts = [asyncio.create_task(attempt(number)) for number in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+    assert sorted(await asyncio.gather(*attempts)) == [200] * 3 + [429] * 7
+    assert rate_limit.in_progress == 0
+    assert await attempt(10) == 200
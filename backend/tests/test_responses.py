@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel, Field, ValidationError
+
+from app.core.responses import list_response, model_response
+from app.schemas.base import PyObjectId
+
+
+class Item(BaseModel):
+    id: PyObjectId = Field(alias="_id")
+    title: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    meta: Dict[str, Any] = {}
+
+
+def test_model_response_encodes_by_alias():
+    """Aliases are used, datetimes are ISO 8601 and ObjectIds become strings"""
+    object_id = ObjectId()
+    item = Item(
+        _id=object_id,
+        title="Teej",
+        created_at=datetime(2024, 9, 6, 10, 30),
+        meta={"ref": object_id},
+    )
+
+    body = orjson.loads(model_response(item).body)
+
+    assert body == {
+        "_id": str(object_id),
+        "title": "Teej",
+        "created_at": "2024-09-06T10:30:00",
+        "updated_at": None,
+        "meta": {"ref": str(object_id)},
+    }
+
+
+def test_list_response_excludes_unset_and_keeps_headers():
+    """Lists honour exclude_unset and keep headers set on the injected response"""
+    documents = [
+        {"_id": ObjectId(), "title": "Holi", "created_at": datetime(2024, 3, 25)}
+    ]
+    injected = Response()
+    injected.headers["ETag"] = 'W/"abc"'
+
+    result = list_response(Item, documents, injected, exclude_unset=True)
+
+    assert [set(item) for item in orjson.loads(result.body)] == [
+        {"_id", "title", "created_at"}
+    ]
+    assert result.headers["etag"] == 'W/"abc"'
+    assert result.headers["content-length"] == str(len(result.body))
+
+
+def test_object_id_validation():
+    """PyObjectId accepts ObjectIds and their hex strings only"""
+    object_id = ObjectId()
+    assert Item(
+        _id=object_id, title="Tihar", created_at=datetime(2024, 11, 1)
+    ).id == str(object_id)
+    with pytest.raises(ValidationError):
+        Item(_id="not-an-id", title="Tihar", created_at=datetime(2024, 11, 1))
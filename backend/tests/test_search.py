@@ -0,0 +1,114 @@
+from app.core.search import InvertedIndex, SearchService, article_entry, event_entry
+from app.core.text import tokenize
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection=None):
+        return FakeCursor(self.documents)
+
+
+class FakeDatabase:
+    def __init__(self, articles, events):
+        self.articles = FakeCollection(articles)
+        self.events = FakeCollection(events)
+
+
+def article(doc_id, title, content="", tags=()):
+    return {
+        "_id": doc_id,
+        "title": title,
+        "excerpt": "",
+        "content": content,
+        "tags": list(tags),
+    }
+
+
+def test_tokenize_keeps_devanagari_words_whole():
+    """Vowel signs and virama stay inside tokens, postpositions are stripped"""
+    assert tokenize("नेपालमा दशैं-तिहार २०८१ काठमाडौँ।") == [
+        "नेपाल",
+        "दशैं",
+        "तिहार",
+        "2081",
+        "काठमाडौं",
+    ]
+    assert tokenize("The Nepali Community's Teej") == ["nepali", "community", "teej"]
+    assert tokenize("क्षेत्रहरुलाई") == ["क्षेत्र"]
+
+
+def test_title_matches_rank_above_body_matches():
+    index = InvertedIndex()
+    index.add(
+        ("article", "body"),
+        *article_entry(article("body", "Weekend news", content="dashain dashain")),
+    )
+    index.add(
+        ("article", "title"), *article_entry(article("title", "Dashain in Sydney"))
+    )
+    index.add(("article", "other"), *article_entry(article("other", "Tihar lights")))
+
+    ranked, total = index.search("dashain")
+    assert total == 2
+    assert [key for _, key in ranked] == [("article", "title"), ("article", "body")]
+
+
+def test_filter_pagination_and_removal():
+    index = InvertedIndex()
+    for i in range(5):
+        index.add(
+            ("article", str(i)),
+            *article_entry(article(str(i), f"Teej {i}", tags=["teej"] * i)),
+        )
+    index.add(
+        ("event", "e"),
+        *event_entry(
+            {"_id": "e", "title": "Teej mela", "description": "", "location": "Sydney"}
+        ),
+    )
+
+    ranked, total = index.search("teej", kind="event")
+    assert total == 1 and ranked[0][1] == ("event", "e")
+
+    first, total = index.search("teej", skip=0, limit=3)
+    second, _ = index.search("teej", skip=3, limit=3)
+    assert total == 6
+    assert len(first) == 3 and len(second) == 3
+    assert not {key for _, key in first} & {key for _, key in second}
+
+    index.remove(("event", "e"))
+    assert index.search("mela") == ([], 0)
+    assert "mela" not in index.postings
+
+
+async def test_writes_during_rebuild_are_kept():
+    """A document indexed while a rebuild runs is in the swapped-in index"""
+    database = FakeDatabase([article("a", "Dashain")], [])
+    service = SearchService(lambda: database, rebuild_interval=0)
+    original_find = database.articles.find
+
+    def find(query, projection=None):
+        service.index_article(article("b", "Dashain tika"))
+        return original_find(query, projection)
+
+    database.articles.find = find
+    await service.rebuild()
+
+    assert service.ready
+    hits, total = service.search("dashain")
+    assert total == 2
+    assert {hit["id"] for hit in hits} == {"a", "b"}
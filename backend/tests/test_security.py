@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+from app.core import security as security_module
+from app.core.security import PasswordHasher, security, token_cache
+
+
+def test_verified_tokens_are_cached():
+    """A token is only verified once"""
+    token = security.create_access_token(subject="64b7f0c2a1b2c3d4e5f60718")
+    hits = token_cache.hits
+
+    assert security.decode_token(token)["sub"] == "64b7f0c2a1b2c3d4e5f60718"
+    assert security.decode_token(token)["sub"] == "64b7f0c2a1b2c3d4e5f60718"
+    assert token_cache.hits == hits + 1
+
+
+def test_expired_token_is_rejected():
+    """Expired tokens are rejected and not cached"""
+    token = security.create_access_token(
+        subject="someone", expires_delta=timedelta(seconds=-1)
+    )
+    assert security.decode_token(token) is None
+
+
+def test_revoked_token_is_rejected_immediately(monkeypatch):
+    """Revocation wins over a cached verification"""
+    token = security.create_access_token(subject="64b7f0c2a1b2c3d4e5f60719")
+    other = security.create_access_token(
+        subject="64b7f0c2a1b2c3d4e5f60719", expires_delta=timedelta(hours=1)
+    )
+    assert security.decode_token(token) is not None
+
+    security.revoke_token(token)
+    assert security.decode_token(token) is None
+    assert security.decode_token(other) is not None
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 1)
+    security.revoke_subject("64b7f0c2a1b2c3d4e5f60719")
+    assert security.decode_token(other) is None
+
+
+def test_token_issued_right_after_subject_revocation_is_accepted():
+    """A new login in the second of the revocation keeps working"""
+    security.revoke_subject("64b7f0c2a1b2c3d4e5f6071a")
+    token = security.create_access_token(subject="64b7f0c2a1b2c3d4e5f6071a")
+    assert security.decode_token(token) is not None
+
+
+class SlowContext:
+    """Stands in for the bcrypt CryptContext; records which thread ran it."""
+
+    def __init__(self):
+        self.threads = []
+
+    def hash(self, password):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return f"hashed {password}"
+
+    def verify(self, password, hashed):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return hashed == f"hashed {password}"
+
+
+async def test_password_hashing_runs_off_the_event_loop(monkeypatch):
+    """bcrypt runs on the hashing pool while the loop keeps serving, and is measured"""
+    context = SlowContext()
+    monkeypatch.setattr(security_module, "pwd_context", context)
+    hasher = PasswordHasher(kind="thread", workers=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        hashing = asyncio.ensure_future(hasher.hash("secret123"))
+        await asyncio.sleep(0.01)
+        assert hasher.in_flight == 1
+        hashed = await hashing
+        assert await hasher.verify("secret123", hashed)
+    finally:
+        ticking.cancel()
+        hasher.shutdown()
+
+    assert all(name.startswith("password-hash") for name in context.threads)
+    assert ticks > 5
+    snapshot = hasher.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["hash_time"]["count"] == 2
+    assert snapshot["total_time"]["count"] == 2
+    assert snapshot["hash_time"]["avg_ms"] >= 50
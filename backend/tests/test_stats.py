@@ -0,0 +1,56 @@
+from datetime import date, datetime, timedelta
+
+from pymongo import UpdateOne
+
+from app.core.stats import STATS_ID, matches, stats_update
+
+KEY = {"_id": STATS_ID}
+
+
+def test_matches_treats_missing_status_as_active():
+    query = {"status": {"$nin": ["completed", "cancelled"]}}
+    assert matches({"title": "Mela"}, query)
+    assert not matches({"status": "cancelled"}, query)
+    assert not matches(None, query)
+    assert matches({"status": "published"}, {"status": "published"})
+
+
+def test_created_member_is_counted_and_listed():
+    joined = datetime(2024, 3, 15)
+    requests = stats_update(
+        "users", None, {"_id": "u1", "full_name": "Sita", "created_at": joined}
+    )
+    assert requests == [
+        UpdateOne(KEY, {
+            "$inc": {"counts.total_members": 1},
+            "$push": {"recent_members": {
+                "$each": [{"id": "u1", "name": "Sita", "joined_at": joined}],
+                "$sort": {"joined_at": -1},
+                "$slice": 10,
+            }},
+        }, upsert=True),
+    ]
+
+
+def test_past_or_cancelled_events_leave_the_upcoming_list():
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    event = {"_id": "e1", "title": "Mela", "date": tomorrow}
+
+    # Cancelling an upcoming event: one fewer active event, removed from the list.
+    requests = stats_update("events", event, {**event, "status": "cancelled"})
+    assert requests == [
+        UpdateOne(KEY, {"$pull": {"upcoming_events": {"id": "e1"}}}, upsert=True),
+        UpdateOne(KEY, {"$inc": {"counts.active_events": -1}}, upsert=True),
+    ]
+
+    # An event created in the past is active but not upcoming.
+    assert stats_update("events", None, {**event, "date": yesterday}) == [
+        UpdateOne(KEY, {"$inc": {"counts.active_events": 1}}, upsert=True),
+    ]
+
+
+def test_unrelated_updates_write_nothing():
+    article = {"_id": "a1", "status": "published", "tags": ["culture"]}
+    assert stats_update("articles", article, {**article, "tags": ["news"]}) == []
+    assert stats_update("volunteer_opportunities", None, {"_id": "v1"}) == []
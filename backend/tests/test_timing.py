@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import timing
+from app.core.config import settings
+from app.core.database import CommandMonitor
+from app.core.responses import list_response
+from app.core.timing import (
+    ROUND_TRIP_BUDGETS,
+    RoundTripBudgetExceeded,
+    TimingMiddleware,
+    phase,
+)
+from app.schemas.base import Suggestion
+
+monitor = CommandMonitor()
+
+
+def command(milliseconds):
+    # What PyMongo passes to CommandListener.succeeded
+    monitor.succeeded(
+        SimpleNamespace(command_name="find", duration_micros=milliseconds * 1000)
+    )
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        with phase("auth"):
+            command(3)
+        command(2)
+        return list_response(Suggestion, [{"type": "tag", "text": item_id}])
+
+    return app
+
+
+def test_server_timing_reports_phases_and_commands():
+    response = TestClient(make_app()).get("/items/a")
+
+    entries = {
+        entry.split(";")[0]: entry
+        for entry in response.headers["server-timing"].split(", ")
+    }
+    assert set(entries) == {"total", "auth", "validate", "serialize", "db"}
+    assert entries["db"] == 'db;dur=5.0;desc="2 commands"'
+
+
+def test_commands_outside_requests_are_not_attributed():
+    command(1)
+    assert timing.current_timing() is None
+
+
+def test_strict_mode_fails_requests_over_budget(monkeypatch):
+    monkeypatch.setitem(ROUND_TRIP_BUDGETS, "GET /items/{item_id}", 1)
+    client = TestClient(make_app())
+
+    # Only logged by default
+    assert client.get("/items/a").status_code == 200
+    assert (
+        timing.route_timings.snapshot()["routes"]["GET /items/{item_id}"][
+            "max_db_commands"
+        ]
+        == 2
+    )
+
+    monkeypatch.setattr(settings, "ROUND_TRIP_BUDGET_STRICT", True)
+    with pytest.raises(
+        RoundTripBudgetExceeded, match="sent 2 MongoDB commands, budget is 1"
+    ):
+        client.get("/items/a")
@@ -0,0 +1,80 @@
+import pytest
+
+from app.core.typeahead import PrefixIndex, Spec, article_specs, event_specs
+from app.core.views import MaterializedView
+
+
+def texts(suggestions):
+    return [suggestion.text for suggestion in suggestions]
+
+
+def test_completes_any_word_and_ranks_leading_matches_first():
+    index = PrefixIndex()
+    index.set_document(("articles", "1"), [Spec("article", "Festival of Dashain", "1")])
+    index.set_document(("articles", "2"), [Spec("article", "Dashain in Sydney", "2")])
+    index.set_document(("articles", "3"), [Spec("article", "Tihar lights", "3")])
+
+    assert texts(index.complete("dash")) == ["Dashain in Sydney", "Festival of Dashain"]
+    assert texts(index.complete("DASHAIN i")) == ["Dashain in Sydney"]
+    assert index.complete("holi") == []
+    assert index.complete("  ") == []
+
+
+def test_shared_suggestions_are_counted_and_released():
+    index = PrefixIndex()
+    index.set_document(
+        ("articles", "1"),
+        article_specs({"_id": "1", "title": "One", "tags": ["culture", "Cricket"]}),
+    )
+    index.set_document(
+        ("articles", "2"),
+        article_specs({"_id": "2", "title": "Two", "tags": ["Culture"]}),
+    )
+    index.set_document(
+        ("events", "3"),
+        event_specs({"_id": "3", "title": "Mela", "location": "Sydney"}),
+    )
+
+    tags = index.complete("c", types={"tag"})
+    assert [(tag.text, tag.weight) for tag in tags] == [("culture", 2), ("Cricket", 1)]
+
+    index.remove_document(("articles", "1"))
+    assert [(tag.text, tag.weight) for tag in index.complete("c", types={"tag"})] == [
+        ("culture", 1)
+    ]
+
+    # Re-indexing a document replaces its previous suggestions.
+    index.set_document(
+        ("events", "3"),
+        event_specs({"_id": "3", "title": "Mela", "location": "Melbourne"}),
+    )
+    assert texts(index.complete("me")) == ["Mela", "Melbourne"]
+    assert index.complete("syd") == []
+
+
+def test_bulk_build_matches_incremental_inserts():
+    built, incremental = PrefixIndex(), PrefixIndex()
+    built.start_build()
+    for i in range(50):
+        specs = [Spec("event", f"Event {i}", str(i)), Spec("location", f"City {i % 7}")]
+        built.set_document(("events", str(i)), specs)
+        incremental.set_document(("events", str(i)), specs)
+    built.finish_build()
+
+    assert built._rows == incremental._rows
+    assert texts(built.complete("city", limit=3)) == texts(
+        incremental.complete("city", limit=3)
+    )
+
+
+def test_incomplete_views_fail_when_created():
+    """A view missing apply_change cannot be instantiated"""
+    class PartialView(MaterializedView):
+        def empty(self):
+            return {}
+
+        async def load(self, database, state):
+            pass
+
+    with pytest.raises(TypeError, match="apply_change"):
+        PartialView(get_db=lambda: None, rebuild_interval=0)
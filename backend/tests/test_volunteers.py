@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+from app.api.v1.endpoints import volunteers
+from app.api.v1.endpoints.volunteers import (
+    apply_for_opportunity,
+    delete_opportunity,
+)
+
+
+class FakeApplications:
+    """Enforces the unique (opportunity_id, user_id) index."""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def insert_one(self, document):
+        await asyncio.sleep(0)
+        key = (document["opportunity_id"], document["user_id"])
+        if key in self.documents:
+            raise DuplicateKeyError("E11000 duplicate key")
+        document["_id"] = ObjectId()
+        self.documents[key] = document
+
+    async def delete_one(self, query):
+        for key, document in list(self.documents.items()):
+            if document["_id"] == query["_id"]:
+                del self.documents[key]
+
+    async def delete_many(self, query):
+        for key, document in list(self.documents.items()):
+            if document["opportunity_id"] == query["opportunity_id"]:
+                del self.documents[key]
+
+
+class FakeOpportunities:
+    """Applies the conditional $inc of apply_for_opportunity atomically."""
+
+    def __init__(self, opportunity):
+        self.opportunity = opportunity
+
+    async def find_one_and_update(self, query, update, projection=None):
+        await asyncio.sleep(0)
+        opportunity = self.opportunity
+        if opportunity["_id"] != query["_id"]:
+            return None
+        if opportunity.get("status") not in query["status"]["$in"]:
+            return None
+        if opportunity.get("applications_count", 0) >= opportunity["capacity"]:
+            return None
+        opportunity["applications_count"] = opportunity.get("applications_count", 0) + 1
+        return {"_id": opportunity["_id"]}
+
+    async def find_one(self, query, projection=None):
+        return self.opportunity if self.opportunity["_id"] == query["_id"] else None
+
+    async def find_one_and_delete(self, query, projection=None):
+        if self.opportunity is None or self.opportunity["_id"] != query["_id"]:
+            return None
+        deleted, self.opportunity = self.opportunity, None
+        return {"_id": deleted["_id"]}
+
+
+class FakeDatabase:
+    def __init__(self, **opportunity):
+        self.volunteer_opportunities = FakeOpportunities(
+            {"_id": ObjectId(), **opportunity}
+        )
+        self.volunteer_applications = FakeApplications()
+
+    @property
+    def opportunity(self):
+        return self.volunteer_opportunities.opportunity
+
+
+def user(number):
+    return {
+        "_id": ObjectId(),
+        "full_name": f"Volunteer {number}",
+        "email": f"user{number}@example.com",
+    }
+
+
+async def apply(db, current_user):
+    return await apply_for_opportunity(
+        str(db.opportunity["_id"]), token="token", current_user=current_user, db=db,
+    )
+
+
+async def test_concurrent_applications_stop_at_capacity():
+    """Only capacity applicants get a slot; the others' applications are rolled back"""
+    db = FakeDatabase(capacity=2, status="open")
+    results = await asyncio.gather(
+        *(apply(db, user(number)) for number in range(5)), return_exceptions=True,
+    )
+
+    accepted = [result for result in results if not isinstance(result, HTTPException)]
+    rejected = [result for result in results if isinstance(result, HTTPException)]
+    assert len(accepted) == 2
+    assert {e.detail for e in rejected} == {"This opportunity has reached its capacity"}
+    assert db.opportunity["applications_count"] == 2
+    assert len(db.volunteer_applications.documents) == 2
+
+
+async def test_duplicate_application_is_rejected():
+    """Applying twice keeps a single application and slot"""
+    db = FakeDatabase(capacity=5, status="open")
+    applicant = user(1)
+    await apply(db, applicant)
+
+    with pytest.raises(HTTPException) as exc:
+        await apply(db, applicant)
+    assert exc.value.detail == "You have already applied for this opportunity"
+    assert db.opportunity["applications_count"] == 1
+
+
+async def test_closed_opportunity_rejects_applications():
+    """Closed opportunities take no applications"""
+    db = FakeDatabase(capacity=5, status="closed")
+
+    with pytest.raises(HTTPException) as exc:
+        await apply(db, user(1))
+    assert exc.value.detail == "This opportunity is no longer accepting applications"
+    assert db.volunteer_applications.documents == {}
+
+
+async def test_opportunity_without_status_is_open():
+    """Older opportunities may lack a status field"""
+    db = FakeDatabase(capacity=1)
+    await apply(db, user(1))
+
+    with pytest.raises(HTTPException) as exc:
+        await apply(db, user(2))
+    assert exc.value.detail == "This opportunity has reached its capacity"
+
+
+async def test_deleting_an_opportunity_removes_its_applications(monkeypatch):
+    """Applications go with their opportunity, freeing the unique index entries"""
+    async def record(*args):
+        pass
+
+    monkeypatch.setattr(volunteers.facet_counts, "record", record)
+    db = FakeDatabase(capacity=5, status="open")
+    other = FakeDatabase(capacity=5, status="open")
+    db.volunteer_applications = other.volunteer_applications
+    for number in range(2):
+        await apply(db, user(number))
+    await apply(other, user(3))
+    opportunity_id = str(db.opportunity["_id"])
+
+    await delete_opportunity(
+        opportunity_id, token="token", current_user=user(9) | {"role": "admin"}, db=db,
+    )
+
+    assert db.opportunity is None
+    remaining = db.volunteer_applications.documents.values()
+    assert [document["opportunity_id"] for document in remaining] == [
+        str(other.opportunity["_id"])
+    ]
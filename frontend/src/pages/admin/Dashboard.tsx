@@ -27,6 +27,7 @@ import {
   CalendarToday,
 } from '@mui/icons-material';
 import type { RootState } from '../../store/store';
+import { getDashboardStats } from '../../utils/api';
 
 interface DashboardStats {
   totalMembers: number;
@@ -45,28 +46,46 @@ interface DashboardStats {
   }>;
 }
 
-const mockStats: DashboardStats = {
-  totalMembers: 1250,
-  activeEvents: 8,
-  publishedArticles: 45,
-  sponsors: 12,
-  recentMembers: [
-    { id: '1', name: 'Aarav Sharma', joinedAt: '2024-03-15' },
-    { id: '2', name: 'Priya Patel', joinedAt: '2024-03-14' },
-    { id: '3', name: 'Raj Kumar', joinedAt: '2024-03-13' },
-    { id: '4', name: 'Maya Singh', joinedAt: '2024-03-12' },
-  ],
-  upcomingEvents: [
-    { id: '1', title: 'Nepali New Year Celebration', date: '2024-04-14' },
-    { id: '2', title: 'Cultural Workshop', date: '2024-03-25' },
-    { id: '3', title: 'Community Meetup', date: '2024-03-30' },
-    { id: '4', title: 'Food Festival', date: '2024-04-06' },
-  ],
+interface DashboardStatsResponse {
+  total_members: number;
+  active_events: number;
+  published_articles: number;
+  sponsors: number;
+  recent_members: Array<{ id: string; name: string | null; joined_at: string | null }>;
+  upcoming_events: Array<{ id: string; title: string | null; date: string | null }>;
+}
+
+const DASHBOARD_LIST_SIZE = 4;
+
+const emptyStats: DashboardStats = {
+  totalMembers: 0,
+  activeEvents: 0,
+  publishedArticles: 0,
+  sponsors: 0,
+  recentMembers: [],
+  upcomingEvents: [],
 };
 
+const toDashboardStats = (data: DashboardStatsResponse): DashboardStats => ({
+  totalMembers: data.total_members,
+  activeEvents: data.active_events,
+  publishedArticles: data.published_articles,
+  sponsors: data.sponsors,
+  recentMembers: data.recent_members.slice(0, DASHBOARD_LIST_SIZE).map((member) => ({
+    id: member.id,
+    name: member.name || 'Member',
+    joinedAt: member.joined_at || '',
+  })),
+  upcomingEvents: data.upcoming_events.slice(0, DASHBOARD_LIST_SIZE).map((event) => ({
+    id: event.id,
+    title: event.title || 'Untitled event',
+    date: event.date || '',
+  })),
+});
+
 const Dashboard = () => {
   const navigate = useNavigate();
-  const [stats, setStats] = useState<DashboardStats>(mockStats);
+  const [stats, setStats] = useState<DashboardStats>(emptyStats);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -78,8 +97,8 @@ const Dashboard = () => {
     try {
       setLoading(true);
       setError(null);
-      // TODO: Replace with actual API call
-      setStats(mockStats);
+      const response = await getDashboardStats();
+      setStats(toDashboardStats(response.data));
     } catch (error) {
       console.error('Failed to fetch dashboard stats:', error);
       setError('Failed to load dashboard data');
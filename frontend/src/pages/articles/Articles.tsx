@@ -45,7 +45,7 @@ interface Article {
   views_count: number;
   comments_count: number;
   tags: string[];
-  is_liked: boolean;
+  liked_by_me: boolean;
 }
 
 const Articles = () => {
@@ -90,8 +90,8 @@ const Articles = () => {
             article.id === articleId
               ? {
                   ...article,
-                  is_liked: !article.is_liked,
-                  likes_count: article.is_liked
+                  liked_by_me: !article.liked_by_me,
+                  likes_count: article.liked_by_me
                     ? article.likes_count - 1
                     : article.likes_count + 1,
                 }
@@ -345,9 +345,9 @@ const Articles = () => {
                           <IconButton
                             size="small"
                             onClick={() => handleLike(article.id)}
-                            color={article.is_liked ? 'primary' : 'default'}
+                            color={article.liked_by_me ? 'primary' : 'default'}
                           >
-                            {article.is_liked ? <Favorite /> : <FavoriteBorder />}
+                            {article.liked_by_me ? <Favorite /> : <FavoriteBorder />}
                           </IconButton>
                           <Typography variant="body2" sx={{ ml: 0.5 }}>
                             {article.likes_count}
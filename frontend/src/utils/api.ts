@@ -143,4 +143,7 @@ export const updateUserProfile = (data: any) => api.put('/users/me', data);
 
 export const updateUser = (id: string, data: any) => api.put(`/users/${id}`, data);
 
-export const deleteUser = (id: string) => api.delete(`/users/${id}`); 
\ No newline at end of file
+export const deleteUser = (id: string) => api.delete(`/users/${id}`);
+
+// Admin APIs
+export const getDashboardStats = () => api.get('/admin/stats'); 
\ No newline at end of file